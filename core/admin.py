@@ -1,5 +1,5 @@
 from django.contrib import admin
-from .models import Product, PriceResult, SourceStatus
+from .models import Product, PriceResult, SourceCircuit, SourceStatus
 
 
 @admin.register(Product)
@@ -20,3 +20,10 @@ class SourceStatusAdmin(admin.ModelAdmin):
     list_display = ['product', 'website', 'state', 'match_confidence', 'http_status', 'checked_at']
     list_filter = ['website', 'state', 'checked_at']
     search_fields = ['product__name', 'website', 'matched_title', 'diagnostic_message']
+
+
+@admin.register(SourceCircuit)
+class SourceCircuitAdmin(admin.ModelAdmin):
+    list_display = ['website', 'state', 'consecutive_failures', 'trip_count', 'last_outcome', 'last_http_status', 'opened_at', 'last_transition_at']
+    list_filter = ['state']
+    search_fields = ['website', 'last_diagnostic_message']
@@ -0,0 +1,153 @@
+import json
+import platform
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.benchmarks import generate_corpus, git_revision
+from core.services.matcher import (
+    build_candidate_profile,
+    build_query_profile,
+    evaluate_candidate,
+    evaluate_scrape_candidates,
+    get_profile_cache,
+)
+from core.services.scraper.base import Candidate
+
+
+CANDIDATES_PER_SEARCH = 40
+DEFAULT_SIZES = [1_000, 10_000]
+
+
+def _timed(operations, func):
+    started = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - started
+    return result, {
+        'operations': operations,
+        'seconds': round(seconds, 6),
+        'us_per_op': round(seconds * 1e6 / operations, 3) if operations else None,
+        'ops_per_second': round(operations / seconds, 1) if seconds else None,
+    }
+
+
+def run_benchmark(size, *, queries=50, seed=0):
+    query_texts, titles = generate_corpus(size, queries=queries, seed=seed)
+    cache = get_profile_cache()
+    results = {'titles': size, 'queries': len(query_texts)}
+
+    query_profiles, results['build_query_profile'] = _timed(
+        len(query_texts), lambda: {query: build_query_profile(query) for query in query_texts}
+    )
+
+    cache.clear()
+    _, results['build_candidate_profile_cold'] = _timed(
+        size, lambda: [build_candidate_profile(title) for _query, title in titles]
+    )
+    cache.clear()
+    warm_titles = titles[:cache.maxsize]
+    for _query, title in warm_titles:
+        build_candidate_profile(title)
+    before = cache.stats()
+    _, results['build_candidate_profile_warm'] = _timed(
+        len(warm_titles), lambda: [build_candidate_profile(title) for _query, title in warm_titles]
+    )
+    after = cache.stats()
+    lookups = (after['hits'] + after['misses']) - (before['hits'] + before['misses'])
+    results['build_candidate_profile_warm']['hit_rate'] = (
+        round((after['hits'] - before['hits']) / lookups, 4) if lookups else None
+    )
+
+    candidates = [
+        (query, Candidate(title=title, price=1000, url=f'https://example.com/{index}', rank=index % CANDIDATES_PER_SEARCH + 1))
+        for index, (query, title) in enumerate(titles)
+    ]
+
+    def evaluate_each():
+        return sum(
+            evaluate_candidate(query_profiles[query], candidate) is not None
+            for query, candidate in candidates
+        )
+
+    eligible, results['evaluate_candidate'] = _timed(size, evaluate_each)
+    results['evaluate_candidate']['eligible'] = eligible
+
+    searches = {}
+    for query, candidate in candidates:
+        searches.setdefault(query, []).append(candidate)
+    pages = [
+        (query, group[start:start + CANDIDATES_PER_SEARCH])
+        for query, group in searches.items()
+        for start in range(0, len(group), CANDIDATES_PER_SEARCH)
+    ]
+
+    def evaluate_pages():
+        states = {}
+        for query, page in pages:
+            state = evaluate_scrape_candidates(query, page).state
+            states[state] = states.get(state, 0) + 1
+        return states
+
+    states, results['evaluate_scrape_candidates'] = _timed(len(pages), evaluate_pages)
+    results['evaluate_scrape_candidates']['candidates_per_call'] = CANDIDATES_PER_SEARCH
+    results['evaluate_scrape_candidates']['states'] = states
+    return results
+
+
+class Command(BaseCommand):
+    help = 'Times the matcher on a reproducible synthetic corpus of marketplace titles and prints JSON results.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--sizes',
+            type=int,
+            nargs='+',
+            default=DEFAULT_SIZES,
+            help='Corpus sizes in titles (e.g. --sizes 1000 100000 1000000).',
+        )
+        parser.add_argument(
+            '--queries',
+            type=int,
+            default=50,
+            help='Distinct product queries the titles are spread over.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Corpus seed; the same seed and sizes always produce the same titles.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON results to this file instead of stdout.',
+        )
+
+    def handle(self, *args, **options):
+        if any(size <= 0 for size in options['sizes']) or options['queries'] <= 0:
+            raise CommandError('--sizes and --queries must be positive.')
+
+        report = {
+            'benchmark': 'matcher',
+            'revision': git_revision(),
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'seed': options['seed'],
+            'settings': {
+                'MATCHER_PROFILE_CACHE_SIZE': get_profile_cache().maxsize,
+                'MATCHER_SIMILARITY_KERNEL': getattr(settings, 'MATCHER_SIMILARITY_KERNEL', 'ratcliff'),
+            },
+            'runs': [],
+        }
+        for size in options['sizes']:
+            self.stderr.write(f'Benchmarking {size} titles...')
+            report['runs'].append(run_benchmark(size, queries=options['queries'], seed=options['seed']))
+
+        payload = json.dumps(report, indent=2)
+        if options.get('output'):
+            Path(options['output']).write_text(payload + '\n', encoding='utf-8')
+            self.stderr.write(self.style.SUCCESS(f'Wrote {options["output"]}'))
+        else:
+            self.stdout.write(payload)
@@ -0,0 +1,440 @@
+import html as html_lib
+import importlib
+import json
+import multiprocessing
+import platform
+import random
+import re
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timezone
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.benchmarks import generate_corpus, git_revision
+from core.services.parsing import PARSER_CLASSES
+from core.services.scraper.ajio import AjioScraper
+from core.services.scraper.amazon import AmazonScraper
+from core.services.scraper.flipkart import FlipkartScraper
+from core.services.scraper.meesho import MeeshoScraper
+from core.services.scraper.myntra import MyntraScraper
+
+
+FIXTURE_DIR = Path(__file__).resolve().parents[2] / 'tests' / 'fixtures'
+
+BENCH_SCRAPERS = [
+    (AmazonScraper, 'amazon_search.html'),
+    (FlipkartScraper, 'flipkart_search.html'),
+    (MyntraScraper, 'myntra_search.html'),
+    (AjioScraper, 'ajio_search.html'),
+    (MeeshoScraper, 'meesho_search.html'),
+]
+
+SLUG_PATTERN = re.compile(r'[^a-z0-9]+')
+SPONSORED_LABEL = '<span class="puis-label-popover">Sponsored</span>'
+
+# Filler vocabulary. None of it may look like a result card, a price, a product
+# link or a sponsored label to any parser, or the benchmark would change what
+# is parsed rather than only how much markup surrounds it.
+NOISE_CLASSES = [
+    'a-section', 'a-spacing-small', 'sg-col-inner', 's-widget-spacing-small', 'puis-padding-right-small',
+    '_2kHMtA', 'KzDlHZ', 'col-7-12', 'rilrtl-lazy-img', 'preview-ctn', 'flex-row', 'ellipsis-wrap',
+]
+NOISE_WORDS = [
+    'Free delivery', 'Get it by Tuesday', 'Bank Offer', '4.3 out of 5 stars', 'Only 3 left in stock',
+    'Limited time deal', 'Save extra with No Cost EMI', 'Exchange offer available', 'Assured', 'New arrival',
+]
+
+
+def _noise_markup(rng, size):
+    """Return roughly ``size`` bytes of wrapper divs, icons, tracking scripts, styles and comments."""
+    parts = []
+    written = 0
+    while written < size:
+        kind = rng.randrange(5)
+        if kind == 0:
+            piece = (
+                f'<div class="{rng.choice(NOISE_CLASSES)} {rng.choice(NOISE_CLASSES)}" '
+                f'data-csa-c-slot-id="{rng.getrandbits(48):012x}"><span class="{rng.choice(NOISE_CLASSES)}">'
+                f'{rng.choice(NOISE_WORDS)}</span></div>'
+            )
+        elif kind == 1:
+            path = ' '.join(f'L{rng.randint(0, 24)} {rng.randint(0, 24)}' for _ in range(12))
+            piece = f'<svg viewBox="0 0 24 24" width="16" height="16" aria-hidden="true"><path d="M0 0 {path}Z"/></svg>'
+        elif kind == 2:
+            state = {
+                'impressionId': f'{rng.getrandbits(64):016x}',
+                'slot': rng.randint(1, 60),
+                'widgets': [f'w{rng.getrandbits(24):06x}' for _ in range(6)],
+            }
+            piece = f'<script type="application/json" data-a-state="{rng.getrandbits(32):08x}">{json.dumps(state)}</script>'
+        elif kind == 3:
+            piece = (
+                f'<style>.{rng.choice(NOISE_CLASSES)}-{rng.getrandbits(16):04x}'
+                f'{{margin:{rng.randint(0, 32)}px;color:#{rng.getrandbits(24):06x};display:flex}}</style>'
+            )
+        else:
+            piece = f'<!-- slot:{rng.getrandbits(32):08x} {rng.choice(NOISE_WORDS)} -->'
+        parts.append(piece)
+        written += len(piece)
+    return ''.join(parts)
+
+
+def _noise_fields(rng, size):
+    """Return a dict of roughly ``size`` bytes of listing metadata for JSON-backed sources."""
+    fields = {
+        'sizes': 'S,M,L,XL',
+        'rating': round(rng.uniform(3.0, 5.0), 1),
+        'ratingCount': rng.randint(0, 50000),
+        'inventoryInfo': [],
+    }
+    written = 0
+    while written < size:
+        sku = {
+            'skuId': rng.getrandbits(32),
+            'label': rng.choice(['S', 'M', 'L', 'XL', '128 GB', '256 GB']),
+            'inventory': rng.randint(0, 40),
+            'available': rng.random() < 0.8,
+            'sellerPartnerId': rng.getrandbits(24),
+            'tracking': f'{rng.getrandbits(128):032x}',
+        }
+        fields['inventoryInfo'].append(sku)
+        written += 160
+    return fields
+
+
+def _listings(cards, seed):
+    _queries, titles = generate_corpus(cards, queries=1, seed=seed)
+    rng = random.Random(seed)
+    listings = []
+    for index, (_query, title) in enumerate(titles):
+        listings.append({
+            'title': title,
+            'price': rng.randint(499, 149999),
+            'slug': SLUG_PATTERN.sub('-', title.lower()).strip('-')[:80],
+            'id': f'{rng.getrandbits(40):010X}',
+            'image': f'https://example.com/img/{index}.jpg',
+            'sponsored': index % 8 == 1,
+        })
+    return listings
+
+
+def _html_page(rng, card_html, noise_kb):
+    chrome = _noise_markup(rng, noise_kb * 1024 * 4)
+    footer = _noise_markup(rng, noise_kb * 1024 * 2)
+    return (
+        '<!doctype html><html><head><meta charset="utf-8"><title>Search results</title>'
+        f'{chrome}</head><body><div id="search"><div class="s-main-slot">'
+        f'{"".join(card_html)}</div></div>{footer}</body></html>'
+    )
+
+
+def _amazon_page(rng, listings, noise_kb):
+    cards = []
+    for rank, item in enumerate(listings, start=1):
+        title = html_lib.escape(item['title'])
+        cards.append(
+            f'<div data-component-type="s-search-result" data-asin="{item["id"]}" data-index="{rank}" '
+            'class="sg-col-4-of-24 s-result-item s-asin"><div class="puis-card-container s-card-container">'
+            f'{_noise_markup(rng, noise_kb * 512)}'
+            f'<span class="a-declarative"><img class="s-image" src="{item["image"]}" alt="{title}" /></span>'
+            f'<h2 class="a-size-mini s-line-clamp-2"><a class="a-link-normal" href="/{item["slug"]}/dp/{item["id"]}/ref=sr_1_{rank}">'
+            f'<span class="a-size-medium a-color-base a-text-normal">{title}</span></a></h2>'
+            f'<span class="a-price" data-a-size="xl"><span class="a-offscreen">₹{item["price"]:,}</span>'
+            f'<span aria-hidden="true"><span class="a-price-whole">{item["price"]:,}</span></span></span>'
+            f'{SPONSORED_LABEL if item["sponsored"] else ""}'
+            f'{_noise_markup(rng, noise_kb * 512)}</div></div>'
+        )
+    return _html_page(rng, cards, noise_kb)
+
+
+def _flipkart_page(rng, listings, noise_kb):
+    cards = []
+    for item in listings:
+        title = html_lib.escape(item['title'])
+        cards.append(
+            f'<div class="_1AtVbE col-12-12"><div data-id="{item["id"]}" style="width:100%">'
+            f'{SPONSORED_LABEL if item["sponsored"] else ""}'
+            f'<a class="_1fQZEK" rel="noopener noreferrer" href="/{item["slug"]}/p/itm{item["id"].lower()}?pid={item["id"]}">'
+            f'<img src="{item["image"]}" alt="{title}" /><div class="_3pLy-c row"><div class="col col-7-12">'
+            f'<div class="_4rR01T">{title}</div>{_noise_markup(rng, noise_kb * 512)}</div>'
+            f'<div class="col col-5-12"><div class="_30jeq3 _1_WHN1">₹{item["price"]:,}</div></div></div></a>'
+            f'{_noise_markup(rng, noise_kb * 512)}</div></div>'
+        )
+    return _html_page(rng, cards, noise_kb)
+
+
+def _ajio_page(rng, listings, noise_kb):
+    cards = []
+    for item in listings:
+        title = html_lib.escape(item['title'])
+        cards.append(
+            f'<div class="rilrtl-products-list__item" tabindex="0">'
+            f'<a href="/{item["slug"]}/p/{item["id"]}_black" class="rilrtl-products-list__link">'
+            f'<div class="imgHolder"><img src="{item["image"]}" class="rilrtl-lazy-img" alt="{title}" /></div>'
+            f'<div class="contentHolder"><div class="nameCls">{title}</div>'
+            f'<div class="priceBox"><span class="price"><strong>₹{item["price"]:,}</strong></span></div>'
+            f'{_noise_markup(rng, noise_kb * 512)}</div></a>{_noise_markup(rng, noise_kb * 512)}</div>'
+        )
+    return _html_page(rng, cards, noise_kb)
+
+
+def _myntra_page(rng, listings, noise_kb):
+    products = [
+        {
+            'productName': item['title'],
+            'discountedPrice': item['price'],
+            'landingPageUrl': f'{item["slug"]}/{int(item["id"], 16) % 10**8}/buy',
+            'images': [{'src': item['image']}],
+            **_noise_fields(rng, noise_kb * 1024),
+        }
+        for item in listings
+    ]
+    state = {'searchData': {'results': {'products': products, 'totalCount': len(products)}}}
+    return (
+        f'<!doctype html><html><head>{_noise_markup(rng, noise_kb * 1024 * 4)}</head><body><div id="mountRoot"></div>'
+        f'<script>window.__myx = {json.dumps(state)};</script>{_noise_markup(rng, noise_kb * 1024 * 2)}</body></html>'
+    )
+
+
+def _meesho_page(rng, listings, noise_kb):
+    catalogs = [
+        {
+            'id': int(item['id'], 16) % 10**9,
+            'name': item['title'],
+            'slug': item['slug'],
+            'price': item['price'],
+            'image': item['image'],
+            **_noise_fields(rng, noise_kb * 1024),
+        }
+        for item in listings
+    ]
+    state = {'props': {'pageProps': {'initialState': {'searchListing': {'catalogs': catalogs}}}}}
+    return (
+        f'<!doctype html><html><head>{_noise_markup(rng, noise_kb * 1024 * 4)}</head><body><div id="__next"></div>'
+        f'<script id="__NEXT_DATA__" type="application/json">{json.dumps(state)}</script>'
+        f'{_noise_markup(rng, noise_kb * 1024 * 2)}</body></html>'
+    )
+
+
+PAGE_BUILDERS = {
+    'Amazon': _amazon_page,
+    'Flipkart': _flipkart_page,
+    'Myntra': _myntra_page,
+    'Ajio': _ajio_page,
+    'Meesho': _meesho_page,
+}
+
+
+def synthesise_page(source, cards, *, noise_kb=16, seed=0):
+    """
+    Return a search page for ``source`` with ``cards`` result cards.
+
+    Each card carries about ``noise_kb`` KB of filler (wrapper divs, icons,
+    tracking JSON, styles, comments, or SKU metadata for the JSON-backed
+    sources), and the page adds six times that as head and footer chrome.
+    Output depends only on the arguments.
+    """
+    rng = random.Random(f'{source}:{seed}')
+    return PAGE_BUILDERS[source](rng, _listings(cards, seed), noise_kb)
+
+
+def _memory_status():
+    """Return ``(VmRSS, VmHWM)`` in KB for this process, or None off Linux."""
+    try:
+        with open('/proc/self/status', encoding='ascii') as status:
+            fields = dict(line.split(':', 1) for line in status if line.startswith(('VmRSS', 'VmHWM')))
+        return int(fields['VmRSS'].split()[0]), int(fields['VmHWM'].split()[0])
+    except (OSError, KeyError, ValueError):
+        return None
+
+
+def _reset_peak_rss():
+    try:
+        with open('/proc/self/clear_refs', 'w', encoding='ascii') as clear_refs:
+            clear_refs.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def measure_memory(source, html, backend):
+    """
+    Worker entry point: parse ``html`` in this fresh process and report, in KB,
+    how far the resident set peaked above its size before the parse, and the
+    peak traced Python allocation. The resident-set figure includes libxml2's
+    own allocations, which tracemalloc cannot see; it is None where the kernel
+    peak cannot be reset (anything but Linux).
+    """
+    module_path, class_name = PARSER_CLASSES[source].rsplit('.', 1)
+    scraper = getattr(importlib.import_module(module_path), class_name)()
+    scraper.parse_candidates('<html></html>', backend=backend)
+
+    rss_kb = None
+    before = _memory_status()
+    if before is not None and _reset_peak_rss():
+        scraper.parse_candidates(html, backend=backend)
+        after = _memory_status()
+        rss_kb = after[1] - before[0] if after else None
+
+    tracemalloc.start()
+    try:
+        scraper.parse_candidates(html, backend=backend)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return rss_kb, round(peak / 1024)
+
+
+def _measure_memory_isolated(source, html, backend):
+    with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context('spawn')) as pool:
+        return pool.submit(measure_memory, source, html, backend).result()
+
+
+class Command(BaseCommand):
+    help = (
+        'Benchmarks every parser backend of each source on the test fixtures, saved pages or synthetic '
+        'search pages: parse time, throughput, per-candidate cost and peak memory.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Parses per backend and page.',
+        )
+        parser.add_argument(
+            '--html',
+            nargs=2,
+            action='append',
+            metavar=('SOURCE', 'PATH'),
+            help='Benchmark a saved search page instead of the test fixture (e.g. --html Amazon page.html).',
+        )
+        parser.add_argument(
+            '--cards',
+            type=int,
+            nargs='+',
+            help='Benchmark synthetic pages with these card counts instead of the fixtures (e.g. --cards 24 60).',
+        )
+        parser.add_argument(
+            '--noise-kb',
+            type=int,
+            default=16,
+            help='Filler markup per synthetic card, in KB; 16 gives Amazon-sized pages of about 1 MB at 60 cards.',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Seed for the synthetic pages.',
+        )
+        parser.add_argument(
+            '--source',
+            action='append',
+            choices=list(PAGE_BUILDERS),
+            help='Only benchmark this source (repeatable).',
+        )
+        parser.add_argument(
+            '--memory',
+            action='store_true',
+            help='Also measure peak memory per parse, each in a fresh worker process.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Print the results as JSON instead of one line per page.',
+        )
+        parser.add_argument(
+            '--output',
+            help='Write the JSON results to this file.',
+        )
+
+    def _pages(self, options):
+        scrapers = {scraper_class.website: (scraper_class, fixture) for scraper_class, fixture in BENCH_SCRAPERS}
+        sources = options.get('source') or list(scrapers)
+
+        if options.get('cards'):
+            if any(cards <= 0 for cards in options['cards']) or options['noise_kb'] < 0:
+                raise CommandError('--cards must be positive and --noise-kb cannot be negative.')
+            for source in sources:
+                for cards in options['cards']:
+                    html = synthesise_page(source, cards, noise_kb=options['noise_kb'], seed=options['seed'])
+                    yield source, scrapers[source][0], f'synthetic, {cards} cards', cards, html
+            return
+
+        paths = {source: FIXTURE_DIR / scrapers[source][1] for source in sources}
+        for source, path in options.get('html') or []:
+            if source not in scrapers:
+                raise CommandError(f'Unknown source {source!r}; choose from {", ".join(scrapers)}.')
+            paths[source] = Path(path)
+        for source, path in paths.items():
+            yield source, scrapers[source][0], path.name, None, path.read_text(encoding='utf-8')
+
+    def handle(self, *args, **options):
+        iterations = max(1, options['iterations'])
+        results = []
+
+        for source, scraper_class, label, cards, html in self._pages(options):
+            scraper = scraper_class()
+            size = len(html.encode('utf-8'))
+            backends = {}
+            outputs = {}
+            for backend in scraper.parser_backends:
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    outputs[backend] = scraper.parse_candidates(html, backend=backend)
+                seconds = (time.perf_counter() - started) / iterations
+                candidates = len(outputs[backend])
+                backends[backend] = {
+                    'ms_per_parse': round(seconds * 1000, 4),
+                    'mb_per_second': round(size / seconds / 1e6, 2),
+                    'candidates_per_second': round(candidates / seconds, 1),
+                    'us_per_candidate': round(seconds * 1e6 / candidates, 2) if candidates else None,
+                }
+                if options['memory']:
+                    rss_kb, traced_kb = _measure_memory_isolated(source, html, backend)
+                    backends[backend]['peak_rss_kb'] = rss_kb
+                    backends[backend]['peak_traced_kb'] = traced_kb
+
+            first = next(iter(outputs.values()))
+            results.append({
+                'source': source,
+                'page': label,
+                'bytes': size,
+                'cards': cards,
+                'candidates': len(first),
+                'identical': all(output == first for output in outputs.values()),
+                'backends': backends,
+            })
+
+        report = {
+            'benchmark': 'parsers',
+            'revision': git_revision(),
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'iterations': iterations,
+            'noise_kb': options['noise_kb'] if options.get('cards') else None,
+            'seed': options['seed'],
+            'results': results,
+        }
+        if options.get('output'):
+            Path(options['output']).write_text(json.dumps(report, indent=2) + '\n', encoding='utf-8')
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        for result in results:
+            timings = ', '.join(
+                f"{backend} {stats['ms_per_parse']:.3f} ms ({stats['mb_per_second']:.1f} MB/s"
+                + (f", {stats['us_per_candidate']:.1f} us/candidate" if stats['us_per_candidate'] is not None else '')
+                + (f", peak RSS +{stats['peak_rss_kb']} KB, traced {stats['peak_traced_kb']} KB" if 'peak_traced_kb' in stats else '')
+                + ')'
+                for backend, stats in result['backends'].items()
+            )
+            line = f"{result['source']} ({result['page']}, {result['bytes']} bytes, {result['candidates']} candidates): {timings}"
+            if len(result['backends']) > 1:
+                line += ', identical output' if result['identical'] else ', OUTPUT DIFFERS'
+            self.stdout.write(self.style.SUCCESS(line) if result['identical'] else self.style.ERROR(line))
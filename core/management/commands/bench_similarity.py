@@ -0,0 +1,130 @@
+import difflib
+import time
+from pathlib import Path
+
+from django.core.management.base import BaseCommand, CommandError
+
+from core.services.matcher import _normalize_text, _normalized_match_score
+from core.services.scraper.ajio import AjioScraper
+from core.services.scraper.amazon import AmazonScraper
+from core.services.scraper.flipkart import FlipkartScraper
+from core.services.scraper.meesho import MeeshoScraper
+from core.services.scraper.myntra import MyntraScraper
+from core.services.similarity import KERNELS
+
+
+FIXTURE_DIR = Path(__file__).resolve().parents[2] / 'tests' / 'fixtures'
+
+FIXTURE_SCRAPERS = [
+    (AmazonScraper, 'amazon_search.html'),
+    (FlipkartScraper, 'flipkart_search.html'),
+    (MyntraScraper, 'myntra_search.html'),
+    (AjioScraper, 'ajio_search.html'),
+    (MeeshoScraper, 'meesho_search.html'),
+]
+
+DEFAULT_QUERIES = [
+    'Apple iPhone 17 256GB',
+    'Nike Air Zoom Pegasus 41',
+    'Nike Revolution 7',
+    'Cotton Kurta Set',
+]
+
+# Marketplace boilerplate used to stretch fixture titles to Amazon-like lengths.
+TITLE_PADDING = (
+    ' | Latest Model with Fast Charging, Dual SIM, Super Retina Display, All-Day Battery Life,'
+    ' 1 Year Manufacturer Warranty, Free Delivery and Easy Returns | Premium Build Quality'
+)
+
+
+def _difflib_ratio(a, b):
+    return difflib.SequenceMatcher(None, a, b).ratio()
+
+
+def _fixture_titles():
+    titles = []
+    for scraper_class, fixture in FIXTURE_SCRAPERS:
+        html = (FIXTURE_DIR / fixture).read_text(encoding='utf-8')
+        titles.extend(candidate.title for candidate in scraper_class().parse_candidates(html))
+    return titles
+
+
+def _ranking(scores):
+    return sorted(range(len(scores)), key=lambda index: (-scores[index], index))
+
+
+class Command(BaseCommand):
+    help = (
+        'Compares the matcher similarity kernels with difflib on fixture titles: kernel time per pair, '
+        'and whether the matcher tiebreak score orders the titles the same way.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--iterations',
+            type=int,
+            default=200,
+            help='Passes over every query/title pair per kernel.',
+        )
+        parser.add_argument(
+            '--titles',
+            help='File with one listing title per line, used instead of the fixture titles.',
+        )
+        parser.add_argument(
+            '--query',
+            action='append',
+            help='Query to score the titles against (repeatable).',
+        )
+        parser.add_argument(
+            '--pad',
+            type=int,
+            action='append',
+            metavar='CHARS',
+            help='Also benchmark the titles stretched to this many characters with listing boilerplate (repeatable).',
+        )
+
+    def handle(self, *args, **options):
+        iterations = max(1, options['iterations'])
+        if options.get('titles'):
+            path = Path(options['titles'])
+            if not path.exists():
+                raise CommandError(f'No such file: {path}')
+            titles = [line.strip() for line in path.read_text(encoding='utf-8').splitlines() if line.strip()]
+        else:
+            titles = _fixture_titles()
+        queries = [_normalize_text(query) for query in options.get('query') or DEFAULT_QUERIES]
+        groups = [('as listed', [_normalize_text(title) for title in titles])]
+        for width in options.get('pad') or []:
+            padded = [_normalize_text((title + TITLE_PADDING * (width // len(TITLE_PADDING) + 1))[:width]) for title in titles]
+            groups.append((f'padded to {width} chars', padded))
+
+        kernels = {'difflib': _difflib_ratio, **KERNELS}
+        for label, group in groups:
+            pairs = len(queries) * len(group)
+            average = sum(len(title) for title in group) / len(group)
+            self.stdout.write(f'{len(group)} titles {label} (avg {average:.0f} chars), {len(queries)} queries:')
+
+            reference = {query: [_normalized_match_score(query, title, _difflib_ratio) for title in group] for query in queries}
+            baseline = None
+            for name, kernel in kernels.items():
+                started = time.perf_counter()
+                for _ in range(iterations):
+                    for query in queries:
+                        for title in group:
+                            kernel(query, title)
+                per_pair = (time.perf_counter() - started) * 1e6 / (iterations * pairs)
+                baseline = baseline or per_pair
+
+                scores = {query: [_normalized_match_score(query, title, kernel) for title in group] for query in queries}
+                same_order = sum(_ranking(scores[query]) == _ranking(reference[query]) for query in queries)
+                deviation = max(
+                    abs(score - expected)
+                    for query in queries
+                    for score, expected in zip(scores[query], reference[query])
+                )
+                line = (
+                    f'  {name:<9} {per_pair:8.2f} us/pair  {baseline / per_pair:5.2f}x  '
+                    f'tiebreak order same as difflib for {same_order}/{len(queries)} queries, '
+                    f'max tiebreak score delta {deviation:.4f}'
+                )
+                self.stdout.write(self.style.SUCCESS(line) if same_order == len(queries) else self.style.WARNING(line))
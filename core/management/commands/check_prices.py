@@ -1,8 +1,48 @@
-from django.core.management.base import BaseCommand
-from core.models import Product
-from core.services.tracker import track_prices_for_product
+from django.core.management.base import BaseCommand, CommandError
+from core.constants import WEBSITE_ORDER
+from core.services.benchmarks import generate_corpus, git_revision
+from core.models import Product, SourceCircuit
+from core.services.browser import browser_pool_stats, render_stats
+from core.services.fetch_strategy import get_fetch_strategy
+from core.services.http import session_stats, stream_stats
+from core.services.parsing import get_parse_executor
+from core.services.matcher import get_profile_cache
+from core.services.scraper.simulated import SimulatedSource, simulated_scraper_classes
+from core.services.tracker import (
+    TRACKER_STAGES,
+    prerender_products,
+    reset_stage_stats,
+    stage_stats,
+    stuck_search_count,
+    track_prices_for_product,
+    warm_profile_cache,
+)
+from django.conf import settings
+from django.db import connection, transaction
+from contextlib import redirect_stdout
+from datetime import datetime, timezone
+import io
+import json
+import platform
 import time
 
+
+def _per_source(values, option):
+    """Turn repeated ``--option VALUE`` / ``--option SOURCE=VALUE`` flags into a value per source."""
+    result = dict.fromkeys(WEBSITE_ORDER, 0.0)
+    for value in values or []:
+        source, _, number = value.rpartition('=')
+        try:
+            number = float(number)
+        except ValueError:
+            raise CommandError(f'{option} expects SECONDS/RATE or SOURCE=VALUE, got {value!r}.') from None
+        if source and source not in result:
+            raise CommandError(f'Unknown source {source!r} for {option}; choose from {", ".join(WEBSITE_ORDER)}.')
+        for website in [source] if source else WEBSITE_ORDER:
+            result[website] = number
+    return result
+
+
 class Command(BaseCommand):
     help = 'Scans all tracked products, updates prices, and sends alerts if thresholds are met.'
 
@@ -12,9 +52,61 @@ class Command(BaseCommand):
             type=int,
             help='Run in a loop with a specified delay (in seconds) between scans.',
         )
+        parser.add_argument(
+            '--render-batch',
+            type=int,
+            default=0,
+            help='Pre-render browser-only sources for this many products at a time on the async engine.',
+        )
+        parser.add_argument(
+            '--benchmark',
+            type=int,
+            metavar='PRODUCTS',
+            help=(
+                'Track this many generated products against simulated sources inside a transaction that is '
+                'rolled back, and report throughput, DB queries and stage timings instead of checking prices.'
+            ),
+        )
+        parser.add_argument(
+            '--latency',
+            action='append',
+            metavar='[SOURCE=]SECONDS',
+            help='Benchmark: mean simulated search latency, for every source or one (repeatable).',
+        )
+        parser.add_argument(
+            '--error-rate',
+            action='append',
+            metavar='[SOURCE=]RATE',
+            help='Benchmark: share of searches that raise a connection error (repeatable).',
+        )
+        parser.add_argument(
+            '--blocked-rate',
+            action='append',
+            metavar='[SOURCE=]RATE',
+            help='Benchmark: share of searches answered with a block page (repeatable).',
+        )
+        parser.add_argument(
+            '--seed',
+            type=int,
+            default=0,
+            help='Benchmark: seed for the generated products and simulated outcomes.',
+        )
+        parser.add_argument(
+            '--json',
+            action='store_true',
+            help='Benchmark: print the report as JSON.',
+        )
 
     def handle(self, *args, **options):
+        if options.get('benchmark') is not None:
+            return self._benchmark(options)
+
         loop_delay = options.get('loop')
+        render_batch = options.get('render_batch') or 0
+
+        if settings.MATCHER_PROFILE_WARM_START:
+            warmed = warm_profile_cache()
+            self.stdout.write(f'Warmed matcher profile cache with {warmed} stored titles')
         
         while True:
             try:
@@ -23,7 +115,13 @@ class Command(BaseCommand):
                 
                 self.stdout.write(self.style.SUCCESS(f'[{time.strftime("%Y-%m-%d %H:%M:%S")}] Starting price check for {total} products...'))
                 
+                products = list(products)
                 for i, product in enumerate(products, 1):
+                    if render_batch and (i - 1) % render_batch == 0:
+                        batch = products[i - 1:i - 1 + render_batch]
+                        rendered = prerender_products(batch)
+                        self.stdout.write(f'  -> Pre-rendered {rendered} pages for the next {len(batch)} products')
+
                     self.stdout.write(f'[{i}/{total}] Checking: {product.name}...')
                     
                     try:
@@ -49,6 +147,63 @@ class Command(BaseCommand):
                         time.sleep(2)
                 
                 self.stdout.write(self.style.SUCCESS('Price check completed successfully.'))
+
+                for host, stats in session_stats().items():
+                    self.stdout.write(
+                        f"HTTP {host}: {stats['requests']} requests over {stats['connections_opened']} connections "
+                        f"({stats['connections_reused']} reused)"
+                    )
+
+                for website, stats in stream_stats().items():
+                    self.stdout.write(
+                        f"Streamed {website}: {stats['cut_short']}/{stats['fetches']} pages cut short, "
+                        f"{stats['bytes_read']} bytes read, {stats['bytes_saved']} bytes skipped"
+                    )
+
+                for website, stats in get_fetch_strategy().stats().items():
+                    self.stdout.write(
+                        f"Fetch {website}: HTTP usable {stats['http_rate']:.0%} of {stats['http_samples']}, "
+                        f"render usable {stats['render_rate']:.0%} of {stats['render_samples']}"
+                    )
+
+                parse_executor = get_parse_executor()
+                if parse_executor is not None:
+                    parse_stats = parse_executor.stats()
+                    self.stdout.write(
+                        f"Parse pool: {parse_stats['submitted']} pages on {parse_stats['workers']} workers "
+                        f"({parse_stats['failed']} fell back inline)"
+                    )
+
+                profile_stats = get_profile_cache().stats()
+                self.stdout.write(
+                    f"Matcher profiles: {profile_stats['hits']} hits, {profile_stats['misses']} misses "
+                    f"({profile_stats['hit_rate']:.0%}), {profile_stats['size']}/{profile_stats['maxsize']} cached"
+                )
+
+                stages = stage_stats()
+                if stages:
+                    self.stdout.write('Tracker stages: ' + ', '.join(
+                        f"{stage} {stats['seconds']:.1f}s" for stage, stats in stages.items()
+                    ))
+
+                stuck = stuck_search_count()
+                if stuck:
+                    self.stdout.write(self.style.WARNING(
+                        f'{stuck} source searches are still running past their deadline and holding search workers'
+                    ))
+
+                pool_stats = browser_pool_stats()
+                if pool_stats['launches']:
+                    self.stdout.write(
+                        f"Browser pool: {pool_stats['pages_rendered']} pages rendered, "
+                        f"{pool_stats['launches']} launches, {pool_stats['recycles']} recycles, "
+                        f"{pool_stats['crashes']} crashes, {pool_stats['timeouts']} timed out"
+                    )
+                for source, totals in render_stats().items():
+                    self.stdout.write(
+                        f"Render {source}: {totals['renders']} pages, {totals['bytes_received'] // 1024} KB received, "
+                        f"~{totals['bytes_saved_estimate'] // 1024} KB saved by blocking {totals['requests_blocked']} requests"
+                    )
                 
                 # Exit if not looping
                 if not loop_delay:
@@ -61,3 +216,92 @@ class Command(BaseCommand):
             except KeyboardInterrupt:
                 self.stdout.write(self.style.SUCCESS('\nUser interrupted. Exiting...'))
                 break
+
+    def _benchmark(self, options):
+        count = options['benchmark']
+        if count <= 0:
+            raise CommandError('--benchmark needs a positive number of products.')
+        latency = _per_source(options.get('latency'), '--latency')
+        error_rate = _per_source(options.get('error_rate'), '--error-rate')
+        blocked_rate = _per_source(options.get('blocked_rate'), '--blocked-rate')
+        sources = [
+            SimulatedSource(website, latency=latency[website], error_rate=error_rate[website], blocked_rate=blocked_rate[website])
+            for website in WEBSITE_ORDER
+        ]
+        scraper_classes = simulated_scraper_classes(sources, seed=options['seed'])
+        queries, _titles = generate_corpus(0, queries=count, seed=options['seed'])
+
+        queries_run = 0
+
+        def count_queries(execute, sql, params, many, context):
+            nonlocal queries_run
+            queries_run += 1
+            return execute(sql, params, many, context)
+
+        states = {website: {} for website in WEBSITE_ORDER}
+        accepted = 0
+        self.stderr.write(f'Tracking {count} generated products against simulated sources...')
+        # Everything, including circuit state, is rolled back so the real database is left untouched.
+        with transaction.atomic():
+            SourceCircuit.objects.all().delete()
+            products = Product.objects.bulk_create(Product(name=query, search_query=query) for query in queries)
+            reset_stage_stats()
+            with connection.execute_wrapper(count_queries), redirect_stdout(io.StringIO()) as tracker_output:
+                started = time.perf_counter()
+                for product in products:
+                    result = track_prices_for_product(product, scraper_classes=scraper_classes)
+                    accepted += len(result['accepted_results'])
+                    for status in result['source_statuses']:
+                        counts = states[status['website']]
+                        counts[status['state']] = counts.get(status['state'], 0) + 1
+                    # The tracker prints per product; drop it so the buffer does not grow with the run.
+                    tracker_output.seek(0)
+                    tracker_output.truncate()
+                seconds = time.perf_counter() - started
+            transaction.set_rollback(True)
+
+        stages = stage_stats()
+        staged = sum(stats['seconds'] for stats in stages.values()) or 1.0
+        report = {
+            'benchmark': 'tracker',
+            'revision': git_revision(),
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'seed': options['seed'],
+            'products': count,
+            'concurrent': settings.TRACKER_CONCURRENT_SOURCES,
+            'sources': {
+                source.website: {'latency': source.latency, 'error_rate': source.error_rate, 'blocked_rate': source.blocked_rate}
+                for source in sources
+            },
+            'seconds': round(seconds, 3),
+            'products_per_minute': round(count * 60 / seconds, 1),
+            'db_queries': queries_run,
+            'db_queries_per_product': round(queries_run / count, 2),
+            'accepted_prices': accepted,
+            'stages': {
+                stage: {
+                    'seconds': round(stages[stage]['seconds'], 4),
+                    'ms_per_product': round(stages[stage]['seconds'] * 1000 / count, 3),
+                    'share': round(stages[stage]['seconds'] / staged, 4),
+                }
+                for stage in TRACKER_STAGES
+                if stage in stages
+            },
+            'states': states,
+        }
+
+        if options['json']:
+            self.stdout.write(json.dumps(report, indent=2))
+            return
+
+        self.stdout.write(self.style.SUCCESS(
+            f"Tracked {count} products in {seconds:.1f}s: {report['products_per_minute']} products/min, "
+            f"{report['db_queries_per_product']} DB queries per product, {accepted} prices accepted"
+        ))
+        self.stdout.write('Stages: ' + ', '.join(
+            f"{stage} {stats['ms_per_product']:.2f} ms/product ({stats['share']:.0%})"
+            for stage, stats in report['stages'].items()
+        ))
+        for website, counts in states.items():
+            self.stdout.write(f"{website}: " + ', '.join(f'{state} {number}' for state, number in sorted(counts.items())))
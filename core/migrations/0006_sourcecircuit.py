@@ -0,0 +1,32 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:21
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0005_sources_status_and_match_metadata'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SourceCircuit',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('website', models.CharField(max_length=100, unique=True)),
+                ('state', models.CharField(choices=[('closed', 'Closed'), ('open', 'Open'), ('half_open', 'Half-open')], default='closed', max_length=20)),
+                ('consecutive_failures', models.PositiveIntegerField(default=0)),
+                ('trip_count', models.PositiveIntegerField(default=0)),
+                ('opened_at', models.DateTimeField(blank=True, null=True)),
+                ('last_transition_at', models.DateTimeField(blank=True, null=True)),
+                ('last_outcome', models.CharField(blank=True, max_length=20)),
+                ('last_http_status', models.PositiveIntegerField(blank=True, null=True)),
+                ('last_diagnostic_message', models.TextField(blank=True)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+            options={
+                'ordering': ['website'],
+            },
+        ),
+    ]
@@ -87,3 +87,29 @@ class SourceStatus(models.Model):
 
     def __str__(self):
         return f"{self.product.name} - {self.website} - {self.get_state_display()}"
+
+
+class SourceCircuit(models.Model):
+    """Per-source circuit breaker that skips searches while a source keeps failing."""
+
+    class State(models.TextChoices):
+        CLOSED = 'closed', 'Closed'
+        OPEN = 'open', 'Open'
+        HALF_OPEN = 'half_open', 'Half-open'
+
+    website = models.CharField(max_length=100, unique=True)
+    state = models.CharField(max_length=20, choices=State.choices, default=State.CLOSED)
+    consecutive_failures = models.PositiveIntegerField(default=0)
+    trip_count = models.PositiveIntegerField(default=0)
+    opened_at = models.DateTimeField(null=True, blank=True)
+    last_transition_at = models.DateTimeField(null=True, blank=True)
+    last_outcome = models.CharField(max_length=20, blank=True)
+    last_http_status = models.PositiveIntegerField(null=True, blank=True)
+    last_diagnostic_message = models.TextField(blank=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        ordering = ['website']
+
+    def __str__(self):
+        return f"{self.website} - {self.get_state_display()}"
@@ -0,0 +1,101 @@
+"""
+Shared inputs for the benchmark commands.
+
+Notes:
+- ``generate_corpus`` builds reproducible marketplace titles for the matcher
+  and parser benchmarks, and product queries for ``check_prices --benchmark``.
+- ``git_revision`` stamps each JSON report with the commit it was measured on.
+"""
+
+import random
+import subprocess
+
+from django.conf import settings
+
+
+FAMILIES = [
+    ('Samsung', 'Galaxy S{n}', 'Smartphone', ['Ultra', 'Plus', 'FE', '']),
+    ('Samsung', 'Galaxy Tab S{n}', 'Tablet', ['Ultra', 'Plus', 'FE', '']),
+    ('Apple', 'iPhone {n}', 'Mobile Phone', ['Pro Max', 'Pro', 'Plus', '']),
+    ('Apple', 'MacBook Air M{n}', 'Laptop', ['', '']),
+    ('OnePlus', 'Nord CE{n}', 'Smartphone', ['Lite', '']),
+    ('Lenovo', 'IdeaPad Slim {n}', 'Laptop', ['Pro', '']),
+    ('HP', 'Pavilion {n}', 'Laptop', ['Plus', 'x360', '']),
+    ('Sony', 'Bravia X{n}L', 'Smart TV', ['', '']),
+    ('LG', 'C{n} OLED', 'Smart TV', ['', '']),
+    ('boAt', 'Rockerz {n}', 'Bluetooth Headphones', ['Pro', '']),
+    ('Whirlpool', '{n} L Frost Free', 'Refrigerator', ['', '']),
+    ('LG', '{n} kg Front Load', 'Washing Machine', ['', '']),
+]
+STORAGES = ['64GB', '128GB', '256 GB', '512GB', '1TB']
+MEMORY = ['4GB RAM', '8GB RAM', '12 GB RAM', '16GB RAM']
+COLOURS = ['Black', 'Titanium Grey', 'Midnight', 'Starlight', 'Silver', 'Blue', 'Mint Green', 'Lavender']
+ACCESSORIES = ['Back Cover', 'Tempered Glass', 'Screen Protector', 'Charger Cable', 'Silicone Case', 'Laptop Sleeve', 'Stand']
+REFURBISHED = ['(Renewed)', 'Refurbished', 'Pre-Owned']
+BOILERPLATE = [
+    '| 5G | Latest Model',
+    'with No Cost EMI & Additional Exchange Offers',
+    '- Fast Charging, All-Day Battery',
+    '(Pack of 1)',
+    'Official Warranty',
+]
+
+
+def _family_instance(rng, family):
+    brand, pattern, category, lines = family
+    model = f'{brand} {pattern.format(n=rng.randint(5, 30))}'
+    line = rng.choice(lines)
+    return brand, (f'{model} {line}'.strip()), category
+
+
+def generate_corpus(size, *, queries=50, seed=0):
+    """
+    Return ``(queries, titles)`` where every title belongs to one query's product
+    family. About 60% of titles are plausible listings for their query: the same
+    model in another colour and with marketplace boilerplate, occasionally with a
+    different RAM size. The rest are variant siblings, accessories for the model
+    and refurbished units. The same ``size``, ``queries`` and ``seed`` always
+    give the same corpus.
+    """
+    rng = random.Random(seed)
+    products = []
+    for _ in range(queries):
+        brand, model, category = _family_instance(rng, rng.choice(FAMILIES))
+        storage = rng.choice(STORAGES + [''])
+        memory = rng.choice(MEMORY + [''])
+        products.append((f'{model} {storage}'.strip(), model, category, storage, memory))
+
+    titles = []
+    for index in range(size):
+        query, model, category, storage, memory = products[index % len(products)]
+        roll = rng.random()
+        colour = rng.choice(COLOURS)
+        noise = rng.choice(BOILERPLATE + [''] * 3)
+        if roll < 0.6:
+            if roll >= 0.59:
+                memory = rng.choice(MEMORY)
+            extras = [storage or rng.choice(STORAGES), memory]
+            title = f'{model} {category} ({colour}, {", ".join(extra for extra in extras if extra)}) {noise}'
+        elif roll < 0.75:
+            title = f'{model} {rng.choice(["Pro", "Max", "Lite", "Plus"])} {rng.choice(STORAGES)} {colour} {noise}'
+        elif roll < 0.9:
+            title = f'{rng.choice(ACCESSORIES)} for {model} {colour} {noise}'
+        else:
+            title = f'{model} {storage} {colour} {rng.choice(REFURBISHED)} {noise}'
+        titles.append((query, ' '.join(title.split())))
+    return [product[0] for product in products], titles
+
+
+def git_revision():
+    """Short hash of the checked-out commit, or None outside a git checkout."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'],
+            cwd=settings.BASE_DIR,
+            capture_output=True,
+            text=True,
+            timeout=5,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.SubprocessError):
+        return None
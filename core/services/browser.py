@@ -4,94 +4,636 @@ Playwright-based browser helper for scraping sites that block simple HTTP client
 Notes:
 - Uses Chromium headless by default.
 - Keeps implementation minimal and robust for Amazon/Flipkart search pages.
+- Browsers live in a process-wide pool of render threads. Sync Playwright objects
+  can only be driven from the thread that created them, so each pool thread owns
+  one long-lived browser and callers hand work to the pool through a queue.
 """
 
 from __future__ import annotations
 
-from dataclasses import dataclass
+import atexit
+import json
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from dataclasses import dataclass, field
 from typing import Optional
 
+from django.conf import settings
+
+
+LAUNCH_ARGS = [
+    "--disable-blink-features=AutomationControlled",
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+]
+
+DISMISS_SELECTORS = [
+    "button#sp-cc-accept",
+    "input#sp-cc-accept",
+    "button:has-text(\"Accept\")",
+    "button:has-text(\"I agree\")",
+    "button:has-text(\"Continue\")",
+]
+
+
+# Slack on top of the navigation and readiness timeouts before a caller gives up on a
+# render, covering browser launch and page setup. Time spent queued counts too.
+RENDER_RESULT_MARGIN_MS = 15000
+
+
+# Parsers only read DOM text and attributes, so none of these need to be downloaded.
+DEFAULT_BLOCKED_RESOURCE_TYPES = frozenset({'image', 'media', 'font', 'stylesheet'})
+
+DEFAULT_BLOCKED_URL_PATTERNS = (
+    'google-analytics.com',
+    'googletagmanager.com',
+    'doubleclick.net',
+    'googlesyndication.com',
+    'connect.facebook.net',
+    'hotjar.com',
+    'clarity.ms',
+    'branch.io',
+)
+
+# Typical transfer size of a resource type, used to estimate what an aborted request
+# saved until this process has seen that type downloaded.
+TYPICAL_RESOURCE_BYTES = {
+    'image': 30_000,
+    'media': 300_000,
+    'font': 40_000,
+    'stylesheet': 25_000,
+    'script': 60_000,
+}
+TYPICAL_OTHER_BYTES = 5_000
+
+
+@dataclass(frozen=True)
+class RenderOptions:
+    """
+    Per-scraper rendering configuration.
+
+    In lean mode every request whose resource type is in ``blocked_resource_types``
+    or whose URL contains one of ``blocked_url_patterns`` is aborted before it
+    leaves the browser. The main document is never blocked.
+
+    Readiness: the render returns as soon as at least ``ready_min_count``
+    elements match ``ready_selector`` and the JavaScript expression
+    ``ready_script`` is truthy (whichever are set), or after ``ready_timeout_ms``.
+    Without either condition the legacy fixed ``LEGACY_SETTLE_MS`` wait is used.
+
+    Extraction: when ``PLAYWRIGHT_IN_PAGE_EXTRACTION`` is on, ``extract_script``
+    (a JavaScript function source) runs in the page and its compact list of
+    candidate dicts is returned as ``BrowserFetchResult.items`` instead of the
+    full ``page.content()``. An empty extraction falls back to the HTML.
+    """
+
+    source: str = ''
+    lean: bool = True
+    blocked_resource_types: frozenset = DEFAULT_BLOCKED_RESOURCE_TYPES
+    blocked_url_patterns: tuple = ()
+    ready_selector: str = ''
+    ready_script: str = ''
+    ready_min_count: int = 1
+    ready_timeout_ms: int = 8000
+    extract_script: str = ''
+
+    @property
+    def has_ready_condition(self):
+        return bool(self.ready_selector or self.ready_script)
+
+    def ready_expression(self):
+        checks = []
+        if self.ready_selector:
+            checks.append(
+                f"document.querySelectorAll({json.dumps(self.ready_selector)}).length >= {int(self.ready_min_count)}"
+            )
+        if self.ready_script:
+            checks.append(f"!!({self.ready_script})")
+        return "() => " + " && ".join(f"({check})" for check in checks)
+
+    def should_block(self, resource_type, url):
+        if resource_type == 'document':
+            return False
+        if resource_type in self.blocked_resource_types:
+            return True
+        return any(pattern in url for pattern in DEFAULT_BLOCKED_URL_PATTERNS + self.blocked_url_patterns)
+
+
+DEFAULT_RENDER_OPTIONS = RenderOptions()
+
+
+@dataclass
+class FetchStats:
+    requests_allowed: int = 0
+    requests_blocked: int = 0
+    blocked_by_type: dict = field(default_factory=dict)
+    bytes_received: int = 0
+    bytes_saved_estimate: int = 0
+    render_ms: int = 0
+    ready_wait_ms: int = 0
+    ready: Optional[bool] = None
+    payload_bytes: int = 0
+    extracted: bool = False
+
 
 @dataclass
 class BrowserFetchResult:
     url: str
     html: str
     status: Optional[int] = None
+    stats: Optional[FetchStats] = None
+    items: Optional[list] = None
+
+
+@dataclass
+class _RenderJob:
+    url: str
+    wait_until: str
+    timeout_ms: int
+    options: RenderOptions
+    future: Future
+
+
+_render_stats = {}
+_render_stats_lock = threading.Lock()
+# Resource type -> [finished requests, bytes transferred] across every render.
+_resource_sizes = {}
+
 
+def _record_render_stats(source, stats):
+    with _render_stats_lock:
+        totals = _render_stats.setdefault(source or 'unknown', {
+            'renders': 0,
+            'requests_allowed': 0,
+            'requests_blocked': 0,
+            'bytes_received': 0,
+            'bytes_saved_estimate': 0,
+            'blocked_by_type': {},
+            'render_ms': 0,
+            'ready_wait_ms': 0,
+            'ready_timeouts': 0,
+            'payload_bytes': 0,
+            'extractions': 0,
+        })
+        totals['renders'] += 1
+        totals['requests_allowed'] += stats.requests_allowed
+        totals['requests_blocked'] += stats.requests_blocked
+        totals['bytes_received'] += stats.bytes_received
+        totals['bytes_saved_estimate'] += stats.bytes_saved_estimate
+        for resource_type, count in stats.blocked_by_type.items():
+            totals['blocked_by_type'][resource_type] = totals['blocked_by_type'].get(resource_type, 0) + count
+        totals['render_ms'] += stats.render_ms
+        totals['ready_wait_ms'] += stats.ready_wait_ms
+        if stats.ready is False:
+            totals['ready_timeouts'] += 1
+        totals['payload_bytes'] += stats.payload_bytes
+        if stats.extracted:
+            totals['extractions'] += 1
 
-def fetch_rendered_html(url: str, *, wait_until: str = "domcontentloaded", timeout_ms: int = 30000) -> Optional[BrowserFetchResult]:
+
+def render_stats():
     """
-    Fetch a page using Playwright Chromium and return rendered HTML.
+    Per-source rendering totals since process start.
 
-    Returns None if Playwright isn't available or fetch fails.
+    ``bytes_received`` is what was actually transferred, headers included.
+    ``bytes_saved_estimate`` prices each aborted request at the average size of
+    its resource type (see ``estimate_saved_bytes``), and ``blocked_by_type``
+    counts the aborts behind it.
     """
-    try:
-        from playwright.sync_api import sync_playwright
-        from playwright_stealth import Stealth
-    except Exception as e:
-        print(f"Playwright/Stealth not available: {e}")
-        return None
+    with _render_stats_lock:
+        return {
+            source: {**totals, 'blocked_by_type': dict(totals['blocked_by_type'])}
+            for source, totals in _render_stats.items()
+        }
 
-    try:
-        with sync_playwright() as p:
-            # Revert to Chromium for stealth
-            browser = p.chromium.launch(
-                headless=True,
-                args=[
-                    "--disable-blink-features=AutomationControlled",
-                    "--no-sandbox",
-                    "--disable-dev-shm-usage",
-                ],
-            )
-            context = browser.new_context(
-                # Stealth plugin handles User-Agent and others, but good to set viewport/locale
-                viewport={"width": 1280, "height": 720},
-                locale="en-US",
+
+def estimate_saved_bytes(blocked_by_type):
+    """
+    Bytes the aborted requests would have cost: each resource type at its average
+    transfer size seen so far, or ``TYPICAL_RESOURCE_BYTES`` before it has been seen.
+    """
+    with _render_stats_lock:
+        averages = {
+            resource_type: total // count
+            for resource_type, (count, total) in _resource_sizes.items()
+            if count
+        }
+    return sum(
+        count * averages.get(resource_type, TYPICAL_RESOURCE_BYTES.get(resource_type, TYPICAL_OTHER_BYTES))
+        for resource_type, count in blocked_by_type.items()
+    )
+
+
+class BrowserPool:
+    """
+    Long-lived pool of headless Chromium browsers.
+
+    ``size`` render threads each own one browser, which caps how many pages are
+    rendered at once. Every job gets a fresh, isolated browser context. A browser
+    is recycled after ``max_pages_per_browser`` pages or as soon as it crashes.
+    """
+
+    def __init__(self, size=2, max_pages_per_browser=50):
+        self.size = max(1, size)
+        self.max_pages_per_browser = max(1, max_pages_per_browser)
+        self._jobs = queue.Queue()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._closed = False
+        self._stats = {
+            'launches': 0,
+            'recycles': 0,
+            'crashes': 0,
+            'pages_rendered': 0,
+            'failures': 0,
+            'active_pages': 0,
+            'timeouts': 0,
+        }
+
+    def render(self, url, *, wait_until="domcontentloaded", timeout_ms=30000, options=None) -> Optional[BrowserFetchResult]:
+        future = Future()
+        options = options or DEFAULT_RENDER_OPTIONS
+        with self._lock:
+            if self._closed:
+                return None
+            self._ensure_threads()
+        self._jobs.put(_RenderJob(
+            url=url,
+            wait_until=wait_until,
+            timeout_ms=timeout_ms,
+            options=options,
+            future=future,
+        ))
+        budget_ms = timeout_ms + options.ready_timeout_ms + RENDER_RESULT_MARGIN_MS
+        try:
+            return future.result(timeout=budget_ms / 1000)
+        except FutureTimeoutError:
+            # A still-queued job is cancelled so no browser picks it up later; a
+            # running one finishes in the background and its result is dropped.
+            future.cancel()
+            self._bump('timeouts')
+            print(f"Playwright render of {url} gave no result within {budget_ms} ms")
+            return None
+
+    def stats(self):
+        with self._lock:
+            snapshot = dict(self._stats)
+            snapshot['size'] = self.size
+            snapshot['max_pages_per_browser'] = self.max_pages_per_browser
+            snapshot['queued'] = self._jobs.qsize()
+            snapshot['threads'] = sum(1 for thread in self._threads if thread.is_alive())
+        return snapshot
+
+    def shutdown(self, wait=True):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            threads = list(self._threads)
+        for _thread in threads:
+            self._jobs.put(None)
+        if wait:
+            for thread in threads:
+                thread.join(timeout=10)
+
+    def _ensure_threads(self):
+        self._threads = [thread for thread in self._threads if thread.is_alive()]
+        while len(self._threads) < self.size:
+            thread = threading.Thread(
+                target=self._worker,
+                name=f'browser-pool-{len(self._threads) + 1}',
+                daemon=True,
             )
-            page = context.new_page()
-            
-            # Apply stealth
-            Stealth().apply_stealth_sync(page)
-            
-            resp = page.goto(url, wait_until=wait_until, timeout=timeout_ms)
-
-            # Some sites show cookie banners/popups; attempt common dismiss patterns (best-effort)
+            self._threads.append(thread)
+            thread.start()
+
+    def _bump(self, key, amount=1):
+        with self._lock:
+            self._stats[key] += amount
+
+    def _worker(self):
+        try:
+            from playwright.sync_api import sync_playwright
+        except Exception as e:
+            print(f"Playwright not available: {e}")
+            self._drain_with(None)
+            return
+
+        try:
+            playwright = sync_playwright().start()
+        except Exception as e:
+            print(f"Playwright failed to start: {e}")
+            self._drain_with(None)
+            return
+
+        browser = None
+        pages_served = 0
+        try:
+            while True:
+                job = self._jobs.get()
+                if job is None:
+                    break
+                if not job.future.set_running_or_notify_cancel():
+                    continue
+
+                if browser is not None and (pages_served >= self.max_pages_per_browser or not browser.is_connected()):
+                    self._bump('recycles')
+                    _close_quietly(browser)
+                    browser = None
+
+                if browser is None:
+                    try:
+                        browser = playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+                        pages_served = 0
+                        self._bump('launches')
+                    except Exception as e:
+                        print(f"Playwright launch failed: {e}")
+                        self._bump('failures')
+                        job.future.set_result(None)
+                        continue
+
+                self._bump('active_pages')
+                try:
+                    result = _render_page(
+                        browser,
+                        job.url,
+                        wait_until=job.wait_until,
+                        timeout_ms=job.timeout_ms,
+                        options=job.options,
+                    )
+                except Exception as e:
+                    print(f"Playwright fetch failed for {job.url}: {e}")
+                    result = None
+                    if not browser.is_connected():
+                        self._bump('crashes')
+                        browser = None
+                finally:
+                    self._bump('active_pages', -1)
+
+                pages_served += 1
+                self._bump('pages_rendered' if result else 'failures')
+                job.future.set_result(result)
+        finally:
+            if browser is not None:
+                _close_quietly(browser)
             try:
-                for selector in [
-                    "button#sp-cc-accept",
-                    "input#sp-cc-accept",
-                    "button:has-text(\"Accept\")",
-                    "button:has-text(\"I agree\")",
-                    "button:has-text(\"Continue\")",
-                ]:
-                    el = page.query_selector(selector)
-                    if el:
-                        el.click(timeout=1000)
-                        break
+                playwright.stop()
             except Exception:
                 pass
 
+    def _drain_with(self, value):
+        while True:
+            try:
+                job = self._jobs.get_nowait()
+            except queue.Empty:
+                return
+            if job is not None and job.future.set_running_or_notify_cancel():
+                job.future.set_result(value)
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_browser_pool() -> BrowserPool:
+    """Return the process-wide browser pool, creating it on first use."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = BrowserPool(
+                size=getattr(settings, 'PLAYWRIGHT_POOL_SIZE', 2),
+                max_pages_per_browser=getattr(settings, 'PLAYWRIGHT_MAX_PAGES_PER_BROWSER', 50),
+            )
+            atexit.register(_pool.shutdown)
+        return _pool
+
+
+def browser_pool_stats():
+    return get_browser_pool().stats()
+
+
+def _close_quietly(browser):
+    try:
+        browser.close()
+    except Exception:
+        pass
+
+
+LEGACY_SETTLE_MS = 1200
+
+
+def _wait_until_ready(page, options, stats):
+    """Wait for the scraper's readiness condition, bounded by its hard deadline."""
+    started = time.monotonic()
+    try:
+        if options.has_ready_condition:
+            try:
+                page.wait_for_function(options.ready_expression(), timeout=options.ready_timeout_ms)
+                stats.ready = True
+            except Exception:
+                # Deadline hit: parse whatever rendered so far.
+                stats.ready = False
+        else:
             # Give scripts a moment to render key content
             try:
-                page.wait_for_timeout(1200)
+                page.wait_for_timeout(LEGACY_SETTLE_MS)
             except Exception:
                 pass
+    finally:
+        stats.ready_wait_ms = int((time.monotonic() - started) * 1000)
+
+
+def _extraction_enabled(options):
+    return bool(options.extract_script) and getattr(settings, 'PLAYWRIGHT_IN_PAGE_EXTRACTION', False)
+
+
+def _extract_items(page, options):
+    if not _extraction_enabled(options):
+        return None
+    try:
+        items = page.evaluate(options.extract_script)
+    except Exception as e:
+        print(f"In-page extraction failed for {options.source or page.url}: {e}")
+        return None
+    return items if isinstance(items, list) else None
+
+
+def _lean_enabled(options):
+    return options.lean and getattr(settings, 'PLAYWRIGHT_LEAN_RENDERING', True)
+
+
+def _should_abort(request, options, stats, lean):
+    """Count a routed request and say whether lean mode aborts it."""
+    if lean and options.should_block(request.resource_type, request.url):
+        stats.requests_blocked += 1
+        stats.blocked_by_type[request.resource_type] = stats.blocked_by_type.get(request.resource_type, 0) + 1
+        return True
+    stats.requests_allowed += 1
+    return False
+
+
+def _count_transfer(resource_type, sizes, stats):
+    """
+    Add a finished request's transfer size to ``stats``. ``sizes`` is Playwright's
+    ``Request.sizes()``; the body size is the encoded size, so chunked and compressed
+    responses count what went over the wire.
+    """
+    transferred = max(0, sizes.get('responseBodySize') or 0) + max(0, sizes.get('responseHeadersSize') or 0)
+    stats.bytes_received += transferred
+    with _render_stats_lock:
+        seen = _resource_sizes.setdefault(resource_type, [0, 0])
+        seen[0] += 1
+        seen[1] += transferred
+
+
+def _count_finished(request, stats):
+    try:
+        sizes = request.sizes()
+    except Exception:
+        return
+    _count_transfer(request.resource_type, sizes, stats)
+
+
+def _install_request_filter(context, page, options, stats):
+    lean = _lean_enabled(options)
 
-            html = page.content()
-            final_url = page.url
+    def handle_route(route):
+        if _should_abort(route.request, options, stats, lean):
+            route.abort()
+        else:
+            route.continue_()
+
+    context.route("**/*", handle_route)
+    page.on("requestfinished", lambda request: _count_finished(request, stats))
+
+
+def _render_page(browser, url, *, wait_until, timeout_ms, options=DEFAULT_RENDER_OPTIONS):
+    from playwright_stealth import Stealth
+
+    started = time.monotonic()
+    stats = FetchStats()
+    context = browser.new_context(
+        # Stealth plugin handles User-Agent and others, but good to set viewport/locale
+        viewport={"width": 1280, "height": 720},
+        locale="en-US",
+    )
+    try:
+        page = context.new_page()
+        _install_request_filter(context, page, options, stats)
+
+        # Apply stealth
+        Stealth().apply_stealth_sync(page)
+
+        resp = page.goto(url, wait_until=wait_until, timeout=timeout_ms)
+
+        # Some sites show cookie banners/popups; attempt common dismiss patterns (best-effort)
+        try:
+            for selector in DISMISS_SELECTORS:
+                el = page.query_selector(selector)
+                if el:
+                    el.click(timeout=1000)
+                    break
+        except Exception:
+            pass
+
+        _wait_until_ready(page, options, stats)
+
+        items = _extract_items(page, options)
+        html = '' if items else page.content()
+        final_url = page.url
+        status = None
+        try:
+            status = resp.status if resp else None
+        except Exception:
             status = None
-            try:
-                status = resp.status if resp else None
-            except Exception:
-                status = None
+    finally:
+        context.close()
 
-            context.close()
-            browser.close()
+    return _finish_render(url, final_url, status, html, items, options=options, stats=stats, started=started)
 
-            if not html or len(html) < 1000:
-                return None
-            return BrowserFetchResult(url=final_url, html=html, status=status)
+
+def _finish_render(url, final_url, status, html, items, *, options, stats, started):
+    """Record render stats and wrap the page output; shared by the sync and async engines."""
+    if items:
+        stats.extracted = True
+        stats.payload_bytes = len(json.dumps(items))
+    else:
+        items = None
+        stats.payload_bytes = len(html or '')
+    stats.render_ms = int((time.monotonic() - started) * 1000)
+    stats.bytes_saved_estimate = estimate_saved_bytes(stats.blocked_by_type)
+    _record_render_stats(options.source, stats)
+    print(
+        f"[render] {options.source or url}: {stats.requests_blocked} requests blocked "
+        f"(~{stats.bytes_saved_estimate // 1024} KB saved), "
+        f"{stats.bytes_received // 1024} KB received in {stats.render_ms} ms "
+        f"({stats.ready_wait_ms} ms waiting for readiness), "
+        f"{stats.payload_bytes // 1024} KB {'extracted' if stats.extracted else 'of HTML'} returned"
+    )
+
+    if items:
+        return BrowserFetchResult(url=final_url, html='', status=status, stats=stats, items=items)
+    if not html or len(html) < 1000:
+        return None
+    return BrowserFetchResult(url=final_url, html=html, status=status, stats=stats)
+
+
+_primed = {}
+_primed_lock = threading.Lock()
+PRIMED_TTL_SECONDS = 600
+
+
+def prime_rendered(results):
+    """
+    Hand pre-rendered pages (``{url: BrowserFetchResult}``) to ``fetch_rendered_html``.
+
+    Batch renderers such as ``render_urls`` use this so a scraper that later falls
+    back to rendering the same URL picks up the finished page instead of
+    rendering it again. Each primed page is served at most once.
+    """
+    expires_at = time.monotonic() + PRIMED_TTL_SECONDS
+    with _primed_lock:
+        for url, result in results.items():
+            if result is not None:
+                _primed[url] = (expires_at, result)
+
+
+def _take_primed(url):
+    now = time.monotonic()
+    with _primed_lock:
+        for key in [key for key, (expires_at, _result) in _primed.items() if expires_at < now]:
+            del _primed[key]
+        entry = _primed.pop(url, None)
+    return entry[1] if entry else None
+
+
+def fetch_rendered_html(
+    url: str,
+    *,
+    wait_until: str = "domcontentloaded",
+    timeout_ms: int = 30000,
+    options: Optional[RenderOptions] = None,
+) -> Optional[BrowserFetchResult]:
+    """
+    Fetch a page using a pooled Playwright Chromium browser and return rendered HTML.
+
+    ``options`` carries the calling scraper's render configuration (lean-mode
+    blocklists, readiness, extraction script). When in-page extraction succeeds
+    the result has ``items`` and an empty ``html``. Returns None if Playwright
+    isn't available or fetch fails.
+    """
+    primed = _take_primed(url)
+    if primed is not None:
+        return primed
+
+    try:
+        import playwright.sync_api  # noqa: F401
+        import playwright_stealth  # noqa: F401
     except Exception as e:
-        print(f"Playwright fetch failed for {url}: {e}")
+        print(f"Playwright/Stealth not available: {e}")
         return None
 
+    return get_browser_pool().render(url, wait_until=wait_until, timeout_ms=timeout_ms, options=options)
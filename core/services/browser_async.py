@@ -0,0 +1,206 @@
+"""
+Asyncio Playwright engine for rendering batches of pages.
+
+Notes:
+- One Chromium browser drives many pages at once from a single event loop, so a
+  batch of N renders needs neither N browsers nor N OS threads.
+- Concurrency is capped overall (``max_pages``) and per host (``per_site_limit``)
+  so one marketplace is never hit with the whole batch at once.
+- Pages go through the same lean routing, readiness and extraction steps as
+  ``core.services.browser`` and feed the same per-source render stats.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import time
+import urllib.parse
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Sequence
+
+from django.conf import settings
+
+from core.services.browser import (
+    DEFAULT_RENDER_OPTIONS,
+    DISMISS_SELECTORS,
+    LAUNCH_ARGS,
+    LEGACY_SETTLE_MS,
+    BrowserFetchResult,
+    FetchStats,
+    RenderOptions,
+    _count_transfer,
+    _extraction_enabled,
+    _finish_render,
+    _lean_enabled,
+    _should_abort,
+    prime_rendered,
+)
+
+
+@dataclass(frozen=True)
+class RenderRequest:
+    url: str
+    options: RenderOptions = DEFAULT_RENDER_OPTIONS
+    wait_until: str = "domcontentloaded"
+    timeout_ms: int = 30000
+
+
+class AsyncRenderEngine:
+    """Render many pages concurrently in one browser, with per-site caps."""
+
+    def __init__(self, *, max_pages=8, per_site_limit=3):
+        self.max_pages = max(1, max_pages)
+        self.per_site_limit = max(1, per_site_limit)
+        self._browser = None
+        self._browser_lock = None
+        self._playwright = None
+
+    async def render_many(self, requests: Sequence[RenderRequest]) -> List[Optional[BrowserFetchResult]]:
+        """Render every request and return results in the same order (None on failure)."""
+        from playwright.async_api import async_playwright
+
+        page_slots = asyncio.Semaphore(self.max_pages)
+        site_slots = {}
+        self._browser_lock = asyncio.Lock()
+
+        async with async_playwright() as playwright:
+            self._playwright = playwright
+            try:
+                return await asyncio.gather(*(
+                    self._render_one(request, page_slots, site_slots)
+                    for request in requests
+                ))
+            finally:
+                if self._browser is not None:
+                    try:
+                        await self._browser.close()
+                    except Exception:
+                        pass
+                    self._browser = None
+
+    async def _ensure_browser(self):
+        async with self._browser_lock:
+            if self._browser is None or not self._browser.is_connected():
+                self._browser = await self._playwright.chromium.launch(headless=True, args=LAUNCH_ARGS)
+            return self._browser
+
+    async def _render_one(self, request, page_slots, site_slots):
+        host = urllib.parse.urlsplit(request.url).hostname or ''
+        site_slot = site_slots.setdefault(host, asyncio.Semaphore(self.per_site_limit))
+        async with site_slot, page_slots:
+            try:
+                browser = await self._ensure_browser()
+                return await _render_page_async(browser, request)
+            except Exception as e:
+                print(f"Playwright fetch failed for {request.url}: {e}")
+                return None
+
+
+async def _render_page_async(browser, request):
+    from playwright_stealth import Stealth
+
+    options = request.options
+    started = time.monotonic()
+    stats = FetchStats()
+    context = await browser.new_context(
+        viewport={"width": 1280, "height": 720},
+        locale="en-US",
+    )
+    try:
+        page = await context.new_page()
+        lean = _lean_enabled(options)
+
+        async def handle_route(route):
+            if _should_abort(route.request, options, stats, lean):
+                await route.abort()
+            else:
+                await route.continue_()
+
+        async def count_finished(finished):
+            try:
+                sizes = await finished.sizes()
+            except Exception:
+                return
+            _count_transfer(finished.resource_type, sizes, stats)
+
+        await context.route("**/*", handle_route)
+        page.on("requestfinished", count_finished)
+        await Stealth().apply_stealth_async(page)
+
+        resp = await page.goto(request.url, wait_until=request.wait_until, timeout=request.timeout_ms)
+
+        try:
+            for selector in DISMISS_SELECTORS:
+                el = await page.query_selector(selector)
+                if el:
+                    await el.click(timeout=1000)
+                    break
+        except Exception:
+            pass
+
+        await _wait_until_ready_async(page, options, stats)
+
+        items = None
+        if _extraction_enabled(options):
+            try:
+                items = await page.evaluate(options.extract_script)
+            except Exception as e:
+                print(f"In-page extraction failed for {options.source or request.url}: {e}")
+            if not isinstance(items, list):
+                items = None
+        html = '' if items else await page.content()
+        final_url = page.url
+        status = resp.status if resp else None
+    finally:
+        await context.close()
+
+    return _finish_render(request.url, final_url, status, html, items, options=options, stats=stats, started=started)
+
+
+async def _wait_until_ready_async(page, options, stats):
+    started = time.monotonic()
+    try:
+        if options.has_ready_condition:
+            try:
+                await page.wait_for_function(options.ready_expression(), timeout=options.ready_timeout_ms)
+                stats.ready = True
+            except Exception:
+                stats.ready = False
+        else:
+            await page.wait_for_timeout(LEGACY_SETTLE_MS)
+    finally:
+        stats.ready_wait_ms = int((time.monotonic() - started) * 1000)
+
+
+def render_urls(requests: Sequence[RenderRequest], *, prime=True) -> Dict[str, Optional[BrowserFetchResult]]:
+    """
+    Render a batch of URLs on the async engine and return ``{url: result}``.
+
+    Blocks the calling thread; must not be called from inside a running event
+    loop. With ``prime`` the finished pages are handed to ``fetch_rendered_html``
+    so scrapers that fall back to rendering the same URLs reuse them.
+    """
+    if not requests:
+        return {}
+
+    try:
+        import playwright.async_api  # noqa: F401
+        import playwright_stealth  # noqa: F401
+    except Exception as e:
+        print(f"Playwright/Stealth not available: {e}")
+        return {}
+
+    engine = AsyncRenderEngine(
+        max_pages=getattr(settings, 'PLAYWRIGHT_BATCH_MAX_PAGES', 8),
+        per_site_limit=getattr(settings, 'PLAYWRIGHT_BATCH_PER_SITE', 3),
+    )
+    try:
+        results = asyncio.run(engine.render_many(requests))
+    except Exception as e:
+        print(f"Batch render failed: {e}")
+        return {}
+
+    rendered = {request.url: result for request, result in zip(requests, results)}
+    if prime:
+        prime_rendered(rendered)
+    return rendered
@@ -0,0 +1,113 @@
+"""
+Per-source circuit breaker for the tracker.
+
+Notes:
+- A source's circuit opens after ``CIRCUIT_FAILURE_THRESHOLD`` consecutive
+  blocked/error outcomes, 403/429/503 responses, or unavailable outcomes with
+  no response at all (tracker timeouts included). While open, the tracker
+  skips the source entirely, so no ``get_page`` retries or Playwright renders
+  are spent on a site that is serving captchas or hanging.
+- After ``CIRCUIT_COOLDOWN_SECONDS`` the circuit goes half-open and lets one
+  search through as a probe: success closes it, another failure re-opens it.
+- State lives in ``SourceCircuit`` rows, so it survives between
+  ``check_prices`` runs and is visible in the admin.
+"""
+
+from datetime import timedelta
+
+from django.conf import settings
+from django.utils import timezone
+
+from core.models import SourceCircuit, SourceStatus
+from core.services.scraper.base import ScrapeAttempt
+
+
+FAILURE_STATES = {SourceStatus.State.BLOCKED, SourceStatus.State.ERROR}
+FAILURE_HTTP_STATUSES = {403, 429, 503}
+
+
+def _enabled():
+    return getattr(settings, 'CIRCUIT_BREAKER_ENABLED', True)
+
+
+def is_failure(attempt):
+    if attempt.state in FAILURE_STATES or attempt.http_status in FAILURE_HTTP_STATUSES:
+        return True
+    # No status means nothing came back: the tracker gave up waiting or the site was unreachable.
+    return attempt.state == SourceStatus.State.UNAVAILABLE and attempt.http_status is None
+
+
+def _transition(circuit, state, now):
+    print(f"[CIRCUIT] {circuit.website}: {circuit.state} -> {state}")
+    circuit.state = state
+    circuit.last_transition_at = now
+    if state == SourceCircuit.State.OPEN:
+        circuit.opened_at = now
+        circuit.trip_count += 1
+
+
+def allow(website):
+    """Return True if ``website`` should be searched now, moving open circuits to half-open after the cooldown."""
+    if not _enabled():
+        return True
+
+    circuit = SourceCircuit.objects.filter(website=website).first()
+    if circuit is None or circuit.state != SourceCircuit.State.OPEN:
+        return True
+
+    now = timezone.now()
+    cooldown = timedelta(seconds=settings.CIRCUIT_COOLDOWN_SECONDS)
+    if circuit.opened_at and now - circuit.opened_at < cooldown:
+        return False
+
+    _transition(circuit, SourceCircuit.State.HALF_OPEN, now)
+    circuit.save()
+    return True
+
+
+def record(website, attempt):
+    """Feed a finished search into ``website``'s circuit."""
+    if not _enabled():
+        return None
+
+    now = timezone.now()
+    circuit, _created = SourceCircuit.objects.get_or_create(website=website)
+    circuit.last_outcome = attempt.state
+    circuit.last_http_status = attempt.http_status
+    circuit.last_diagnostic_message = attempt.diagnostic_message
+
+    if is_failure(attempt):
+        circuit.consecutive_failures += 1
+        if circuit.state == SourceCircuit.State.HALF_OPEN or (
+            circuit.state == SourceCircuit.State.CLOSED
+            and circuit.consecutive_failures >= settings.CIRCUIT_FAILURE_THRESHOLD
+        ):
+            _transition(circuit, SourceCircuit.State.OPEN, now)
+    else:
+        circuit.consecutive_failures = 0
+        if circuit.state != SourceCircuit.State.CLOSED:
+            _transition(circuit, SourceCircuit.State.CLOSED, now)
+
+    circuit.save()
+    return circuit
+
+
+def open_circuit_attempt(website):
+    """Fast-fail attempt reported for a source whose circuit is open."""
+    circuit = SourceCircuit.objects.filter(website=website).first()
+    last_outcome = circuit.last_outcome if circuit else ''
+    retry_at = ''
+    if circuit and circuit.opened_at:
+        retry_at = timezone.localtime(
+            circuit.opened_at + timedelta(seconds=settings.CIRCUIT_COOLDOWN_SECONDS)
+        ).strftime('%H:%M')
+
+    message = f'Skipped {website}: circuit open after {circuit.consecutive_failures if circuit else 0} consecutive failures'
+    if retry_at:
+        message += f'; next probe after {retry_at}'
+    return ScrapeAttempt(
+        website=website,
+        state=SourceStatus.State.BLOCKED if last_outcome == SourceStatus.State.BLOCKED else SourceStatus.State.UNAVAILABLE,
+        diagnostic_message=message + '.',
+        http_status=circuit.last_http_status if circuit else None,
+    )
@@ -0,0 +1,164 @@
+"""
+Learned choice between the plain HTTP path and the rendered (Playwright) path.
+
+Notes:
+- Every search records whether its HTTP response and/or its rendered page was
+  usable. Success rates are exponentially weighted per source, so a site that
+  starts serving captchas shifts within a handful of products.
+- ``http``: fetch over HTTP and render only when the response is unusable
+  (the original behaviour, and the default until enough samples exist).
+- ``render``: HTTP almost never works for this source, so skip it.
+- ``hedged``: both paths are unreliable; start both and take the first usable
+  result.
+- While a source is on ``render`` every ``FETCH_STRATEGY_PROBE_EVERY``-th search
+  is hedged instead, so the HTTP rate keeps being sampled and can recover.
+- State is per process; every decision is printed and kept in a short history
+  for auditing.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+from django.conf import settings
+
+
+HTTP = 'http'
+RENDER = 'render'
+HEDGED = 'hedged'
+
+DECAY = 0.3
+HTTP_GOOD_RATE = 0.5
+HTTP_DEAD_RATE = 0.15
+RENDER_GOOD_RATE = 0.5
+
+
+@dataclass
+class PathStats:
+    rate: float = 0.0
+    samples: int = 0
+
+    def record(self, usable):
+        value = 1.0 if usable else 0.0
+        self.rate = value if self.samples == 0 else (1 - DECAY) * self.rate + DECAY * value
+        self.samples += 1
+
+
+class FetchStrategy:
+    def __init__(self, *, min_samples=3, probe_every=10, history=200):
+        self.min_samples = max(1, min_samples)
+        self.probe_every = max(0, probe_every)
+        self._paths = {}
+        self._decisions = {}
+        self._history = deque(maxlen=history)
+        self._lock = threading.Lock()
+
+    def _stats_for(self, website):
+        return self._paths.setdefault(website, {HTTP: PathStats(), RENDER: PathStats()})
+
+    def _decide(self, http, render):
+        if http.samples < self.min_samples or http.rate >= HTTP_GOOD_RATE:
+            return HTTP
+        if render.samples >= self.min_samples and render.rate >= RENDER_GOOD_RATE and http.rate < HTTP_DEAD_RATE:
+            return RENDER
+        return HEDGED
+
+    def learned(self, website):
+        """
+        Path the rates currently favour for ``website``, or None until HTTP has
+        ``min_samples`` samples. Unlike ``choose`` this neither logs nor counts
+        as a decision.
+        """
+        with self._lock:
+            paths = self._paths.get(website)
+            if paths is None or paths[HTTP].samples < self.min_samples:
+                return None
+            return self._decide(paths[HTTP], paths[RENDER])
+
+    def choose(self, website):
+        """Pick the fetch path for ``website``'s next search and log why."""
+        with self._lock:
+            paths = self._stats_for(website)
+            http, render = paths[HTTP], paths[RENDER]
+            count = self._decisions.get(website, 0) + 1
+            self._decisions[website] = count
+
+            strategy = self._decide(http, render)
+            if strategy == RENDER and self.probe_every and count % self.probe_every == 0:
+                strategy = HEDGED
+
+            entry = {
+                'website': website,
+                'strategy': strategy,
+                'http_rate': round(http.rate, 2),
+                'http_samples': http.samples,
+                'render_rate': round(render.rate, 2),
+                'render_samples': render.samples,
+            }
+            self._history.append(entry)
+
+        print(
+            f"[fetch] {website}: {strategy} "
+            f"(http {entry['http_rate']:.2f}/{entry['http_samples']}, "
+            f"render {entry['render_rate']:.2f}/{entry['render_samples']})"
+        )
+        return strategy
+
+    def record(self, website, path, usable):
+        with self._lock:
+            self._stats_for(website)[path].record(usable)
+
+    def stats(self):
+        with self._lock:
+            return {
+                website: {
+                    'http_rate': paths[HTTP].rate,
+                    'http_samples': paths[HTTP].samples,
+                    'render_rate': paths[RENDER].rate,
+                    'render_samples': paths[RENDER].samples,
+                    'decisions': self._decisions.get(website, 0),
+                }
+                for website, paths in self._paths.items()
+            }
+
+    def history(self):
+        with self._lock:
+            return list(self._history)
+
+
+_strategy = None
+_strategy_lock = threading.Lock()
+
+
+def get_fetch_strategy():
+    """Return the process-wide strategy configured from settings."""
+    global _strategy
+    with _strategy_lock:
+        if _strategy is None:
+            _strategy = FetchStrategy(
+                min_samples=getattr(settings, 'FETCH_STRATEGY_MIN_SAMPLES', 3),
+                probe_every=getattr(settings, 'FETCH_STRATEGY_PROBE_EVERY', 10),
+            )
+        return _strategy
+
+
+_hedge_executor = None
+
+
+def get_hedge_executor():
+    """Worker pool that runs the two halves of a hedged fetch."""
+    global _hedge_executor
+    with _strategy_lock:
+        if _hedge_executor is None:
+            _hedge_executor = ThreadPoolExecutor(
+                max_workers=max(2, getattr(settings, 'FETCH_STRATEGY_HEDGE_WORKERS', 10)),
+                thread_name_prefix='hedged-fetch',
+            )
+        return _hedge_executor
+
+
+def reset_fetch_strategy():
+    global _strategy
+    with _strategy_lock:
+        _strategy = None
@@ -0,0 +1,131 @@
+"""
+Process-wide pooled HTTP sessions shared by every scraper instance.
+
+Notes:
+- One ``requests.Session`` per host, so keep-alive connections and TLS sessions
+  survive across products in a ``check_prices`` run and cookies stay per site.
+- urllib3 connection pools are thread-safe; session creation is guarded so the
+  concurrent tracker threads never race to build the same session.
+- Adapter-level retries cover connection failures only. Status-code retries
+  (429/502/503) stay in ``BaseScraper.get_page``.
+- Streamed fetches that stop early report how much of each page was skipped
+  through ``record_stream``/``stream_stats``.
+"""
+
+import threading
+import urllib.parse
+
+import requests
+from django.conf import settings
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+
+DEFAULT_HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
+    'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
+    'Accept-Language': 'en-US,en;q=0.5',
+    'Accept-Encoding': 'gzip, deflate, br',
+    'Connection': 'keep-alive',
+    'Upgrade-Insecure-Requests': '1',
+    'Sec-Fetch-Dest': 'document',
+    'Sec-Fetch-Mode': 'navigate',
+    'Sec-Fetch-Site': 'none',
+    'Cache-Control': 'max-age=0'
+}
+
+
+_sessions = {}
+_sessions_lock = threading.Lock()
+_stream_stats = {}
+_stream_stats_lock = threading.Lock()
+
+
+def _build_session():
+    retries = Retry(
+        total=getattr(settings, 'HTTP_CONNECT_RETRIES', 2),
+        connect=getattr(settings, 'HTTP_CONNECT_RETRIES', 2),
+        read=0,
+        status=0,
+        backoff_factor=getattr(settings, 'HTTP_RETRY_BACKOFF', 0.5),
+        allowed_methods=frozenset({'GET', 'HEAD'}),
+    )
+    adapter = HTTPAdapter(
+        pool_connections=getattr(settings, 'HTTP_POOL_CONNECTIONS', 10),
+        pool_maxsize=getattr(settings, 'HTTP_POOL_MAXSIZE', 10),
+        max_retries=retries,
+    )
+    session = requests.Session()
+    session.headers.update(DEFAULT_HEADERS)
+    session.mount('https://', adapter)
+    session.mount('http://', adapter)
+    return session
+
+
+def get_session(url):
+    """Return the shared session for ``url``'s host, creating it on first use."""
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    with _sessions_lock:
+        session = _sessions.get(host)
+        if session is None:
+            session = _sessions[host] = _build_session()
+        return session
+
+
+def session_stats():
+    """
+    Connection reuse per host: requests sent, connections opened, and how many
+    requests rode on an already-open connection.
+    """
+    with _sessions_lock:
+        sessions = dict(_sessions)
+
+    stats = {}
+    for host, session in sessions.items():
+        adapter = session.get_adapter('https://')
+        opened = sent = 0
+        for key in list(adapter.poolmanager.pools.keys()):
+            pool = adapter.poolmanager.pools.get(key)
+            if pool is None:
+                continue
+            opened += pool.num_connections
+            sent += pool.num_requests
+        stats[host] = {
+            'requests': sent,
+            'connections_opened': opened,
+            'connections_reused': max(0, sent - opened),
+        }
+    return stats
+
+
+def close_sessions():
+    with _sessions_lock:
+        sessions = list(_sessions.values())
+        _sessions.clear()
+    for session in sessions:
+        session.close()
+
+
+def record_stream(source, *, bytes_read, bytes_saved=None, cut_short=False):
+    """Record one streamed fetch; ``bytes_saved`` is None when the full size was unknown."""
+    with _stream_stats_lock:
+        stats = _stream_stats.setdefault(source, {
+            'fetches': 0,
+            'cut_short': 0,
+            'bytes_read': 0,
+            'bytes_saved': 0,
+            'unknown_size': 0,
+        })
+        stats['fetches'] += 1
+        stats['cut_short'] += 1 if cut_short else 0
+        stats['bytes_read'] += bytes_read
+        if bytes_saved is None:
+            stats['unknown_size'] += 1 if cut_short else 0
+        else:
+            stats['bytes_saved'] += bytes_saved
+
+
+def stream_stats():
+    """Per source: streamed fetches, how many stopped early, and bytes read vs. skipped on the wire."""
+    with _stream_stats_lock:
+        return {source: dict(stats) for source, stats in _stream_stats.items()}
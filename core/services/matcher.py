@@ -1,8 +1,20 @@
-import difflib
 import re
+import threading
+from collections import OrderedDict
 from dataclasses import dataclass, field
+from functools import lru_cache
 from typing import Iterable, List, Optional, Sequence
 
+from django.conf import settings
+
+from core.services.phrases import PhraseAutomaton
+from core.services.similarity import get_kernel, ratio_at_least
+
+try:
+    import numpy
+except ImportError:  # optional; the batch matcher computes its features in plain Python without it
+    numpy = None
+
 
 ACCESSORY_KEYWORDS = {
     'accessory',
@@ -145,6 +157,97 @@ TECHNICAL_VARIANT_PATTERN = re.compile(
 
 TOKEN_PATTERN = re.compile(r'[a-z0-9]+(?:\.[a-z0-9]+)?')
 
+# Normalisation is one translate(), one regex pass and one split/join. The
+# regex only deletes whitespace, covering the old chained substitutions: between
+# a number and its unit, and after "gen" before a number (unless that number is
+# a quantity the unit join claims first).
+NORMALIZE_TRANSLATION = str.maketrans({
+    '&': ' and ',
+    '+': ' plus ',
+    '/': ' ',
+    '-': ' ',
+    '(': ' ',
+    ')': ' ',
+    ',': ' ',
+    '"': ' inch ',
+    "'": ' ',
+})
+
+UNITS = 'gb|tb|inch|in|cm|mm|mah|hz'
+NORMALIZE_PATTERN = re.compile(
+    rf'(\d+(?:\.\d+)?)\s*(?=(?:{UNITS})\b)'
+    rf'|(gen)\s+(?=\d+\b(?!\s*(?:{UNITS})\b))'
+)
+
+STOPWORD = 1
+ACCESSORY = 2
+REFURBISHED = 4
+SOFT_VARIANT = 8
+MAJOR_VARIANT = 16
+CATEGORY_ALIAS = 32
+NON_FAMILY = STOPWORD | ACCESSORY | REFURBISHED | SOFT_VARIANT
+
+
+def _plural_forms(word):
+    forms = {word, word + 's', word + 'es'}
+    if word.endswith('y'):
+        forms.add(word[:-1] + 'ies')
+    return sorted(forms)
+
+
+def _compile_phrase_tables():
+    """
+    Split the category aliases into single words (looked up per token) and
+    phrases. The phrases and ``ACCESSORY_PHRASES`` are compiled into one
+    automaton, with plural forms of each phrase's last word added so "smart
+    tvs" and "back covers" still match. Payloads are ``(flag, category,
+    alias_tokens)``.
+    """
+    single_word = {}
+    phrases = []
+    for category, aliases in CATEGORY_ALIASES.items():
+        for alias in sorted(aliases):
+            words = alias.split()
+            if len(words) > 1:
+                phrases.append((words, (CATEGORY_ALIAS, category, tuple(words))))
+            else:
+                single_word.setdefault(alias, set()).add(category)
+    for phrase in sorted(ACCESSORY_PHRASES):
+        phrases.append((phrase.split(), (ACCESSORY, None, ())))
+
+    automaton = PhraseAutomaton(
+        ([*words[:-1], last], payload)
+        for words, payload in phrases
+        for last in _plural_forms(words[-1])
+    )
+    return single_word, automaton
+
+
+SINGLE_WORD_CATEGORY_ALIASES, PHRASE_AUTOMATON = _compile_phrase_tables()
+
+
+def _token_flags():
+    """Map each keyword to the OR of the flags of every keyword set it is in."""
+    table = {}
+    for words, flag in (
+        (STOPWORDS, STOPWORD),
+        (ACCESSORY_KEYWORDS, ACCESSORY),
+        (REFURBISHED_KEYWORDS, REFURBISHED),
+        (SOFT_VARIANT_KEYWORDS, SOFT_VARIANT),
+        (MAJOR_VARIANT_KEYWORDS, MAJOR_VARIANT),
+        (SINGLE_WORD_CATEGORY_ALIASES, CATEGORY_ALIAS),
+    ):
+        for word in words:
+            table[word] = table.get(word, 0) | flag
+    return table
+
+
+TOKEN_FLAGS = _token_flags()
+
+FUZZY_TOKEN_MIN_LENGTH = 5
+FUZZY_TOKEN_MAX_LENGTH_GAP = 2
+FUZZY_TOKEN_THRESHOLD = 0.84
+
 
 @dataclass
 class QueryProfile:
@@ -163,20 +266,56 @@ class QueryProfile:
     refurbished_requested: bool
 
 
-@dataclass
+class TokenIndex:
+    """
+    Candidate tokens arranged for ``_title_features``: a set of canonical
+    forms for the exact/plural check, plus the canonical forms long enough
+    for fuzzy matching bucketed by length. A query token is then compared
+    only with tokens at most ``FUZZY_TOKEN_MAX_LENGTH_GAP`` characters longer
+    or shorter, the only pairs the fuzzy rule ever considers.
+    """
+
+    __slots__ = ('canonical', 'by_length')
+
+    def __init__(self, tokens: Iterable[str]):
+        self.canonical = frozenset(_canonicalize_token(token) for token in tokens)
+        by_length = {}
+        for token in sorted(self.canonical):
+            if len(token) >= FUZZY_TOKEN_MIN_LENGTH:
+                by_length.setdefault(len(token), []).append(token)
+        self.by_length = {length: tuple(bucket) for length, bucket in by_length.items()}
+
+    def matches(self, query_token: str) -> bool:
+        canonical = _canonicalize_token(query_token)
+        if canonical in self.canonical:
+            return True
+
+        length = len(canonical)
+        if length < FUZZY_TOKEN_MIN_LENGTH:
+            return False
+
+        for bucket_length in range(length - FUZZY_TOKEN_MAX_LENGTH_GAP, length + FUZZY_TOKEN_MAX_LENGTH_GAP + 1):
+            for candidate in self.by_length.get(bucket_length, ()):
+                if _fuzzy_tokens_match(canonical, candidate):
+                    return True
+        return False
+
+
+@dataclass(frozen=True, slots=True)
 class CandidateProfile:
     title: str
     normalized_title: str
-    tokens: set[str]
-    family_tokens: set[str]
-    required_text_tokens: set[str]
-    major_variant_tokens: set[str]
-    technical_variant_tokens: set[str]
-    hard_variant_tokens: set[str]
-    soft_variant_tokens: set[str]
-    categories: set[str]
+    tokens: frozenset[str]
+    family_tokens: frozenset[str]
+    required_text_tokens: frozenset[str]
+    major_variant_tokens: frozenset[str]
+    technical_variant_tokens: frozenset[str]
+    hard_variant_tokens: frozenset[str]
+    soft_variant_tokens: frozenset[str]
+    categories: frozenset[str]
     has_accessory_keywords: bool
     has_refurbished_keywords: bool
+    token_index: TokenIndex = field(compare=False, repr=False)
 
 
 @dataclass
@@ -200,81 +339,49 @@ class MatchDecision:
 
 
 def _normalize_text(text: str) -> str:
-    text = (text or '').lower()
-    text = text.replace('&', ' and ')
-    text = text.replace('+', ' plus ')
-    text = text.replace('/', ' ')
-    text = text.replace('-', ' ')
-    text = text.replace('(', ' ')
-    text = text.replace(')', ' ')
-    text = text.replace(',', ' ')
-    text = text.replace('"', ' inch ')
-    text = text.replace("'", ' ')
-    text = re.sub(r'(\d+(?:\.\d+)?)\s*(gb|tb|inch|in|cm|mm|mah|hz)\b', r'\1\2', text)
-    text = re.sub(r'gen\s+(\d+)\b', r'gen\1', text)
-    text = re.sub(r'\s+', ' ', text)
-    return text.strip()
-
-
-def _contains_phrase(text: str, phrases: Iterable[str]) -> bool:
-    return any(phrase in text for phrase in phrases)
-
-
-def _tokenize(text: str) -> set[str]:
-    normalized = _normalize_text(text)
-    return {token for token in TOKEN_PATTERN.findall(normalized) if len(token) > 1}
+    text = (text or '').lower().translate(NORMALIZE_TRANSLATION)
+    return ' '.join(NORMALIZE_PATTERN.sub(r'\1\2', text).split())
 
 
-def _extract_technical_variants(text: str) -> set[str]:
+def _build_profile(text: str, *, raw_query: Optional[str] = None) -> QueryProfile | CandidateProfile:
     normalized = _normalize_text(text)
-    return {match.group(0) for match in TECHNICAL_VARIANT_PATTERN.finditer(normalized)}
-
-
-def _extract_major_variants(tokens: Iterable[str]) -> set[str]:
-    return {token for token in tokens if token in MAJOR_VARIANT_KEYWORDS}
+    words = TOKEN_PATTERN.findall(normalized)
+    tokens = {token for token in words if len(token) > 1}
+    technical_variant_tokens = set(TECHNICAL_VARIANT_PATTERN.findall(normalized))
 
-
-def _extract_soft_variants(tokens: Iterable[str]) -> set[str]:
-    return {token for token in tokens if token in SOFT_VARIANT_KEYWORDS}
-
-
-def _extract_categories(normalized: str, tokens: Iterable[str]) -> tuple[set[str], set[str]]:
-    token_set = set(tokens)
+    major_variant_tokens = set()
+    soft_variant_tokens = set()
+    family_tokens = set()
     categories = set()
     category_tokens = set()
+    seen_flags = 0
+    for token in tokens:
+        flags = TOKEN_FLAGS.get(token, 0)
+        if not flags:
+            family_tokens.add(token)
+            continue
+        seen_flags |= flags
+        if flags & MAJOR_VARIANT:
+            major_variant_tokens.add(token)
+        if flags & SOFT_VARIANT:
+            soft_variant_tokens.add(token)
+        if not flags & NON_FAMILY:
+            family_tokens.add(token)
+        if flags & CATEGORY_ALIAS:
+            categories.update(SINGLE_WORD_CATEGORY_ALIASES[token])
+            category_tokens.add(token)
+
+    for flag, category, alias_tokens in PHRASE_AUTOMATON.search(words):
+        seen_flags |= flag
+        if category is not None:
+            categories.add(category)
+            category_tokens.update(alias_tokens)
 
-    for category, aliases in CATEGORY_ALIASES.items():
-        for alias in aliases:
-            if ' ' in alias:
-                if alias in normalized:
-                    categories.add(category)
-                    category_tokens.update(alias.split())
-            elif alias in token_set:
-                categories.add(category)
-                category_tokens.add(alias)
-
-    return categories, category_tokens
-
-
-def _build_profile(text: str, *, raw_query: Optional[str] = None) -> QueryProfile | CandidateProfile:
-    normalized = _normalize_text(text)
-    tokens = _tokenize(text)
-    technical_variant_tokens = _extract_technical_variants(text)
-    major_variant_tokens = _extract_major_variants(tokens)
-    soft_variant_tokens = _extract_soft_variants(tokens)
-    categories, category_tokens = _extract_categories(normalized, tokens)
-    family_tokens = {
-        token for token in tokens
-        if token not in STOPWORDS
-        and token not in ACCESSORY_KEYWORDS
-        and token not in REFURBISHED_KEYWORDS
-        and token not in SOFT_VARIANT_KEYWORDS
-    }
     core_tokens = family_tokens - technical_variant_tokens
     required_text_tokens = core_tokens - category_tokens
     hard_variant_tokens = technical_variant_tokens | major_variant_tokens
-    accessory_requested = _contains_phrase(normalized, ACCESSORY_PHRASES) or bool(tokens & ACCESSORY_KEYWORDS)
-    refurbished_requested = bool(tokens & REFURBISHED_KEYWORDS)
+    accessory_requested = bool(seen_flags & ACCESSORY)
+    refurbished_requested = bool(seen_flags & REFURBISHED)
 
     if raw_query is not None:
         return QueryProfile(
@@ -296,16 +403,17 @@ def _build_profile(text: str, *, raw_query: Optional[str] = None) -> QueryProfil
     return CandidateProfile(
         title=text,
         normalized_title=normalized,
-        tokens=tokens,
-        family_tokens=family_tokens,
-        required_text_tokens=required_text_tokens,
-        major_variant_tokens=major_variant_tokens,
-        technical_variant_tokens=technical_variant_tokens,
-        hard_variant_tokens=hard_variant_tokens,
-        soft_variant_tokens=soft_variant_tokens,
-        categories=categories,
-        has_accessory_keywords=_contains_phrase(normalized, ACCESSORY_PHRASES) or bool(tokens & ACCESSORY_KEYWORDS),
-        has_refurbished_keywords=bool(tokens & REFURBISHED_KEYWORDS),
+        tokens=frozenset(tokens),
+        family_tokens=frozenset(family_tokens),
+        required_text_tokens=frozenset(required_text_tokens),
+        major_variant_tokens=frozenset(major_variant_tokens),
+        technical_variant_tokens=frozenset(technical_variant_tokens),
+        hard_variant_tokens=frozenset(hard_variant_tokens),
+        soft_variant_tokens=frozenset(soft_variant_tokens),
+        categories=frozenset(categories),
+        has_accessory_keywords=accessory_requested,
+        has_refurbished_keywords=refurbished_requested,
+        token_index=TokenIndex(tokens),
     )
 
 
@@ -313,8 +421,92 @@ def build_query_profile(query: str) -> QueryProfile:
     return _build_profile(query, raw_query=query)
 
 
+class ProfileCache:
+    """
+    Bounded LRU of candidate profiles keyed by listing title.
+
+    Profiles are frozen, so one instance can be shared by every evaluation and
+    thread. Building happens outside the lock; two threads missing on the same
+    title at once both build it and the second result wins.
+    """
+
+    def __init__(self, maxsize):
+        self.maxsize = max(0, maxsize)
+        self._profiles = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def get(self, title: str) -> CandidateProfile:
+        title = title or ''
+        with self._lock:
+            profile = self._profiles.get(title)
+            if profile is not None:
+                self._profiles.move_to_end(title)
+                self._hits += 1
+                return profile
+            self._misses += 1
+
+        profile = _build_profile(title)
+        self._store(title, profile)
+        return profile
+
+    def warm(self, titles: Iterable[str]) -> int:
+        """Build profiles for ``titles`` ahead of time without touching the hit/miss counters."""
+        added = 0
+        for title in titles:
+            if not title:
+                continue
+            with self._lock:
+                if title in self._profiles or len(self._profiles) >= self.maxsize:
+                    continue
+            self._store(title, _build_profile(title))
+            added += 1
+        return added
+
+    def _store(self, title, profile):
+        if not self.maxsize:
+            return
+        with self._lock:
+            self._profiles[title] = profile
+            self._profiles.move_to_end(title)
+            while len(self._profiles) > self.maxsize:
+                self._profiles.popitem(last=False)
+
+    def stats(self):
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                'size': len(self._profiles),
+                'maxsize': self.maxsize,
+                'hits': self._hits,
+                'misses': self._misses,
+                'hit_rate': self._hits / lookups if lookups else 0.0,
+            }
+
+    def clear(self):
+        with self._lock:
+            self._profiles.clear()
+            self._hits = 0
+            self._misses = 0
+
+
+_profile_cache = None
+_profile_cache_lock = threading.Lock()
+
+
+def get_profile_cache() -> ProfileCache:
+    """Return the process-wide profile cache sized by ``MATCHER_PROFILE_CACHE_SIZE``."""
+    global _profile_cache
+    maxsize = getattr(settings, 'MATCHER_PROFILE_CACHE_SIZE', 20000)
+    with _profile_cache_lock:
+        if _profile_cache is None or _profile_cache.maxsize != max(0, maxsize):
+            _profile_cache = ProfileCache(maxsize)
+        return _profile_cache
+
+
 def build_candidate_profile(title: str) -> CandidateProfile:
-    return _build_profile(title)
+    return get_profile_cache().get(title)
 
 
 def calculate_match_score(query, title):
@@ -324,19 +516,25 @@ def calculate_match_score(query, title):
     if not query or not title:
         return 0.0
 
-    query = _normalize_text(query)
-    title = _normalize_text(title)
+    return _normalized_match_score(_normalize_text(query), _normalize_text(title), _similarity_kernel())
 
+
+def _similarity_kernel():
+    """The string similarity behind the tiebreak score, chosen by ``MATCHER_SIMILARITY_KERNEL``."""
+    return get_kernel(getattr(settings, 'MATCHER_SIMILARITY_KERNEL', 'ratcliff'))
+
+
+def _normalized_match_score(query: str, title: str, kernel) -> float:
     if query in title:
         return 1.0
 
     query_tokens = [t for t in query.split() if len(t) > 1]
     if not query_tokens:
-        return difflib.SequenceMatcher(None, query, title).ratio()
+        return kernel(query, title)
 
     matches = sum(1 for token in query_tokens if token in title)
     token_score = matches / len(query_tokens)
-    seq_score = difflib.SequenceMatcher(None, query, title).ratio()
+    seq_score = kernel(query, title)
     return (token_score * 0.7) + (seq_score * 0.3)
 
 
@@ -345,8 +543,7 @@ def _variant_signature(profile: CandidateProfile) -> tuple[str, ...]:
     return tuple(signature) if signature else ('base',)
 
 
-def _confidence_for(query: QueryProfile, candidate_title: str, *, exact: bool, is_sponsored: bool, rank: int) -> float:
-    fuzzy = calculate_match_score(query.raw_query, candidate_title)
+def _confidence_value(query: QueryProfile, fuzzy: float, *, exact: bool, is_sponsored: bool, rank: int) -> float:
     base = 0.82 if exact else 0.58
     base += max(0.0, 0.1 - min(rank, 10) * 0.01)
     if query.hard_variant_tokens:
@@ -365,33 +562,9 @@ def _canonicalize_token(token: str) -> str:
     return token
 
 
-def _tokens_match(query_token: str, candidate_token: str) -> bool:
-    if query_token == candidate_token:
-        return True
-
-    canonical_query = _canonicalize_token(query_token)
-    canonical_candidate = _canonicalize_token(candidate_token)
-    if canonical_query == canonical_candidate:
-        return True
-
-    if len(canonical_query) < 5 or len(canonical_candidate) < 5:
-        return False
-
-    if abs(len(canonical_query) - len(canonical_candidate)) > 2:
-        return False
-
-    return difflib.SequenceMatcher(None, canonical_query, canonical_candidate).ratio() >= 0.84
-
-
-def _covers_query_core(query: QueryProfile, profile: CandidateProfile) -> bool:
-    for required_token in query.required_text_tokens:
-        if not any(_tokens_match(required_token, candidate_token) for candidate_token in profile.tokens):
-            return False
-
-    if query.categories and not query.categories.issubset(profile.categories):
-        return False
-
-    return True
+@lru_cache(maxsize=65536)
+def _fuzzy_tokens_match(canonical_query: str, canonical_candidate: str) -> bool:
+    return ratio_at_least(canonical_query, canonical_candidate, FUZZY_TOKEN_THRESHOLD)
 
 
 def _is_broad_query(query: QueryProfile) -> bool:
@@ -406,51 +579,11 @@ def _is_broad_query(query: QueryProfile) -> bool:
 
 
 def evaluate_candidate(query: QueryProfile, candidate) -> Optional[CandidateAssessment]:
-    profile = build_candidate_profile(candidate.title)
-
-    if profile.has_accessory_keywords and not query.accessory_requested:
-        return None
-
-    if profile.has_refurbished_keywords and not query.refurbished_requested:
-        return None
-
-    if not _covers_query_core(query, profile):
+    """Assess a single candidate; None when it is rejected or does not cover the query."""
+    item = _title_features(query, [candidate.title]).get(candidate.title)
+    if item is None:
         return None
-
-    missing_hard_tokens = query.hard_variant_tokens - profile.hard_variant_tokens
-    unexpected_major_variants = profile.major_variant_tokens - query.major_variant_tokens
-    signature = _variant_signature(profile)
-
-    if missing_hard_tokens or unexpected_major_variants:
-        return CandidateAssessment(
-            candidate=candidate,
-            profile=profile,
-            kind='family',
-            confidence=_confidence_for(
-                query,
-                candidate.title,
-                exact=False,
-                is_sponsored=getattr(candidate, 'is_sponsored', False),
-                rank=getattr(candidate, 'rank', 0),
-            ),
-            reason='Family match found, but the exact variant is unclear.',
-            signature=signature,
-        )
-
-    return CandidateAssessment(
-        candidate=candidate,
-        profile=profile,
-        kind='exact',
-        confidence=_confidence_for(
-            query,
-            candidate.title,
-            exact=True,
-            is_sponsored=getattr(candidate, 'is_sponsored', False),
-            rank=getattr(candidate, 'rank', 0),
-        ),
-        reason='Exact variant matched.',
-        signature=signature,
-    )
+    return _assessments(query, [(candidate, item)])[0]
 
 
 def choose_best_candidate(candidates: Sequence[CandidateAssessment]) -> CandidateAssessment:
@@ -465,26 +598,162 @@ def choose_best_candidate(candidates: Sequence[CandidateAssessment]) -> Candidat
     )[0]
 
 
-def evaluate_scrape_candidates(query: str, candidates: Sequence[object]) -> MatchDecision:
-    if not candidates:
-        return MatchDecision(
-            state='not_found',
-            diagnostic_message='The source returned no product candidates.',
-            candidate_count=0,
+def _confidences(query: QueryProfile, exact, ranks, sponsored, fuzzy) -> list[float]:
+    """
+    Confidences for many candidates at once. With NumPy the arithmetic of
+    ``_confidence_value`` runs as array operations in the same order on float64
+    values, and the final rounding uses Python's ``round``, so the results are
+    bit-identical to the per-candidate version.
+    """
+    if numpy is not None and exact:
+        base = numpy.where(numpy.array(exact, dtype=bool), 0.82, 0.58)
+        base = base + numpy.maximum(0.0, 0.1 - numpy.minimum(numpy.array(ranks), 10) * 0.01)
+        if query.hard_variant_tokens:
+            base = base + 0.04
+        base = base - numpy.where(numpy.array(sponsored, dtype=bool), 0.08, 0.0)
+        values = numpy.maximum(0.0, numpy.minimum(0.99, base + numpy.array(fuzzy) * 0.08))
+        return [round(float(value), 3) for value in values]
+
+    return [
+        _confidence_value(query, score, exact=is_exact, is_sponsored=is_sponsored, rank=rank)
+        for is_exact, rank, is_sponsored, score in zip(exact, ranks, sponsored, fuzzy)
+    ]
+
+
+class _TitleFeatures:
+    """Everything about one distinct title that does not depend on where it was listed."""
+
+    __slots__ = ('profile', 'kind', 'signature', 'fuzzy')
+
+    def __init__(self, profile, kind, signature, fuzzy):
+        self.profile = profile
+        self.kind = kind
+        self.signature = signature
+        self.fuzzy = fuzzy
+
+
+def _title_features(query: QueryProfile, titles: Sequence[str]) -> dict:
+    """
+    Classify every distinct title once. Titles rejected as accessories or
+    refurbished are dropped first. For the rest, a title x required-token
+    membership matrix decides coverage. Surviving titles get their kind,
+    variant signature and fuzzy tiebreak score.
+    """
+    profiles = {}
+    for title in titles:
+        if title in profiles:
+            continue
+        profile = build_candidate_profile(title)
+        if profile.has_accessory_keywords and not query.accessory_requested:
+            continue
+        if profile.has_refurbished_keywords and not query.refurbished_requested:
+            continue
+        profiles[title] = profile
+
+    required = sorted(query.required_text_tokens)
+    eligible = list(profiles)
+    membership = [[profiles[title].token_index.matches(token) for token in required] for title in eligible]
+    if numpy is not None and eligible and required:
+        covered = numpy.array(membership, dtype=bool).all(axis=1).tolist()
+    else:
+        covered = [all(row) for row in membership]
+
+    normalized_query = _normalize_text(query.raw_query)
+    kernel = _similarity_kernel()
+    features = {}
+    for title, covers in zip(eligible, covered):
+        profile = profiles[title]
+        if not covers or (query.categories and not query.categories.issubset(profile.categories)):
+            continue
+        exact = not (
+            query.hard_variant_tokens - profile.hard_variant_tokens
+            or profile.major_variant_tokens - query.major_variant_tokens
+        )
+        fuzzy = _normalized_match_score(normalized_query, profile.normalized_title, kernel) if query.raw_query and title else 0.0
+        features[title] = _TitleFeatures(profile, 'exact' if exact else 'family', _variant_signature(profile), fuzzy)
+    return features
+
+
+def _assessments(query: QueryProfile, rows) -> list[CandidateAssessment]:
+    """Turn ``(candidate, _TitleFeatures)`` rows into assessments, scoring them together."""
+    confidences = _confidences(
+        query,
+        [item.kind == 'exact' for _candidate, item in rows],
+        [getattr(candidate, 'rank', 0) for candidate, _item in rows],
+        [getattr(candidate, 'is_sponsored', False) for candidate, _item in rows],
+        [item.fuzzy for _candidate, item in rows],
+    )
+    return [
+        CandidateAssessment(
+            candidate=candidate,
+            profile=item.profile,
+            kind=item.kind,
+            confidence=confidence,
+            reason='Exact variant matched.' if item.kind == 'exact' else 'Family match found, but the exact variant is unclear.',
+            signature=item.signature,
         )
+        for (candidate, item), confidence in zip(rows, confidences)
+    ]
+
+
+def evaluate_candidate_batches(query: str, candidates_by_source: dict) -> dict:
+    """
+    Match the candidates of several sources in one pass.
+
+    ``candidates_by_source`` maps a source name to its candidates. The result
+    maps each source to the ``MatchDecision`` that ``evaluate_scrape_candidates``
+    would give it. The query profile is built once, each distinct title is
+    classified once however many sources list it, and confidences are computed
+    for all accepted candidates together.
+    """
+    decisions = {}
+    pending = {}
+    for source, candidates in candidates_by_source.items():
+        if not candidates:
+            decisions[source] = MatchDecision(
+                state='not_found',
+                diagnostic_message='The source returned no product candidates.',
+                candidate_count=0,
+            )
+        else:
+            pending[source] = candidates
+
+    if not pending:
+        return decisions
 
     query_profile = build_query_profile(query)
-    assessments: List[CandidateAssessment] = []
-    for candidate in candidates:
-        assessment = evaluate_candidate(query_profile, candidate)
-        if assessment:
-            assessments.append(assessment)
+    features = _title_features(
+        query_profile,
+        [candidate.title for candidates in pending.values() for candidate in candidates],
+    )
+
+    sources = []
+    rows = []
+    for source, candidates in pending.items():
+        for candidate in candidates:
+            if candidate.title in features:
+                sources.append(source)
+                rows.append((candidate, features[candidate.title]))
+
+    assessments = {source: [] for source in pending}
+    for source, assessment in zip(sources, _assessments(query_profile, rows)):
+        assessments[source].append(assessment)
+
+    for source, candidates in pending.items():
+        decisions[source] = _decide(query_profile, assessments[source], len(candidates))
+    return {source: decisions[source] for source in candidates_by_source}
+
+
+def evaluate_scrape_candidates(query: str, candidates: Sequence[object]) -> MatchDecision:
+    return evaluate_candidate_batches(query, {None: candidates})[None]
+
 
+def _decide(query_profile: QueryProfile, assessments: List[CandidateAssessment], candidate_count: int) -> MatchDecision:
     if not assessments:
         return MatchDecision(
             state='not_found',
             diagnostic_message='No candidate covered all required model tokens.',
-            candidate_count=len(candidates),
+            candidate_count=candidate_count,
         )
 
     exact_matches = [item for item in assessments if item.kind == 'exact']
@@ -499,7 +768,7 @@ def evaluate_scrape_candidates(query: str, candidates: Sequence[object]) -> Matc
                 diagnostic_message='Multiple plausible variants were found for this source.',
                 matched_title=best_family.candidate.title,
                 confidence=best_family.confidence,
-                candidate_count=len(candidates),
+                candidate_count=candidate_count,
             )
 
         best = choose_best_candidate(exact_matches)
@@ -513,7 +782,7 @@ def evaluate_scrape_candidates(query: str, candidates: Sequence[object]) -> Matc
                 else best.reason
             ),
             matched_title=best.candidate.title,
-            candidate_count=len(candidates),
+            candidate_count=candidate_count,
         )
 
     if family_matches:
@@ -523,11 +792,11 @@ def evaluate_scrape_candidates(query: str, candidates: Sequence[object]) -> Matc
             diagnostic_message='Matching family results were found, but the exact variant was unclear.',
             matched_title=best_family.candidate.title,
             confidence=best_family.confidence,
-            candidate_count=len(candidates),
+            candidate_count=candidate_count,
         )
 
     return MatchDecision(
         state='not_found',
         diagnostic_message='No confident candidate could be accepted for this source.',
-        candidate_count=len(candidates),
+        candidate_count=candidate_count,
     )
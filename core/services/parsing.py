@@ -0,0 +1,141 @@
+"""
+Process pool for CPU-bound search-result parsing.
+
+Notes:
+- Parsing is pure Python and holds the GIL, so with several sources finishing
+  at once the tracker threads queue up behind each other. Submitting the HTML to
+  a worker process lets one source parse while the others keep fetching.
+- Jobs are ``(scraper_name, html)``. Workers import only the scraper module they
+  need and return candidates as compact tuples, which are turned back into
+  ``Candidate`` objects in the caller.
+- Workers are started with ``spawn``: forking a process that already runs
+  tracker, browser and HTTP threads is unsafe.
+- ``PARSE_POOL_WORKERS = 0`` (the default) keeps parsing inline. Pages smaller
+  than ``PARSE_POOL_MIN_BYTES`` are parsed inline too, since pickling them costs
+  more than it saves.
+"""
+
+import atexit
+import importlib
+import multiprocessing
+import threading
+from concurrent.futures import Future, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+
+
+PARSER_CLASSES = {
+    'Amazon': 'core.services.scraper.amazon.AmazonScraper',
+    'Flipkart': 'core.services.scraper.flipkart.FlipkartScraper',
+    'Myntra': 'core.services.scraper.myntra.MyntraScraper',
+    'Ajio': 'core.services.scraper.ajio.AjioScraper',
+    'Meesho': 'core.services.scraper.meesho.MeeshoScraper',
+}
+
+_worker_scrapers = {}
+
+
+def _scraper_for(scraper_name):
+    scraper = _worker_scrapers.get(scraper_name)
+    if scraper is None:
+        module_path, class_name = PARSER_CLASSES[scraper_name].rsplit('.', 1)
+        scraper = getattr(importlib.import_module(module_path), class_name)()
+        _worker_scrapers[scraper_name] = scraper
+    return scraper
+
+
+def parse_to_tuples(scraper_name, html, backend=None):
+    """Worker entry point: parse ``html`` with ``scraper_name``'s parser and return candidate tuples."""
+    candidates = _scraper_for(scraper_name).parse_candidates(html, backend=backend)
+    return [candidate.as_tuple() for candidate in candidates]
+
+
+def candidates_from_tuples(rows):
+    from core.services.scraper.base import Candidate
+
+    return [Candidate(*row) for row in rows]
+
+
+class ParseExecutor:
+    def __init__(self, workers):
+        self.workers = max(1, workers)
+        self._pool = None
+        self._lock = threading.Lock()
+        self._stats = {'submitted': 0, 'failed': 0}
+
+    def _get_pool(self):
+        with self._lock:
+            if self._pool is None:
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers,
+                    mp_context=multiprocessing.get_context('spawn'),
+                )
+            return self._pool
+
+    def submit(self, scraper_name, html, *, backend=None):
+        """Queue a parse and return a future that resolves to a list of ``Candidate``."""
+        backend = backend or getattr(settings, 'SCRAPER_PARSER_BACKEND', 'soup')
+        with self._lock:
+            self._stats['submitted'] += 1
+        rows = self._get_pool().submit(parse_to_tuples, scraper_name, html, backend)
+
+        result = Future()
+
+        def finish(done):
+            try:
+                result.set_result(candidates_from_tuples(done.result()))
+            except Exception as e:
+                result.set_exception(e)
+
+        rows.add_done_callback(finish)
+        return result
+
+    def parse(self, scraper_name, html, *, backend=None):
+        """Parse on the pool, falling back to this process if the pool is broken."""
+        try:
+            return self.submit(scraper_name, html, backend=backend).result()
+        except BrokenProcessPool as e:
+            print(f"Parse pool failed for {scraper_name}, parsing inline: {e}")
+            with self._lock:
+                self._stats['failed'] += 1
+                self._pool = None
+            return candidates_from_tuples(parse_to_tuples(scraper_name, html, backend))
+
+    def stats(self):
+        with self._lock:
+            return dict(self._stats, workers=self.workers)
+
+    def shutdown(self):
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+
+
+_executor = None
+_executor_lock = threading.Lock()
+
+
+def get_parse_executor():
+    """Return the shared parse pool, or None when ``PARSE_POOL_WORKERS`` is 0."""
+    global _executor
+    workers = getattr(settings, 'PARSE_POOL_WORKERS', 0)
+    if workers <= 0:
+        return None
+    with _executor_lock:
+        if _executor is None or _executor.workers != workers:
+            if _executor is not None:
+                _executor.shutdown()
+            else:
+                atexit.register(shutdown_parse_executor)
+            _executor = ParseExecutor(workers)
+        return _executor
+
+
+def shutdown_parse_executor():
+    global _executor
+    with _executor_lock:
+        executor, _executor = _executor, None
+    if executor is not None:
+        executor.shutdown()
@@ -0,0 +1,65 @@
+"""
+Word-level Aho-Corasick matching for the matcher's phrase tables.
+
+Notes:
+- Patterns are sequences of words and the text is the title's word list, so a
+  match always starts and ends on a word boundary ("split ac" does not fire on
+  "split acoustic").
+- All patterns are compiled into one automaton, so a single pass over the words
+  reports every phrase that occurs, however large the tables grow.
+- Each pattern carries a payload; ``search`` returns the payloads of every
+  occurrence in the order the matches end.
+"""
+
+from collections import deque
+
+
+class PhraseAutomaton:
+    def __init__(self, patterns):
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        for words, payload in patterns:
+            self._add(tuple(words), payload)
+        self._link()
+
+    def _add(self, words, payload):
+        if not words:
+            raise ValueError('Phrase patterns need at least one word.')
+        node = 0
+        for word in words:
+            next_node = self._goto[node].get(word)
+            if next_node is None:
+                next_node = len(self._goto)
+                self._goto[node][word] = next_node
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            node = next_node
+        self._outputs[node].append(payload)
+
+    def _link(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for word, child in self._goto[node].items():
+                queue.append(child)
+                fallback = self._fail[node]
+                while fallback and word not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                target = self._goto[fallback].get(word, 0)
+                self._fail[child] = target if target != child else 0
+                self._outputs[child] = self._outputs[child] + self._outputs[self._fail[child]]
+        self._outputs = [tuple(outputs) for outputs in self._outputs]
+
+    def search(self, words):
+        goto, fail, outputs = self._goto, self._fail, self._outputs
+        found = []
+        node = 0
+        for word in words:
+            while node and word not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(word, 0)
+            if outputs[node]:
+                found.extend(outputs[node])
+        return found
@@ -0,0 +1,150 @@
+"""
+Per-domain token-bucket rate limiting for outbound scraper requests.
+
+Notes:
+- Each domain has a bucket that refills at ``rate`` requests per second up to
+  ``burst`` tokens. A request only waits when its domain's bucket is empty, so
+  alternating between marketplaces costs nothing.
+- Reservations may drive a bucket negative; the caller then sleeps until its
+  token would have been refilled (plus a little jitter).
+- The ``sqlite`` backend keeps bucket state in a shared file, so several worker
+  processes on one box respect a single budget per domain.
+"""
+
+import random
+import sqlite3
+import threading
+import time
+import urllib.parse
+
+from django.conf import settings
+
+
+class MemoryBucketStore:
+    """Bucket state for a single process."""
+
+    def __init__(self):
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    def reserve(self, key, *, rate, burst, now, penalty=0.0):
+        with self._lock:
+            tokens, updated = self._buckets.get(key, (float(burst), now))
+            tokens, wait = _take_token(tokens, updated, rate=rate, burst=burst, now=now, penalty=penalty)
+            self._buckets[key] = (tokens, now)
+            return wait
+
+
+class SQLiteBucketStore:
+    """Bucket state shared between processes through a SQLite file."""
+
+    def __init__(self, path):
+        self.path = str(path)
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute(
+                    'CREATE TABLE IF NOT EXISTS buckets (key TEXT PRIMARY KEY, tokens REAL NOT NULL, updated REAL NOT NULL)'
+                )
+        finally:
+            connection.close()
+
+    def _connect(self):
+        return sqlite3.connect(self.path, timeout=10)
+
+    def reserve(self, key, *, rate, burst, now, penalty=0.0):
+        connection = self._connect()
+        try:
+            connection.isolation_level = None
+            connection.execute('BEGIN IMMEDIATE')
+            row = connection.execute('SELECT tokens, updated FROM buckets WHERE key = ?', (key,)).fetchone()
+            tokens, updated = row if row else (float(burst), now)
+            tokens, wait = _take_token(tokens, updated, rate=rate, burst=burst, now=now, penalty=penalty)
+            connection.execute(
+                'INSERT INTO buckets (key, tokens, updated) VALUES (?, ?, ?) '
+                'ON CONFLICT(key) DO UPDATE SET tokens = excluded.tokens, updated = excluded.updated',
+                (key, tokens, now),
+            )
+            connection.execute('COMMIT')
+            return wait
+        finally:
+            connection.close()
+
+
+def _take_token(tokens, updated, *, rate, burst, now, penalty=0.0):
+    """Refill, then take one token (or, with ``penalty``, push the bucket back)."""
+    tokens = min(float(burst), tokens + max(0.0, now - updated) * rate)
+    if penalty:
+        tokens = min(tokens, 0.0) - penalty * rate
+        return tokens, 0.0
+    tokens -= 1.0
+    return tokens, (-tokens / rate if tokens < 0 else 0.0)
+
+
+class RateLimiter:
+    def __init__(self, store, *, rate=0.5, burst=2, jitter=0.5, overrides=None, clock=None, sleep=None):
+        self.store = store
+        self.rate = rate
+        self.burst = burst
+        self.jitter = jitter
+        self.overrides = overrides or {}
+        self._clock = clock or time.time
+        self._sleep = sleep
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+
+    def _limits_for(self, domain):
+        rate, burst = self.overrides.get(domain, (self.rate, self.burst))
+        return max(rate, 0.001), max(burst, 1)
+
+    def acquire(self, url):
+        """Block until ``url``'s domain has budget for one more request; return seconds waited."""
+        domain = _domain(url)
+        rate, burst = self._limits_for(domain)
+        wait = self.store.reserve(domain, rate=rate, burst=burst, now=self._clock())
+        if wait > 0:
+            wait += random.uniform(0, self.jitter)
+            (self._sleep or time.sleep)(wait)
+        with self._stats_lock:
+            stats = self._stats.setdefault(domain, {'requests': 0, 'delayed': 0, 'waited_seconds': 0.0})
+            stats['requests'] += 1
+            stats['delayed'] += 1 if wait > 0 else 0
+            stats['waited_seconds'] += wait
+        return wait
+
+    def backoff(self, url, seconds):
+        """Push ``url``'s domain back by ``seconds`` after the server asked us to slow down."""
+        domain = _domain(url)
+        rate, burst = self._limits_for(domain)
+        self.store.reserve(domain, rate=rate, burst=burst, now=self._clock(), penalty=seconds)
+
+    def stats(self):
+        with self._stats_lock:
+            return {domain: dict(stats) for domain, stats in self._stats.items()}
+
+
+def _domain(url):
+    return (urllib.parse.urlsplit(url).hostname or '').lower()
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def get_rate_limiter():
+    """Return the process-wide limiter configured from settings."""
+    global _limiter
+    with _limiter_lock:
+        if _limiter is None:
+            if getattr(settings, 'SCRAPER_RATE_LIMIT_BACKEND', 'memory') == 'sqlite':
+                store = SQLiteBucketStore(settings.SCRAPER_RATE_LIMIT_DB)
+            else:
+                store = MemoryBucketStore()
+            _limiter = RateLimiter(
+                store,
+                rate=getattr(settings, 'SCRAPER_RATE_PER_SECOND', 0.5),
+                burst=getattr(settings, 'SCRAPER_RATE_BURST', 2),
+                jitter=getattr(settings, 'SCRAPER_RATE_JITTER', 0.5),
+                overrides=getattr(settings, 'SCRAPER_RATE_LIMITS', {}),
+            )
+        return _limiter
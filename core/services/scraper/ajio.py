@@ -1,37 +1,100 @@
 import re
 import urllib.parse
-
-from bs4 import BeautifulSoup
-
-from core.services.browser import fetch_rendered_html
-
-from .base import BaseScraper
+from functools import partial
+
+from bs4 import BeautifulSoup, Tag
+
+from core.services.browser import RenderOptions, fetch_rendered_html
+
+from .base import TEXT_STRING_TYPES, BaseScraper, joined_text, result_region
+from .xpath import compile_xpath, first, has_class, node_text, parse_document
+
+
+# In-page extraction: returns compact candidate dicts instead of the full DOM.
+AJIO_EXTRACT_SCRIPT = r"""
+() => {
+  const clean = (text) => (text || '').replace(/\s+/g, ' ').trim();
+  const cards = Array.from(
+    document.querySelectorAll('div.item, div.rilrtl-products-list__item, div[data-testid="product-card"]'),
+  ).slice(0, 40);
+  return cards.map((card, index) => {
+    const titleElem = card.querySelector('.nameCls, .brand, .contentHolder .name');
+    const priceElem = card.querySelector('.price, .priceCls');
+    const link = card.querySelector('a[href]');
+    const image = card.querySelector('img[src]');
+    return {
+      title: clean(titleElem && titleElem.textContent),
+      price: clean(priceElem && priceElem.textContent),
+      href: link ? link.getAttribute('href') : '',
+      image: image ? image.getAttribute('src') : null,
+      sponsored: false,
+      rank: index + 1,
+    };
+  });
+}
+"""
+
+
+MAX_RESULTS = 40
+PRODUCT_CARD_SELECTOR = 'div.item, div.rilrtl-products-list__item, div[data-testid="product-card"]'
+PRODUCT_CARD_PATTERN = re.compile(
+    r'<div\b[^>]*?(?:\sclass\s*=\s*["\'][^"\']*(?<![\w-])(?:item|rilrtl-products-list__item)(?![\w-])'
+    r'|\sdata-testid\s*=\s*["\']?product-card(?=["\'\s/>]))',
+    re.I,
+)
+TITLE_CLASSES = frozenset({'nameCls', 'brand'})
+PRICE_CLASSES = frozenset({'price', 'priceCls'})
+
+# Precompiled selectors for the lxml backend, mirroring the BeautifulSoup lookups.
+PRODUCT_CARDS_XPATH = compile_xpath(
+    f'//div[{has_class("item")}] | //div[{has_class("rilrtl-products-list__item")}] | //div[@data-testid="product-card"]'
+)
+TITLE_XPATH = compile_xpath(
+    f'(.//*[{has_class("nameCls")}] | .//*[{has_class("brand")}] '
+    f'| .//*[{has_class("name")}][ancestor::*[{has_class("contentHolder")}]])[1]'
+)
+PRICE_XPATH = compile_xpath(f'(.//*[{has_class("price")}] | .//*[{has_class("priceCls")}])[1]')
+LINK_XPATH = compile_xpath('(.//a[@href])[1]')
+IMAGE_XPATH = compile_xpath('(.//img[@src])[1]')
 
 
 class AjioScraper(BaseScraper):
     """Best-effort scraper for Ajio public search results."""
 
     website = 'Ajio'
+    parser_backends = ('soup', 'lxml')
+    result_block_pattern = PRODUCT_CARD_PATTERN
+    max_results = MAX_RESULTS
+    render_options = RenderOptions(
+        source='Ajio',
+        ready_selector='div.item, div.rilrtl-products-list__item, div[data-testid="product-card"]',
+        extract_script=AJIO_EXTRACT_SCRIPT,
+    )
 
     def search(self, query):
         search_url = "https://www.ajio.com/search/"
         params = {'text': query}
-        response = self.get_page(search_url, params=params)
+        fetched = self.fetch_search_page(
+            search_url,
+            params=params,
+            render=fetch_rendered_html,
+            render_url=self.render_url(query),
+            thin_check=False,
+        )
+        response = fetched.response
         html = response.text if response else ''
         http_status = response.status_code if response else None
 
-        rendered_html = None
-        rendered_status = None
-        if not html or http_status in (403, 429, 503) or self.looks_blocked(html, response.url if response else search_url):
-            rendered = fetch_rendered_html(f"{search_url}?{urllib.parse.urlencode(params)}")
-            if rendered and rendered.html:
-                rendered_html = rendered.html
-                rendered_status = rendered.status
-
-        html = rendered_html or html
-        http_status = rendered_status or http_status
+        rendered_items = None
+        if not fetched.http_usable:
+            rendered = fetched.rendered
+            if rendered and (rendered.html or rendered.items):
+                # Judge the rendered page on its own; the blocked HTTP body is not parsed.
+                html = rendered.html
+                rendered_items = rendered.items
+                http_status = rendered.status
 
-        if not html:
+        if not html and not rendered_items:
             return self.build_attempt(
                 website=self.website,
                 state='unavailable',
@@ -39,7 +102,7 @@ class AjioScraper(BaseScraper):
                 http_status=http_status,
             )
 
-        if http_status in (403, 429) or self.looks_blocked(html):
+        if not rendered_items and (http_status in (403, 429) or self.looks_blocked(html)):
             return self.build_attempt(
                 website=self.website,
                 state='unavailable',
@@ -47,7 +110,10 @@ class AjioScraper(BaseScraper):
                 http_status=http_status,
             )
 
-        candidates = self.parse_candidates(html)
+        if rendered_items:
+            candidates = self.candidates_from_items(rendered_items, canonicalize=self._canonicalize_url)
+        else:
+            candidates = self.parse_html(html)
         if not candidates:
             return self.build_attempt(
                 website=self.website,
@@ -64,23 +130,41 @@ class AjioScraper(BaseScraper):
             http_status=http_status,
         )
 
-    def parse_candidates(self, html):
-        soup = BeautifulSoup(html or '', 'html.parser')
+    def render_url(self, query):
+        return f"https://www.ajio.com/search/?{urllib.parse.urlencode({'text': query})}"
+
+    def parse_candidates_soup(self, html):
+        soup = BeautifulSoup(result_region(html or '', PRODUCT_CARD_PATTERN, MAX_RESULTS), 'html.parser')
         results = []
+        record_text = self.records_raw_text()
 
-        for rank, product in enumerate(soup.select('div.item, div.rilrtl-products-list__item, div[data-testid="product-card"]'), start=1):
-            if rank > 40:
+        for rank, product in enumerate(soup.select(PRODUCT_CARD_SELECTOR), start=1):
+            if rank > MAX_RESULTS:
                 break
 
-            title_elem = product.select_one('.nameCls, .brand, .contentHolder .name')
+            # One walk over the card collects every element and string the candidate needs.
+            title_elem = price_elem = link = image = None
+            strings = []
+            for node in product.descendants:
+                if isinstance(node, Tag):
+                    classes = node.get('class') or ()
+                    if title_elem is None and (
+                        not TITLE_CLASSES.isdisjoint(classes)
+                        or ('name' in classes and node.find_parent(class_='contentHolder'))
+                    ):
+                        title_elem = node
+                    if price_elem is None and not PRICE_CLASSES.isdisjoint(classes):
+                        price_elem = node
+                    if link is None and node.name == 'a' and node.get('href') is not None:
+                        link = node
+                    if image is None and node.name == 'img' and node.get('src') is not None:
+                        image = node
+                elif record_text and type(node) in TEXT_STRING_TYPES:
+                    strings.append(node)
+
             title = self.clean_text(title_elem.get_text(" ", strip=True) if title_elem else '')
-            price_elem = product.select_one('.price, .priceCls')
             price = self.parse_price(price_elem.get_text(strip=True)) if price_elem else None
-            link = product.find('a', href=True)
-            href = link.get('href', '') if link else ''
-            if href.startswith('/'):
-                href = f'https://www.ajio.com{href}'
-            image = product.find('img', src=True)
+            href = self._canonicalize_url(link.get('href', '') if link else '')
 
             candidate = self.build_candidate(
                 title=title,
@@ -88,9 +172,45 @@ class AjioScraper(BaseScraper):
                 url=href,
                 image_url=image.get('src') if image else None,
                 rank=rank,
-                raw_text=product.get_text(" ", strip=True),
+                raw_text=partial(joined_text, strings),
+            )
+            if candidate:
+                results.append(candidate)
+
+        return results
+
+    def parse_candidates_lxml(self, html):
+        document = parse_document(result_region(html, PRODUCT_CARD_PATTERN, MAX_RESULTS))
+        if document is None:
+            return []
+        results = []
+
+        for rank, product in enumerate(PRODUCT_CARDS_XPATH(document), start=1):
+            if rank > MAX_RESULTS:
+                break
+
+            title = self.clean_text(node_text(first(TITLE_XPATH, product), " "))
+            price_elem = first(PRICE_XPATH, product)
+            price = self.parse_price(node_text(price_elem)) if price_elem is not None else None
+            link = first(LINK_XPATH, product)
+            href = self._canonicalize_url(link.get('href', '') if link is not None else '')
+            image = first(IMAGE_XPATH, product)
+
+            candidate = self.build_candidate(
+                title=title,
+                price=price,
+                url=href,
+                image_url=image.get('src') if image is not None else None,
+                rank=rank,
+                raw_text=partial(node_text, product, " "),
             )
             if candidate:
                 results.append(candidate)
 
         return results
+
+    def _canonicalize_url(self, href):
+        href = href or ''
+        if href.startswith('/'):
+            href = f'https://www.ajio.com{href}'
+        return href
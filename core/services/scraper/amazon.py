@@ -1,37 +1,105 @@
 import re
 import urllib.parse
+from functools import partial
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, NavigableString, Tag
 
-from core.services.browser import fetch_rendered_html
+from core.services.browser import RenderOptions, fetch_rendered_html
 
-from .base import BaseScraper
+from .base import TEXT_STRING_TYPES, BaseScraper, joined_text, result_region
+from .xpath import compile_xpath, first, has_class, has_string, node_text, parse_document
+
+
+# In-page extraction: returns compact candidate dicts instead of the full DOM.
+AMAZON_EXTRACT_SCRIPT = r"""
+() => {
+  const clean = (text) => (text || '').replace(/\s+/g, ' ').trim();
+  const cards = Array.from(document.querySelectorAll('div[data-component-type="s-search-result"]')).slice(0, 24);
+  return cards.map((card, index) => {
+    const links = Array.from(card.querySelectorAll('a[href*="/dp/"], a[href*="/gp/"]'))
+      .map((link) => [clean(link.textContent), link.getAttribute('href') || ''])
+      .filter(([text]) => text);
+    const [linkTitle, href] = links.reduce((best, item) => (item[0].length > best[0].length ? item : best), ['', '']);
+    const heading = card.querySelector('h2');
+    const brand = clean(heading && heading.textContent);
+    let title = linkTitle;
+    if (brand && title && !title.toLowerCase().includes(brand.toLowerCase())) {
+      title = `${brand} ${title}`;
+    } else if (brand && !title) {
+      title = brand;
+    }
+    const fallbackLink = card.querySelector('a[href*="/dp/"], a[href*="/gp/"]');
+    const offscreen = card.querySelector('span.a-price span.a-offscreen');
+    const whole = card.querySelector('span.a-price-whole');
+    const fraction = card.querySelector('span.a-price-fraction');
+    const image = card.querySelector('img.s-image');
+    return {
+      title,
+      price: offscreen ? clean(offscreen.textContent)
+        : whole ? `${clean(whole.textContent)}.${fraction ? clean(fraction.textContent) : '00'}` : '',
+      href: href || (fallbackLink ? fallbackLink.getAttribute('href') : ''),
+      image: image ? image.getAttribute('src') : null,
+      sponsored: /sponsored/i.test(card.textContent),
+      rank: index + 1,
+    };
+  });
+}
+"""
+
+
+MAX_RESULTS = 24
+SPONSORED_PATTERN = re.compile(r'sponsored', re.I)
+PRODUCT_HREF_PATTERN = re.compile(r'/dp/|/gp/')
+RESULT_BLOCK_PATTERN = re.compile(
+    r'<div\b[^>]*?\sdata-component-type\s*=\s*["\']?s-search-result(?=["\'\s/>])',
+    re.I,
+)
+
+# Precompiled selectors for the lxml backend, mirroring the BeautifulSoup lookups.
+RESULT_BLOCKS_XPATH = compile_xpath('//div[@data-component-type="s-search-result"]')
+HEADING_XPATH = compile_xpath('(.//h2)[1]')
+PRODUCT_LINKS_XPATH = compile_xpath('.//a[@href][contains(@href, "/dp/") or contains(@href, "/gp/")]')
+OFFSCREEN_PRICE_XPATH = compile_xpath(
+    f'(.//span[{has_class("a-offscreen")}][ancestor::span[{has_class("a-price")}]])[1]'
+)
+PRICE_WHOLE_XPATH = compile_xpath(f'(.//span[{has_class("a-price-whole")}])[1]')
+PRICE_FRACTION_XPATH = compile_xpath(f'(.//span[{has_class("a-price-fraction")}])[1]')
+IMAGE_XPATH = compile_xpath(f'(.//img[{has_class("s-image")}])[1]')
 
 
 class AmazonScraper(BaseScraper):
     """Scraper for Amazon.in."""
 
     website = 'Amazon'
+    parser_backends = ('soup', 'lxml')
+    result_block_pattern = RESULT_BLOCK_PATTERN
+    max_results = MAX_RESULTS
+    render_options = RenderOptions(
+        source='Amazon',
+        blocked_url_patterns=('amazon-adsystem.com', '/uedata', 'unagi.amazon.in', 'fls-eu.amazon.in'),
+        ready_selector='div[data-component-type="s-search-result"]',
+        extract_script=AMAZON_EXTRACT_SCRIPT,
+    )
 
     def search(self, query):
         search_url = "https://www.amazon.in/s"
         params = {'k': query}
-        response = self.get_page(search_url, params=params)
+        fetched = self.fetch_search_page(
+            search_url,
+            params=params,
+            render=fetch_rendered_html,
+            render_url=self.render_url(query),
+        )
+        response = fetched.response
         html = response.text if response else ''
         http_status = response.status_code if response else None
 
-        use_playwright = (
-            not html
-            or http_status in (403, 429, 503)
-            or self.looks_blocked(html, response.url if response else search_url)
-            or self.is_thin_html(html)
-        )
-
-        if use_playwright:
-            url = f"{search_url}?{urllib.parse.urlencode(params)}"
-            rendered = fetch_rendered_html(url)
-            if rendered and rendered.html:
+        rendered_items = None
+        if not fetched.http_usable:
+            rendered = fetched.rendered
+            if rendered and (rendered.html or rendered.items):
                 html = rendered.html
+                rendered_items = rendered.items
                 http_status = rendered.status or http_status
             elif http_status in (403, 429):
                 return self.build_attempt(
@@ -55,7 +123,10 @@ class AmazonScraper(BaseScraper):
                     http_status=http_status,
                 )
 
-        candidates = self.parse_candidates(html)
+        if rendered_items:
+            candidates = self.candidates_from_items(rendered_items, canonicalize=self._canonicalize_url)
+        else:
+            candidates = self.parse_html(html)
         if not candidates:
             if self.looks_blocked(html):
                 return self.build_attempt(
@@ -79,67 +150,145 @@ class AmazonScraper(BaseScraper):
             http_status=http_status,
         )
 
-    def parse_candidates(self, html):
-        soup = BeautifulSoup(html or '', 'html.parser')
+    def render_url(self, query):
+        return f"https://www.amazon.in/s?{urllib.parse.urlencode({'k': query})}"
+
+    def parse_candidates_soup(self, html):
+        soup = BeautifulSoup(result_region(html or '', RESULT_BLOCK_PATTERN, MAX_RESULTS), 'html.parser')
         results = []
+        record_text = self.records_raw_text()
 
         for rank, product in enumerate(
             soup.find_all('div', {'data-component-type': 's-search-result'}),
             start=1,
         ):
-            if rank > 24:
+            if rank > MAX_RESULTS:
                 break
 
-            title, title_url = self._extract_title_and_url(product)
+            # One walk over the block collects every element and string the candidate needs.
+            heading = offscreen = whole = fraction = image = None
+            product_links = []
+            strings = []
+            sponsored = False
+            for node in product.descendants:
+                if isinstance(node, Tag):
+                    name = node.name
+                    if name == 'a':
+                        if PRODUCT_HREF_PATTERN.search(node.get('href') or ''):
+                            product_links.append(node)
+                    elif name == 'span':
+                        classes = node.get('class') or ()
+                        if offscreen is None and 'a-offscreen' in classes and node.find_parent('span', class_='a-price'):
+                            offscreen = node
+                        if whole is None and 'a-price-whole' in classes:
+                            whole = node
+                        if fraction is None and 'a-price-fraction' in classes:
+                            fraction = node
+                    elif name == 'h2' and heading is None:
+                        heading = node
+                    elif name == 'img' and image is None and 's-image' in (node.get('class') or ()):
+                        image = node
+                elif isinstance(node, NavigableString):
+                    if record_text and type(node) in TEXT_STRING_TYPES:
+                        strings.append(node)
+                    if not sponsored and SPONSORED_PATTERN.search(node):
+                        sponsored = True
+
+            title, title_url = self._title_and_url_from(
+                heading.get_text(" ", strip=True) if heading else '',
+                [(link.get_text(" ", strip=True), link.get('href', '')) for link in product_links],
+            )
             if not title:
                 continue
 
-            link = product.find('a', href=re.compile(r'/dp/|/gp/'))
-            href = title_url or (link.get('href', '') if link else '')
+            href = title_url or (product_links[0].get('href', '') if product_links else '')
             url = self._canonicalize_url(href)
             if not url:
                 continue
 
             price = None
-            offscreen = product.select_one('span.a-price span.a-offscreen')
             if offscreen:
                 price = self.parse_price(offscreen.get_text(strip=True))
 
+            if not price and whole:
+                price = self.parse_price(
+                    f"{whole.get_text(strip=True)}.{fraction.get_text(strip=True) if fraction else '00'}"
+                )
+
             if not price:
-                whole = product.select_one('span.a-price-whole')
-                fraction = product.select_one('span.a-price-fraction')
-                if whole:
+                continue
+
+            candidate = self.build_candidate(
+                title=title,
+                price=price,
+                url=url,
+                image_url=image.get('src') if image else None,
+                rank=rank,
+                is_sponsored=sponsored,
+                raw_text=partial(joined_text, strings),
+            )
+            if candidate:
+                results.append(candidate)
+
+        return results
+
+    def parse_candidates_lxml(self, html):
+        document = parse_document(result_region(html, RESULT_BLOCK_PATTERN, MAX_RESULTS))
+        if document is None:
+            return []
+        results = []
+
+        for rank, product in enumerate(RESULT_BLOCKS_XPATH(document), start=1):
+            if rank > MAX_RESULTS:
+                break
+
+            product_links = PRODUCT_LINKS_XPATH(product)
+            title, title_url = self._title_and_url_from(
+                node_text(first(HEADING_XPATH, product), " "),
+                [(node_text(link, " "), link.get('href', '')) for link in product_links],
+            )
+            if not title:
+                continue
+
+            href = title_url or (product_links[0].get('href', '') if product_links else '')
+            url = self._canonicalize_url(href)
+            if not url:
+                continue
+
+            price = None
+            offscreen = first(OFFSCREEN_PRICE_XPATH, product)
+            if offscreen is not None:
+                price = self.parse_price(node_text(offscreen))
+
+            if not price:
+                whole = first(PRICE_WHOLE_XPATH, product)
+                fraction = first(PRICE_FRACTION_XPATH, product)
+                if whole is not None:
                     price = self.parse_price(
-                        f"{whole.get_text(strip=True)}.{fraction.get_text(strip=True) if fraction else '00'}"
+                        f"{node_text(whole)}.{node_text(fraction) if fraction is not None else '00'}"
                     )
 
             if not price:
                 continue
 
-            sponsored = bool(product.find(string=re.compile(r'sponsored', re.I)))
-            image = product.select_one('img.s-image')
+            image = first(IMAGE_XPATH, product)
             candidate = self.build_candidate(
                 title=title,
                 price=price,
                 url=url,
-                image_url=image.get('src') if image else None,
+                image_url=image.get('src') if image is not None else None,
                 rank=rank,
-                is_sponsored=sponsored,
-                raw_text=product.get_text(" ", strip=True),
+                is_sponsored=has_string(product, SPONSORED_PATTERN),
+                raw_text=partial(node_text, product, " "),
             )
             if candidate:
                 results.append(candidate)
 
         return results
 
-    def _extract_title_and_url(self, product):
-        brand_elem = product.select_one('h2')
-        brand = self.clean_text(brand_elem.get_text(" ", strip=True) if brand_elem else '')
-        product_links = product.find_all('a', href=re.compile(r'/dp/|/gp/'))
-        text_links = [
-            (self.clean_text(link.get_text(" ", strip=True)), link.get('href', ''))
-            for link in product_links
-        ]
+    def _title_and_url_from(self, brand_text, links):
+        brand = self.clean_text(brand_text)
+        text_links = [(self.clean_text(text), href) for text, href in links]
         text_links = [(text, href) for text, href in text_links if text]
 
         title = ''
@@ -1,23 +1,68 @@
+import codecs
 from abc import ABC, abstractmethod
+from concurrent.futures import FIRST_COMPLETED, wait
 from dataclasses import dataclass, field
-from typing import List, Optional
+from typing import Any, List, Optional
 
 import requests
-import time
+
+from bs4 import CData, NavigableString
+from django.conf import settings
+
+from core.services.fetch_strategy import HEDGED, HTTP, RENDER, get_fetch_strategy, get_hedge_executor
+from core.services.http import DEFAULT_HEADERS, get_session, record_stream
+from core.services.parsing import PARSER_CLASSES, get_parse_executor
+from core.services.ratelimit import get_rate_limiter
 
 
-@dataclass
 class Candidate:
-    title: str
-    price: float
-    url: str
-    image_url: Optional[str] = None
-    rank: int = 0
-    is_sponsored: bool = False
-    raw_text: str = ''
+    """
+    One search result.
 
+    ``raw_text`` may be given as a zero-argument callable; it is then only
+    built the first time it is read. Scrapers fill it only in recording mode
+    (``SCRAPER_RECORD_RAW_TEXT``), since matching never uses it.
+    """
 
-@dataclass
+    __slots__ = ('title', 'price', 'url', 'image_url', 'rank', 'is_sponsored', '_raw_text')
+    _fields = ('title', 'price', 'url', 'image_url', 'rank', 'is_sponsored', 'raw_text')
+
+    def __init__(self, title, price, url, image_url=None, rank=0, is_sponsored=False, raw_text=''):
+        self.title = title
+        self.price = price
+        self.url = url
+        self.image_url = image_url
+        self.rank = rank
+        self.is_sponsored = is_sponsored
+        self._raw_text = raw_text
+
+    @property
+    def raw_text(self):
+        value = self._raw_text
+        if callable(value):
+            value = self._raw_text = value()
+        return value
+
+    @raw_text.setter
+    def raw_text(self, value):
+        self._raw_text = value
+
+    def as_tuple(self):
+        return (self.title, self.price, self.url, self.image_url, self.rank, self.is_sponsored, self.raw_text)
+
+    def __eq__(self, other):
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self.as_tuple() == other.as_tuple()
+
+    __hash__ = None
+
+    def __repr__(self):
+        fields = ', '.join(f'{name}={value!r}' for name, value in zip(self._fields, self.as_tuple()))
+        return f'Candidate({fields})'
+
+
+@dataclass(slots=True)
 class ScrapeAttempt:
     website: str
     state: str
@@ -26,25 +71,63 @@ class ScrapeAttempt:
     http_status: Optional[int] = None
 
 
+STREAM_CHUNK_BYTES = 16 * 1024
+# Decoded characters kept between chunks so a block marker split across two chunks is still seen.
+STREAM_MARKER_OVERLAP = 2048
+
+# String types that ``Tag.get_text()`` includes (comments, scripts and styles are skipped).
+TEXT_STRING_TYPES = (NavigableString, CData)
+
+
+def result_region(html, block_pattern, limit):
+    """
+    Slice ``html`` down to the result blocks the parsers will actually read.
+
+    The region starts at the first block and ends just before block
+    ``limit + 1``, so neither the page chrome before the results nor anything
+    past the rank limit is tokenized or built into a tree. Pages without a
+    recognisable block are returned unchanged.
+    """
+    if not html or not getattr(settings, 'SCRAPER_PARTIAL_PARSE', True):
+        return html
+    start = end = None
+    for count, match in enumerate(block_pattern.finditer(html), start=1):
+        if count == 1:
+            start = match.start()
+        elif count > limit:
+            end = match.start()
+            break
+    if start is None:
+        return html
+    return html[start:end]
+
+
+def joined_text(strings):
+    """Join strings the way ``get_text(" ", strip=True)`` does."""
+    return ' '.join(text for text in (string.strip() for string in strings) if text)
+
+
+@dataclass
+class PageFetch:
+    """What ``fetch_search_page`` got back: the HTTP response and/or the rendered page."""
+    strategy: str
+    response: Any = None
+    rendered: Any = None
+    http_usable: bool = False
+
+
 class BaseScraper(ABC):
     """Base class for all web scrapers."""
+
+    # Parser engines this scraper implements as ``parse_candidates_<backend>``.
+    parser_backends = ('soup',)
+    # Start-of-result-block pattern and rank limit; scrapers that set both get streamed fetches.
+    result_block_pattern = None
+    max_results = None
     
     def __init__(self):
-        self.headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
-            'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
-            'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
-            'Connection': 'keep-alive',
-            'Upgrade-Insecure-Requests': '1',
-            'Sec-Fetch-Dest': 'document',
-            'Sec-Fetch-Mode': 'navigate',
-            'Sec-Fetch-Site': 'none',
-            'Cache-Control': 'max-age=0'
-        }
-        self.session = requests.Session()
-        self.session.headers.update(self.headers)
-    
+        self.headers = dict(DEFAULT_HEADERS)
+
     @abstractmethod
     def search(self, query):
         """
@@ -55,26 +138,64 @@ class BaseScraper(ABC):
         """
         pass
     
+    def parse_candidates(self, html, *, backend=None):
+        """
+        Parse search-result HTML into candidates with the configured backend.
+
+        ``SCRAPER_PARSER_BACKEND`` picks the engine; scrapers that do not
+        implement it fall back to BeautifulSoup.
+        """
+        backend = backend or getattr(settings, 'SCRAPER_PARSER_BACKEND', 'soup')
+        if backend not in self.parser_backends:
+            backend = 'soup'
+        return getattr(self, f'parse_candidates_{backend}')(html)
+
+    def parse_html(self, html):
+        """
+        Parse a fetched search page, on the parse pool when it is enabled.
+
+        Small pages and scrapers the pool does not know (e.g. test doubles) are
+        parsed in this thread.
+        """
+        executor = get_parse_executor()
+        pooled = PARSER_CLASSES.get(getattr(self, 'website', None)) == f'{type(self).__module__}.{type(self).__qualname__}'
+        if executor is None or not pooled or len(html or '') < getattr(settings, 'PARSE_POOL_MIN_BYTES', 50000):
+            return self.parse_candidates(html)
+        return executor.parse(self.website, html)
+
+    def render_url(self, query):
+        """URL this scraper hands to the browser when it falls back to rendering."""
+        return None
+
     def get_page(self, url, params=None, retries=2):
         """Fetch a webpage with retry logic and return the final response when possible."""
-        import time
         import random
-        
+
+        limiter = get_rate_limiter()
         last_response = None
         for attempt in range(retries + 1):
             try:
-                # Add random delay to avoid rate limiting (1-3 seconds)
-                if attempt > 0:
-                    delay = random.uniform(2, 4)
-                    time.sleep(delay)
-                else:
-                    time.sleep(random.uniform(1, 2))
-                
-                response = self.session.get(url, params=params, timeout=20, allow_redirects=True)
+                # Only waits when this domain's request budget is used up
+                limiter.acquire(url)
+
+                session = get_session(url)
+                stream = self._streaming_enabled()
+                response = session.get(
+                    url,
+                    params=params,
+                    headers=self.headers,
+                    timeout=20,
+                    allow_redirects=True,
+                    stream=stream,
+                )
+                if stream:
+                    self._read_streamed(response)
                 last_response = response
                 
                 if response.status_code in (429, 502, 503) and attempt < retries:
                     print(f"{response.status_code} for {url} - Attempt {attempt + 1}/{retries + 1}")
+                    # The site asked us to slow down: push its whole budget back, not just this retry
+                    limiter.backoff(url, random.uniform(2, 4))
                     continue
                     
                 return response
@@ -91,6 +212,145 @@ class BaseScraper(ABC):
         
         return last_response
     
+    def _streaming_enabled(self):
+        return bool(
+            self.result_block_pattern is not None
+            and self.max_results
+            and getattr(settings, 'SCRAPER_STREAMING_FETCH', True)
+        )
+
+    def _read_streamed(self, response):
+        """
+        Read a streamed response only until the block after ``max_results`` starts
+        (or the byte budget runs out), then close it.
+
+        The bytes read become ``response.content``, so callers use ``response.text``
+        as usual; ``result_region`` trims the partial block at the end. Closing
+        early drops the connection instead of returning it to the pool, which is
+        cheaper than downloading the rest of a large page.
+        """
+        if response.status_code != 200:
+            # Error pages are small; read them whole so the connection goes back to the pool.
+            response.content
+            return
+
+        budget = getattr(settings, 'SCRAPER_STREAM_MAX_BYTES', 3_000_000)
+        decoder = codecs.getincrementaldecoder(response.encoding or 'utf-8')(errors='replace')
+        chunks = []
+        received = 0
+        blocks = 0
+        pending = ''
+        cut_short = False
+        exhausted = False
+        try:
+            for chunk in response.iter_content(chunk_size=STREAM_CHUNK_BYTES):
+                chunks.append(chunk)
+                received += len(chunk)
+
+                pending += decoder.decode(chunk)
+                scanned_to = 0
+                for match in self.result_block_pattern.finditer(pending):
+                    blocks += 1
+                    scanned_to = match.end()
+                    if blocks > self.max_results:
+                        break
+                if blocks > self.max_results or received >= budget:
+                    cut_short = True
+                    break
+                pending = pending[max(scanned_to, len(pending) - STREAM_MARKER_OVERLAP):]
+            else:
+                exhausted = True
+
+            wire_bytes = response.raw.tell() if cut_short else None
+        finally:
+            response._content = b''.join(chunks)
+            if not exhausted:
+                # Unread body is still on the socket: drop the connection rather than pool it.
+                response.raw.close()
+            response._content_consumed = True
+            response.close()
+
+        bytes_saved = None
+        if cut_short:
+            content_length = response.headers.get('Content-Length')
+            if content_length and content_length.isdigit() and wire_bytes is not None:
+                bytes_saved = max(0, int(content_length) - wire_bytes)
+        else:
+            bytes_saved = 0
+        record_stream(self.website, bytes_read=received, bytes_saved=bytes_saved, cut_short=cut_short)
+
+    def http_usable(self, response, url, *, thin_check=True):
+        """True when an HTTP response can be parsed without falling back to the browser."""
+        html = response.text if response else ''
+        http_status = response.status_code if response else None
+        return not (
+            not html
+            or http_status in (403, 429, 503)
+            or self.looks_blocked(html, response.url if response else url)
+            or (thin_check and self.is_thin_html(html))
+        )
+
+    def rendered_usable(self, rendered):
+        return bool(rendered and (rendered.html or rendered.items) and not self.looks_blocked(rendered.html))
+
+    def fetch_search_page(self, url, *, params=None, render=None, render_url=None, thin_check=True):
+        """
+        Fetch a search page over HTTP, through the browser, or both, as the
+        learned fetch strategy decides for this source.
+
+        ``render`` is the scraper module's ``fetch_rendered_html``; without it
+        only HTTP is used. The outcome of each path feeds back into the strategy.
+        """
+        strategy = get_fetch_strategy()
+        render_url = render_url or url
+        if render is None or not getattr(settings, 'FETCH_STRATEGY_ENABLED', True):
+            choice = HTTP
+        else:
+            choice = strategy.choose(self.website)
+
+        def fetch_http():
+            response = self.get_page(url, params=params)
+            usable = self.http_usable(response, url, thin_check=thin_check)
+            strategy.record(self.website, HTTP, usable)
+            return response, usable
+
+        def fetch_render():
+            rendered = render(render_url, options=self.render_options)
+            strategy.record(self.website, RENDER, self.rendered_usable(rendered))
+            return rendered
+
+        if choice == RENDER:
+            return PageFetch(strategy=choice, rendered=fetch_render())
+
+        if choice == HEDGED:
+            executor = get_hedge_executor()
+            http_future = executor.submit(fetch_http)
+            render_future = executor.submit(fetch_render)
+            fetched = PageFetch(strategy=choice)
+            pending = {http_future, render_future}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        print(f"Hedged fetch failed for {url}: {e}")
+                        continue
+                    if future is http_future:
+                        fetched.response, fetched.http_usable = result
+                    else:
+                        fetched.rendered = result
+                if fetched.http_usable or self.rendered_usable(fetched.rendered):
+                    # First usable page wins; the other path finishes in the background.
+                    break
+            return fetched
+
+        response, usable = fetch_http()
+        fetched = PageFetch(strategy=choice, response=response, http_usable=usable)
+        if not usable and render is not None:
+            fetched.rendered = fetch_render()
+        return fetched
+
     def parse_price(self, price_str):
         """Extract numeric price from string."""
         if not price_str:
@@ -112,7 +372,15 @@ class BaseScraper(ABC):
     def clean_text(self, text):
         return ' '.join((text or '').split())
 
+    def records_raw_text(self):
+        return getattr(settings, 'SCRAPER_RECORD_RAW_TEXT', False)
+
     def build_candidate(self, *, title, price, url, image_url=None, rank=0, is_sponsored=False, raw_text=''):
+        """
+        Validate and normalise one result. ``raw_text`` (a string or a callable
+        returning one) is kept only in recording mode, and a callable is not
+        run until the text is read.
+        """
         if not title or not url or price in (None, '', 0):
             return None
 
@@ -131,9 +399,50 @@ class BaseScraper(ABC):
             image_url=image_url,
             rank=rank,
             is_sponsored=is_sponsored,
-            raw_text=self.clean_text(raw_text),
+            raw_text=self._recorded_raw_text(raw_text),
         )
 
+    def _recorded_raw_text(self, raw_text):
+        if not raw_text or not self.records_raw_text():
+            return ''
+        if callable(raw_text):
+            return lambda: self.clean_text(raw_text())
+        return self.clean_text(raw_text)
+
+    def candidates_from_items(self, items, *, canonicalize=None, dedupe=False, limit=40):
+        """
+        Build candidates from the compact dicts returned by an in-page extraction script.
+
+        Each item carries ``title``, ``price`` (number or display text), ``href``,
+        ``image``, ``sponsored`` and ``rank``.
+        """
+        results = []
+        seen_urls = set()
+
+        for item in (items or [])[:limit]:
+            href = item.get('href') or ''
+            url = canonicalize(href) if canonicalize else href
+            if not url or (dedupe and url in seen_urls):
+                continue
+            seen_urls.add(url)
+
+            price = item.get('price')
+            if isinstance(price, str):
+                price = self.parse_price(price)
+
+            candidate = self.build_candidate(
+                title=item.get('title'),
+                price=price,
+                url=url,
+                image_url=item.get('image') or None,
+                rank=item.get('rank') or 0,
+                is_sponsored=bool(item.get('sponsored')),
+            )
+            if candidate:
+                results.append(candidate)
+
+        return results
+
     def build_attempt(self, *, website, state, candidates=None, diagnostic_message='', http_status=None):
         return ScrapeAttempt(
             website=website,
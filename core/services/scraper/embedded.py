@@ -0,0 +1,108 @@
+"""
+Extraction of JSON state that search pages embed in ``<script>`` tags.
+
+Notes:
+- The payload is located with plain ``str.find`` scans instead of a regex or a
+  parsed DOM, so pages are never tokenized just to reach one script.
+- Decoding is bounded: ``raw_decode`` only sees the text up to the closing
+  ``</script>``, and payloads larger than ``MAX_PAYLOAD_CHARS`` are ignored.
+- ``collect_dicts`` walks the decoded state iteratively (no recursion limit)
+  in the same depth-first order as a recursive walk, and stops after a node
+  budget or once enough matches are found.
+"""
+
+import json
+
+
+MAX_PAYLOAD_CHARS = 8_000_000
+MAX_WALK_NODES = 500_000
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = ' \t\r\n'
+
+
+def _skip_whitespace(text, index):
+    while index < len(text) and text[index] in _WHITESPACE:
+        index += 1
+    return index
+
+
+def _decode_until_script_end(html, start):
+    """Decode the JSON value at ``start`` without looking past the enclosing ``</script>``."""
+    end = html.find('</script>', start)
+    if end == -1:
+        end = len(html)
+    if end - start > MAX_PAYLOAD_CHARS:
+        return None
+    try:
+        value, _end = _decoder.raw_decode(html[start:end])
+    except json.JSONDecodeError:
+        return None
+    return value
+
+
+def extract_assigned_json(html, name):
+    """Return the object literal assigned as ``<name> = {...}`` in an inline script."""
+    html = html or ''
+    index = html.find(name)
+    while index != -1:
+        cursor = _skip_whitespace(html, index + len(name))
+        if cursor < len(html) and html[cursor] == '=':
+            cursor = _skip_whitespace(html, cursor + 1)
+            if cursor < len(html) and html[cursor] == '{':
+                value = _decode_until_script_end(html, cursor)
+                if isinstance(value, dict):
+                    return value
+        index = html.find(name, index + len(name))
+    return None
+
+
+def extract_script_json(html, script_id):
+    """Return the JSON body of ``<script id="<script_id>">``."""
+    html = html or ''
+    index = html.find(script_id)
+    while index != -1:
+        tag_start = html.rfind('<', 0, index)
+        tag_end = html.find('>', index)
+        if tag_start != -1 and tag_end != -1 and html.startswith('<script', tag_start) and '>' not in html[tag_start:index]:
+            quote = html[index - 1]
+            closes = html[index + len(script_id):index + len(script_id) + 1] == quote
+            if quote in '"\'' and closes and html[tag_start:index - 1].rstrip().endswith('id='):
+                cursor = _skip_whitespace(html, tag_end + 1)
+                return _decode_until_script_end(html, cursor)
+        index = html.find(script_id, index + len(script_id))
+    return None
+
+
+def dig(value, *keys):
+    """Follow ``keys`` through nested dicts, returning None where the path breaks."""
+    for key in keys:
+        if not isinstance(value, dict):
+            return None
+        value = value.get(key)
+    return value
+
+
+def collect_dicts(root, predicate, *, limit=None, max_nodes=MAX_WALK_NODES):
+    """
+    Return the dicts under ``root`` for which ``predicate`` is true, in
+    depth-first pre-order, stopping at ``limit`` matches or ``max_nodes`` visits.
+    """
+    matches = []
+    stack = [root]
+    visited = 0
+    while stack and visited < max_nodes:
+        node = stack.pop()
+        visited += 1
+        if isinstance(node, dict):
+            if predicate(node):
+                matches.append(node)
+                if limit is not None and len(matches) >= limit:
+                    break
+            children = node.values()
+        elif isinstance(node, list):
+            children = node
+        else:
+            continue
+        stack.extend(child for child in reversed(list(children)) if isinstance(child, (dict, list)))
+    return matches
@@ -1,37 +1,95 @@
 import re
 import urllib.parse
 
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, Tag
 
-from core.services.browser import fetch_rendered_html
+from core.services.browser import RenderOptions, fetch_rendered_html
 
-from .base import BaseScraper
+from .base import TEXT_STRING_TYPES, BaseScraper, joined_text, result_region
+from .xpath import compile_xpath, first, node_text, parse_document
+
+
+# In-page extraction: returns compact candidate dicts instead of the full DOM.
+FLIPKART_EXTRACT_SCRIPT = r"""
+() => {
+  const clean = (text) => (text || '').replace(/\s+/g, ' ').trim();
+  let blocks = Array.from(document.querySelectorAll('div[data-id]'));
+  if (!blocks.length) {
+    blocks = Array.from(document.querySelectorAll('a[href*="/p/"]')).map((link) => link.parentElement.closest('div'));
+  }
+  return blocks.filter(Boolean).slice(0, 40).map((block, index) => {
+    const text = clean(block.textContent);
+    const titleElem = block.querySelector('div[class*="_4rR01T"], div[class*="s1Q9rs"], div[class*="IRpwTa"]');
+    const altImage = block.querySelector('img[alt]');
+    const priceElem = block.querySelector('div[class*="_30jeq3"]');
+    const priceMatch = text.match(/₹\s*[\d,]+/);
+    const link = block.querySelector('a[href*="/p/"]');
+    const image = block.querySelector('img[src]');
+    return {
+      title: clean(titleElem && titleElem.textContent) || (altImage ? altImage.getAttribute('alt') : ''),
+      price: priceElem ? clean(priceElem.textContent) : (priceMatch ? priceMatch[0] : ''),
+      href: link ? link.getAttribute('href') : '',
+      image: image ? image.getAttribute('src') : null,
+      sponsored: /sponsored/i.test(text),
+      rank: index + 1,
+    };
+  });
+}
+"""
+
+
+MAX_RESULTS = 40
+PRODUCT_BLOCK_PATTERN = re.compile(r'<div\b[^>]*?\sdata-id(?=[\s=/>])', re.I)
+TITLE_CLASS_PATTERN = re.compile(r'_4rR01T|s1Q9rs|IRpwTa')
+PRICE_CLASS_PATTERN = re.compile(r'_30jeq3')
+PRODUCT_HREF_PATTERN = re.compile(r'/p/')
+RUPEE_PRICE_PATTERN = re.compile(r'₹\s*([\d,]+)')
+SPONSORED_PATTERN = re.compile(r'sponsored', re.I)
+
+# Precompiled selectors for the lxml backend, mirroring the BeautifulSoup lookups.
+PRODUCT_BLOCKS_XPATH = compile_xpath('//div[@data-id]')
+PRODUCT_LINKS_XPATH = compile_xpath('//a[contains(@href, "/p/")]')
+PARENT_DIV_XPATH = compile_xpath('ancestor::div[1]')
+TITLE_XPATH = compile_xpath(f'(.//div[re:test(@class, "{TITLE_CLASS_PATTERN.pattern}")])[1]')
+IMAGE_ALT_XPATH = compile_xpath('(.//img[@alt])[1]')
+PRICE_XPATH = compile_xpath(f'(.//div[re:test(@class, "{PRICE_CLASS_PATTERN.pattern}")])[1]')
+PRODUCT_LINK_XPATH = compile_xpath('(.//a[contains(@href, "/p/")])[1]')
+IMAGE_SRC_XPATH = compile_xpath('(.//img[@src])[1]')
 
 
 class FlipkartScraper(BaseScraper):
     """Scraper for Flipkart."""
 
     website = 'Flipkart'
+    parser_backends = ('soup', 'lxml')
+    result_block_pattern = PRODUCT_BLOCK_PATTERN
+    max_results = MAX_RESULTS
+    render_options = RenderOptions(
+        source='Flipkart',
+        blocked_url_patterns=('/api/4/data/collector', '/fk-cp-zion/'),
+        ready_selector='div[data-id] a[href*="/p/"]',
+        extract_script=FLIPKART_EXTRACT_SCRIPT,
+    )
 
     def search(self, query):
         search_url = "https://www.flipkart.com/search"
         params = {'q': query}
-        response = self.get_page(search_url, params=params)
+        fetched = self.fetch_search_page(
+            search_url,
+            params=params,
+            render=fetch_rendered_html,
+            render_url=self.render_url(query),
+        )
+        response = fetched.response
         html = response.text if response else ''
         http_status = response.status_code if response else None
 
-        use_playwright = (
-            not html
-            or http_status in (403, 429, 503)
-            or self.looks_blocked(html, response.url if response else search_url)
-            or self.is_thin_html(html)
-        )
-
-        if use_playwright:
-            url = f"{search_url}?{urllib.parse.urlencode(params)}"
-            rendered = fetch_rendered_html(url)
-            if rendered and rendered.html:
+        rendered_items = None
+        if not fetched.http_usable:
+            rendered = fetched.rendered
+            if rendered and (rendered.html or rendered.items):
                 html = rendered.html
+                rendered_items = rendered.items
                 http_status = rendered.status or http_status
             elif http_status in (403, 429):
                 return self.build_attempt(
@@ -55,7 +113,14 @@ class FlipkartScraper(BaseScraper):
                     http_status=http_status,
                 )
 
-        candidates = self.parse_candidates(html)
+        if rendered_items:
+            candidates = self.candidates_from_items(
+                rendered_items,
+                canonicalize=self._canonicalize_url,
+                dedupe=True,
+            )
+        else:
+            candidates = self.parse_html(html)
         if not candidates:
             if self.looks_blocked(html):
                 return self.build_attempt(
@@ -79,52 +144,132 @@ class FlipkartScraper(BaseScraper):
             http_status=http_status,
         )
 
-    def parse_candidates(self, html):
-        soup = BeautifulSoup(html or '', 'html.parser')
+    def render_url(self, query):
+        return f"https://www.flipkart.com/search?{urllib.parse.urlencode({'q': query})}"
+
+    def parse_candidates_soup(self, html):
+        html = html or ''
+        region = result_region(html, PRODUCT_BLOCK_PATTERN, MAX_RESULTS)
+        soup = BeautifulSoup(region, 'html.parser')
         results = []
         seen_urls = set()
 
         product_blocks = soup.find_all('div', {'data-id': True})
         if not product_blocks:
-            product_blocks = [link.find_parent('div') for link in soup.find_all('a', href=re.compile(r'/p/'))]
+            if region is not html:
+                # The link-parent fallback needs the surrounding markup, so parse the whole page.
+                soup = BeautifulSoup(html, 'html.parser')
+            product_blocks = [link.find_parent('div') for link in soup.find_all('a', href=PRODUCT_HREF_PATTERN)]
 
         for rank, product in enumerate([block for block in product_blocks if block], start=1):
-            if rank > 40:
+            if rank > MAX_RESULTS:
                 break
 
-            title_elem = product.find('div', class_=re.compile(r'_4rR01T|s1Q9rs|IRpwTa'))
+            # One walk over the block collects every element and string the candidate needs.
+            title_elem = price_elem = alt_image = src_image = link = None
+            strings = []
+            for node in product.descendants:
+                if isinstance(node, Tag):
+                    name = node.name
+                    if name == 'div':
+                        class_text = ' '.join(node.get('class') or ())
+                        if title_elem is None and TITLE_CLASS_PATTERN.search(class_text):
+                            title_elem = node
+                        if price_elem is None and PRICE_CLASS_PATTERN.search(class_text):
+                            price_elem = node
+                    elif name == 'img':
+                        if alt_image is None and node.get('alt') is not None:
+                            alt_image = node
+                        if src_image is None and node.get('src') is not None:
+                            src_image = node
+                    elif name == 'a' and link is None and PRODUCT_HREF_PATTERN.search(node.get('href') or ''):
+                        link = node
+                elif type(node) in TEXT_STRING_TYPES:
+                    strings.append(node)
+
             title = self.clean_text(title_elem.get_text(" ", strip=True) if title_elem else '')
             if not title:
-                image = product.find('img', alt=True)
-                title = self.clean_text(image.get('alt', '') if image else '')
+                title = self.clean_text(alt_image.get('alt', '') if alt_image else '')
             if not title:
                 continue
 
-            price_elem = product.find('div', class_=re.compile(r'_30jeq3'))
+            product_text = joined_text(strings)
             price = self.parse_price(price_elem.get_text(strip=True)) if price_elem else None
             if not price:
-                price_match = re.search(r'₹\s*([\d,]+)', product.get_text(" ", strip=True))
+                price_match = RUPEE_PRICE_PATTERN.search(product_text)
+                price = self.parse_price(price_match.group(0)) if price_match else None
+            if not price:
+                continue
+
+            url = self._canonicalize_url(link.get('href', '') if link else '')
+            if not url or url in seen_urls:
+                continue
+            seen_urls.add(url)
+
+            candidate = self.build_candidate(
+                title=title,
+                price=price,
+                url=url,
+                image_url=src_image.get('src') if src_image else None,
+                rank=rank,
+                is_sponsored=bool(SPONSORED_PATTERN.search(product_text)),
+                raw_text=product_text,
+            )
+            if candidate:
+                results.append(candidate)
+
+        return results
+
+    def parse_candidates_lxml(self, html):
+        region = result_region(html, PRODUCT_BLOCK_PATTERN, MAX_RESULTS)
+        document = parse_document(region)
+        if document is None:
+            return []
+        results = []
+        seen_urls = set()
+
+        product_blocks = PRODUCT_BLOCKS_XPATH(document)
+        if not product_blocks:
+            if region is not html:
+                # The link-parent fallback needs the surrounding markup, so parse the whole page.
+                document = parse_document(html)
+            product_blocks = [first(PARENT_DIV_XPATH, link) for link in PRODUCT_LINKS_XPATH(document)]
+
+        for rank, product in enumerate([block for block in product_blocks if block is not None], start=1):
+            if rank > MAX_RESULTS:
+                break
+
+            title = self.clean_text(node_text(first(TITLE_XPATH, product), " "))
+            if not title:
+                image = first(IMAGE_ALT_XPATH, product)
+                title = self.clean_text(image.get('alt', '') if image is not None else '')
+            if not title:
+                continue
+
+            product_text = node_text(product, " ")
+            price_elem = first(PRICE_XPATH, product)
+            price = self.parse_price(node_text(price_elem)) if price_elem is not None else None
+            if not price:
+                price_match = RUPEE_PRICE_PATTERN.search(product_text)
                 price = self.parse_price(price_match.group(0)) if price_match else None
             if not price:
                 continue
 
-            link = product.find('a', href=re.compile(r'/p/'))
-            href = link.get('href', '') if link else ''
-            url = self._canonicalize_url(href)
+            link = first(PRODUCT_LINK_XPATH, product)
+            url = self._canonicalize_url(link.get('href', '') if link is not None else '')
             if not url or url in seen_urls:
                 continue
             seen_urls.add(url)
 
-            sponsored = bool(re.search(r'sponsored', product.get_text(" ", strip=True), re.I))
-            image = product.find('img', src=True)
+            image = first(IMAGE_SRC_XPATH, product)
             candidate = self.build_candidate(
                 title=title,
                 price=price,
                 url=url,
-                image_url=image.get('src') if image else None,
+                image_url=image.get('src') if image is not None else None,
                 rank=rank,
-                is_sponsored=sponsored,
-                raw_text=product.get_text(" ", strip=True),
+                is_sponsored=bool(SPONSORED_PATTERN.search(product_text)),
+                raw_text=product_text,
             )
             if candidate:
                 results.append(candidate)
@@ -1,30 +1,74 @@
 import json
 import urllib.parse
+from functools import partial
 
-from bs4 import BeautifulSoup
-
-from core.services.browser import fetch_rendered_html
+from core.services.browser import DEFAULT_BLOCKED_RESOURCE_TYPES, RenderOptions, fetch_rendered_html
 
 from .base import BaseScraper
+from .embedded import collect_dicts, extract_script_json
+
+
+# In-page extraction: returns compact candidate dicts instead of the full DOM.
+MEESHO_EXTRACT_SCRIPT = r"""
+() => {
+  const script = document.getElementById('__NEXT_DATA__');
+  if (!script) return [];
+  const products = [];
+  const collect = (node) => {
+    if (Array.isArray(node)) {
+      node.forEach(collect);
+    } else if (node && typeof node === 'object') {
+      const keys = Object.keys(node);
+      const hasPrice = ['price', 'discounted_price', 'sale_price', 'discountedPrice'].some((key) => key in node);
+      if (keys.includes('name') && keys.includes('slug') && hasPrice) {
+        products.push(node);
+      }
+      keys.forEach((key) => collect(node[key]));
+    }
+  };
+  collect(JSON.parse(script.textContent));
+  return products.slice(0, 40).map((product, index) => {
+    const slug = product.slug || product.product_slug;
+    return {
+      title: product.name || product.title,
+      price: product.price || product.discounted_price || product.sale_price || product.discountedPrice,
+      href: slug ? `https://www.meesho.com/${slug}/p/${product.id || product.catalog_id || ''}`.replace(/\/$/, '') : '',
+      image: product.image || product.image_url || product.imageUrl || null,
+      sponsored: false,
+      rank: index + 1,
+    };
+  });
+}
+"""
 
 
 class MeeshoScraper(BaseScraper):
     """Best-effort scraper for Meesho public search pages."""
 
     website = 'Meesho'
+    # Listing data ships in __NEXT_DATA__ with the server HTML, so scripts can go too.
+    render_options = RenderOptions(
+        source='Meesho',
+        blocked_resource_types=DEFAULT_BLOCKED_RESOURCE_TYPES | {'script'},
+        ready_script="document.getElementById('__NEXT_DATA__')",
+        extract_script=MEESHO_EXTRACT_SCRIPT,
+    )
 
     def search(self, query):
-        url = f"https://www.meesho.com/search?q={urllib.parse.quote_plus(query)}"
-        response = self.get_page(url)
+        url = self.render_url(query)
+        fetched = self.fetch_search_page(url, render=fetch_rendered_html, thin_check=False)
+        response = fetched.response
         html = response.text if response else ''
         http_status = response.status_code if response else None
 
-        rendered = fetch_rendered_html(url) if (not html or http_status in (403, 429, 503) or self.looks_blocked(html, response.url if response else url)) else None
-        if rendered and rendered.html:
+        rendered = fetched.rendered if not fetched.http_usable else None
+        rendered_items = None
+        if rendered and (rendered.html or rendered.items):
             html = rendered.html
+            rendered_items = rendered.items
             http_status = rendered.status or http_status
 
-        if not html or http_status in (403, 429) or self.looks_blocked(html):
+        if (not html and not rendered_items) or http_status in (403, 429) or self.looks_blocked(html):
             return self.build_attempt(
                 website=self.website,
                 state='unavailable',
@@ -32,7 +76,10 @@ class MeeshoScraper(BaseScraper):
                 http_status=http_status,
             )
 
-        candidates = self.parse_candidates(html)
+        if rendered_items:
+            candidates = self.candidates_from_items(rendered_items, dedupe=True)
+        else:
+            candidates = self.parse_html(html)
         if not candidates:
             return self.build_attempt(
                 website=self.website,
@@ -49,19 +96,16 @@ class MeeshoScraper(BaseScraper):
             http_status=http_status,
         )
 
-    def parse_candidates(self, html):
-        soup = BeautifulSoup(html or '', 'html.parser')
-        script = soup.find('script', id='__NEXT_DATA__')
-        if not script or not script.string:
-            return []
+    def render_url(self, query):
+        return f"https://www.meesho.com/search?q={urllib.parse.quote_plus(query)}"
 
-        try:
-            payload = json.loads(script.string)
-        except json.JSONDecodeError:
+    def parse_candidates_soup(self, html):
+        payload = extract_script_json(html, '__NEXT_DATA__')
+        if payload is None:
             return []
 
-        products = []
-        self._collect_product_dicts(payload, products)
+        # Only the first 40 products are ever ranked, so the walk stops there.
+        products = collect_dicts(payload, self._is_product_dict, limit=40)
         results = []
         seen_urls = set()
 
@@ -88,20 +132,15 @@ class MeeshoScraper(BaseScraper):
                 url=url,
                 image_url=image_url,
                 rank=rank,
-                raw_text=json.dumps(product, ensure_ascii=True),
+                raw_text=partial(json.dumps, product, ensure_ascii=True),
             )
             if candidate:
                 results.append(candidate)
 
         return results
 
-    def _collect_product_dicts(self, node, products):
-        if isinstance(node, dict):
-            keys = set(node.keys())
-            if {'name', 'slug'} <= keys and ({'price'} & keys or {'discounted_price', 'sale_price', 'discountedPrice'} & keys):
-                products.append(node)
-            for value in node.values():
-                self._collect_product_dicts(value, products)
-        elif isinstance(node, list):
-            for value in node:
-                self._collect_product_dicts(value, products)
+    def _is_product_dict(self, node):
+        keys = node.keys()
+        return 'name' in keys and 'slug' in keys and (
+            'price' in keys or 'discounted_price' in keys or 'sale_price' in keys or 'discountedPrice' in keys
+        )
@@ -1,34 +1,58 @@
 import json
-import re
 import urllib.parse
+from functools import partial
 
-from core.services.browser import fetch_rendered_html
+from core.services.browser import DEFAULT_BLOCKED_RESOURCE_TYPES, RenderOptions, fetch_rendered_html
 
 from .base import BaseScraper
+from .embedded import dig, extract_assigned_json
+
+
+# In-page extraction: returns compact candidate dicts instead of the full DOM.
+MYNTRA_EXTRACT_SCRIPT = r"""
+() => {
+  const state = window.__myx || {};
+  const products = (((state.searchData || {}).results || {}).products || []).slice(0, 40);
+  return products.map((product, index) => {
+    const image = (product.images || [])[0] || {};
+    return {
+      title: product.productName || product.product,
+      price: product.discountedPrice || product.price,
+      href: product.landingPageUrl,
+      image: image.src || image.imageURL || null,
+      sponsored: false,
+      rank: index + 1,
+    };
+  });
+}
+"""
 
 
 class MyntraScraper(BaseScraper):
     """Scraper for Myntra."""
 
     website = 'Myntra'
+    # Listing data is inlined as window.__myx in the server HTML, so scripts can go too.
+    render_options = RenderOptions(
+        source='Myntra',
+        blocked_resource_types=DEFAULT_BLOCKED_RESOURCE_TYPES | {'script'},
+        ready_script='window.__myx && window.__myx.searchData',
+        extract_script=MYNTRA_EXTRACT_SCRIPT,
+    )
 
     def search(self, query):
-        url = f"https://www.myntra.com/{urllib.parse.quote_plus(query)}"
-        response = self.get_page(url)
+        url = self.render_url(query)
+        fetched = self.fetch_search_page(url, render=fetch_rendered_html)
+        response = fetched.response
         html = response.text if response else ''
         http_status = response.status_code if response else None
 
-        use_playwright = (
-            not html
-            or http_status in (403, 429, 503)
-            or self.looks_blocked(html, response.url if response else url)
-            or self.is_thin_html(html)
-        )
-
-        if use_playwright:
-            rendered = fetch_rendered_html(url)
-            if rendered and rendered.html:
+        rendered_items = None
+        if not fetched.http_usable:
+            rendered = fetched.rendered
+            if rendered and (rendered.html or rendered.items):
                 html = rendered.html
+                rendered_items = rendered.items
                 http_status = rendered.status or http_status
             elif http_status in (403, 429):
                 return self.build_attempt(
@@ -52,7 +76,10 @@ class MyntraScraper(BaseScraper):
                     http_status=http_status,
                 )
 
-        candidates = self.parse_candidates(html)
+        if rendered_items:
+            candidates = self.candidates_from_items(rendered_items, canonicalize=self._canonicalize_url)
+        else:
+            candidates = self.parse_html(html)
         if not candidates:
             if self.looks_blocked(html):
                 return self.build_attempt(
@@ -76,12 +103,15 @@ class MyntraScraper(BaseScraper):
             http_status=http_status,
         )
 
-    def parse_candidates(self, html):
+    def render_url(self, query):
+        return f"https://www.myntra.com/{urllib.parse.quote_plus(query)}"
+
+    def parse_candidates_soup(self, html):
         payload = self._extract_myntra_payload(html or '')
         if not payload:
             return []
 
-        products = payload.get('searchData', {}).get('results', {}).get('products', [])
+        products = dig(payload, 'searchData', 'results', 'products') or []
         results = []
         for rank, product in enumerate(products, start=1):
             if rank > 40:
@@ -99,7 +129,7 @@ class MyntraScraper(BaseScraper):
                 url=self._canonicalize_url(product.get('landingPageUrl')),
                 image_url=image_url,
                 rank=rank,
-                raw_text=json.dumps(product, ensure_ascii=True),
+                raw_text=partial(json.dumps, product, ensure_ascii=True),
             )
             if candidate:
                 results.append(candidate)
@@ -107,13 +137,7 @@ class MyntraScraper(BaseScraper):
         return results
 
     def _extract_myntra_payload(self, html):
-        match = re.search(r'window\.__myx\s*=\s*(\{.*?\})\s*;?\s*</script>', html, re.S)
-        if not match:
-            return None
-        try:
-            return json.loads(match.group(1))
-        except json.JSONDecodeError:
-            return None
+        return extract_assigned_json(html, 'window.__myx')
 
     def _canonicalize_url(self, path):
         if not path:
@@ -0,0 +1,92 @@
+"""
+Offline scrapers for the ``check_prices --benchmark`` mode.
+
+Notes:
+- ``SimulatedScraper`` stands in for a live source. It sleeps for a simulated
+  fetch latency, then fails at the configured rates: it raises like a dropped
+  connection, or answers with a block page. Otherwise it returns a search page
+  built from the query: the listing itself in another colour, a variant
+  sibling, an accessory and a refurbished unit, at prices that agree across
+  sources.
+- Every outcome is drawn from a generator seeded with the run seed, the source
+  and the query, so runs are reproducible even when sources are searched on
+  worker threads.
+"""
+
+import random
+import time
+import zlib
+from dataclasses import dataclass
+from functools import partial
+
+from .base import Candidate, ScrapeAttempt
+
+
+SIMULATED_COLOURS = ['Black', 'Silver', 'Blue', 'Titanium Grey', 'Midnight']
+SIMULATED_ACCESSORIES = ['Back Cover', 'Tempered Glass', 'Charger Cable', 'Silicone Case']
+# Share of searches where the exact listing is missing from the page.
+SIMULATED_MISSING_RATE = 0.1
+
+
+@dataclass(frozen=True)
+class SimulatedSource:
+    website: str
+    latency: float = 0.0
+    error_rate: float = 0.0
+    blocked_rate: float = 0.0
+
+
+class SimulatedScraper:
+    def __init__(self, source, *, seed=0):
+        self.source = source
+        self.website = source.website
+        self.seed = seed
+
+    def search(self, query):
+        rng = random.Random(f'{self.seed}:{self.website}:{query}')
+        if self.source.latency:
+            time.sleep(self.source.latency * rng.uniform(0.5, 1.5))
+
+        roll = rng.random()
+        if roll < self.source.error_rate:
+            raise ConnectionError(f'Simulated connection reset by {self.website}.')
+        if roll < self.source.error_rate + self.source.blocked_rate:
+            return ScrapeAttempt(
+                website=self.website,
+                state='blocked',
+                diagnostic_message=f'{self.website} returned simulated bot-protection content.',
+                http_status=403,
+            )
+
+        # The base price depends only on the query, so sources agree within a few percent.
+        price = (30000 + zlib.crc32(query.encode('utf-8')) % 120000) * rng.uniform(0.95, 1.05)
+        colour = rng.choice(SIMULATED_COLOURS)
+        listings = [
+            (f'{query} Pro ({colour})', price * 1.3),
+            (f'{rng.choice(SIMULATED_ACCESSORIES)} for {query} {colour}', price * 0.02),
+            (f'{query} {colour} (Renewed)', price * 0.7),
+        ]
+        if rng.random() >= SIMULATED_MISSING_RATE:
+            listings.insert(rng.randrange(len(listings) + 1), (f'{query} ({colour})', price))
+
+        slug = self.website.lower()
+        return ScrapeAttempt(
+            website=self.website,
+            state='matched',
+            candidates=[
+                Candidate(
+                    title=title,
+                    price=round(listing_price, 2),
+                    url=f'https://example.com/{slug}/{zlib.crc32(title.encode("utf-8")):08x}',
+                    rank=rank,
+                )
+                for rank, (title, listing_price) in enumerate(listings, start=1)
+            ],
+            diagnostic_message=f'Parsed {len(listings)} simulated {self.website} candidates.',
+            http_status=200,
+        )
+
+
+def simulated_scraper_classes(sources, *, seed=0):
+    """Return ``SCRAPER_CLASSES``-style factories, one ``SimulatedScraper`` per ``SimulatedSource``."""
+    return [partial(SimulatedScraper, source, seed=seed) for source in sources]
@@ -0,0 +1,75 @@
+"""
+Helpers for the lxml parsing backend.
+
+The lxml parsers must return exactly what the BeautifulSoup parsers return, so
+the text helpers follow ``Tag.get_text(..., strip=True)``: comment, script,
+style and template strings are left out and each string is stripped before
+joining.
+"""
+
+from lxml import etree
+from lxml import html as lxml_html
+
+
+XPATH_NAMESPACES = {'re': 'http://exslt.org/regular-expressions'}
+
+_NON_TEXT_TAGS = frozenset({'script', 'style', 'template'})
+_HTML_PARSER = lxml_html.HTMLParser(encoding='utf-8')
+
+
+def compile_xpath(expression):
+    return etree.XPath(expression, namespaces=XPATH_NAMESPACES)
+
+
+def has_class(name):
+    """XPath predicate body matching one class token, like CSS ``.name``."""
+    return f'contains(concat(" ", normalize-space(@class), " "), " {name} ")'
+
+
+def parse_document(html):
+    """Parse ``html`` into an lxml tree, or return None for an empty page."""
+    if not html or not html.strip():
+        return None
+    try:
+        return lxml_html.document_fromstring(html.encode('utf-8', 'replace'), parser=_HTML_PARSER)
+    except (etree.ParserError, ValueError):
+        return None
+
+
+def first(xpath, node):
+    matches = xpath(node)
+    return matches[0] if matches else None
+
+
+def _iter_strings(root):
+    stack = [root]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            yield item
+            continue
+        if not isinstance(item.tag, str) or item.tag in _NON_TEXT_TAGS:
+            continue
+        if item.text:
+            yield item.text
+        for child in reversed(item):
+            if child.tail:
+                stack.append(child.tail)
+            stack.append(child)
+
+
+def node_text(node, separator=''):
+    """Equivalent of BeautifulSoup's ``get_text(separator, strip=True)``."""
+    if node is None:
+        return ''
+    return separator.join(text for text in (string.strip() for string in _iter_strings(node)) if text)
+
+
+def has_string(node, pattern):
+    """Equivalent of ``bool(tag.find(string=pattern))``: any string below ``node``, comments included."""
+    for element in node.iter():
+        if element.text and pattern.search(element.text):
+            return True
+        if element is not node and element.tail and pattern.search(element.tail):
+            return True
+    return False
@@ -1,5 +1,8 @@
 import smtplib
 import statistics
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
 from decimal import Decimal
 
 from django.conf import settings
@@ -9,7 +12,10 @@ from django.utils import timezone
 
 from core.constants import WEBSITE_ORDER
 from core.models import PriceAlert, PriceHistory, PriceResult, SourceStatus
-from core.services.matcher import MatchDecision, evaluate_scrape_candidates
+from core.services import circuit
+from core.services.browser_async import RenderRequest, render_urls
+from core.services.fetch_strategy import HTTP, get_fetch_strategy
+from core.services.matcher import MatchDecision, evaluate_candidate_batches, get_profile_cache
 from core.services.scraper.ajio import AjioScraper
 from core.services.scraper.amazon import AmazonScraper
 from core.services.scraper.base import ScrapeAttempt
@@ -36,6 +42,16 @@ MIN_PRICE_MAP = {
 }
 
 
+_source_executor = None
+_source_executor_lock = threading.Lock()
+_stuck_searches = set()
+_stuck_searches_lock = threading.Lock()
+
+TRACKER_STAGES = ('fetch', 'match', 'sanity', 'persist')
+_stage_stats = {}
+_stage_stats_lock = threading.Lock()
+
+
 def _format_mail_error(error):
     """Convert low-level SMTP exceptions into user-friendly text."""
     if isinstance(error, smtplib.SMTPAuthenticationError):
@@ -69,6 +85,200 @@ def _error_attempt(website, error):
     )
 
 
+def _timeout_attempt(website, timeout_seconds, *, queued=False):
+    if queued:
+        message = f'{website} did not start within {timeout_seconds} seconds because every search worker was busy.'
+    else:
+        message = f'{website} did not respond within {timeout_seconds} seconds.'
+    return ScrapeAttempt(
+        website=website,
+        state='unavailable',
+        diagnostic_message=message,
+        http_status=None,
+    )
+
+
+def _record_stages(timings):
+    with _stage_stats_lock:
+        for stage, seconds in timings.items():
+            stats = _stage_stats.setdefault(stage, {'products': 0, 'seconds': 0.0})
+            stats['products'] += 1
+            stats['seconds'] += seconds
+
+
+def stage_stats():
+    """Per tracker stage (fetch, match, sanity, persist): products tracked and total seconds spent."""
+    with _stage_stats_lock:
+        return {stage: dict(_stage_stats[stage]) for stage in TRACKER_STAGES if stage in _stage_stats}
+
+
+def reset_stage_stats():
+    with _stage_stats_lock:
+        _stage_stats.clear()
+
+
+def _get_source_executor():
+    """Return the process-wide worker pool shared by all concurrent searches."""
+    global _source_executor
+    with _source_executor_lock:
+        if _source_executor is None:
+            _source_executor = ThreadPoolExecutor(
+                max_workers=max(1, settings.TRACKER_MAX_WORKERS),
+                thread_name_prefix='source-search',
+            )
+        return _source_executor
+
+
+def _website_for(scraper):
+    return getattr(scraper, 'website', scraper.__class__.__name__.replace('Scraper', ''))
+
+
+def _run_search(scraper, website, query):
+    try:
+        return scraper.search(query)
+    except Exception as error:
+        print(f"[X] {website} - Error: {error}")
+        return _error_attempt(website, error)
+
+
+def _search_sequentially(scrapers, query):
+    return [_run_search(scraper, website, query) for website, scraper in scrapers]
+
+
+def _release_stuck_search(future):
+    with _stuck_searches_lock:
+        _stuck_searches.discard(future)
+
+
+def stuck_search_count():
+    """Searches abandoned at their deadline that are still running, each holding a pool worker."""
+    with _stuck_searches_lock:
+        return len(_stuck_searches)
+
+
+def _search_concurrently(scrapers, query, *, timeout_seconds):
+    """
+    Run every source search on the shared worker pool under one deadline.
+
+    Every source has to finish within ``timeout_seconds`` of this call, time
+    spent queued behind a busy pool included. At the deadline, searches still
+    queued are cancelled and running ones are left to finish in the background,
+    because Python threads cannot be killed; both are reported as unavailable.
+    Abandoned searches are counted by ``stuck_search_count()`` until they
+    return.
+    """
+    executor = _get_source_executor()
+    futures = {
+        executor.submit(_run_search, scraper, website, query): index
+        for index, (website, scraper) in enumerate(scrapers)
+    }
+    done, _not_done = wait(futures, timeout=timeout_seconds)
+
+    attempts = [None] * len(scrapers)
+    for future, index in futures.items():
+        website = scrapers[index][0]
+        if future in done or future.done():
+            attempts[index] = future.result()
+        elif future.cancel():
+            print(f"[X] {website} - Not started within {timeout_seconds}s, every search worker was busy")
+            attempts[index] = _timeout_attempt(website, timeout_seconds, queued=True)
+        else:
+            with _stuck_searches_lock:
+                _stuck_searches.add(future)
+            future.add_done_callback(_release_stuck_search)
+            print(
+                f"[X] {website} - Timed out after {timeout_seconds}s; "
+                f"{stuck_search_count()} abandoned searches still hold search workers"
+            )
+            attempts[index] = _timeout_attempt(website, timeout_seconds)
+
+    return attempts
+
+
+def _collect_attempts(query, *, concurrent, scraper_classes=None):
+    """
+    Search every source whose circuit allows it and return ``[(website, attempt)]``
+    in ``SCRAPER_CLASSES`` order. Sources with an open circuit are not searched
+    at all and report a fast-fail attempt instead.
+    """
+    scrapers = []
+    skipped = {}
+    for scraper_class in scraper_classes or SCRAPER_CLASSES:
+        scraper = scraper_class()
+        website = _website_for(scraper)
+        scrapers.append((website, scraper))
+        if not circuit.allow(website):
+            skipped[website] = circuit.open_circuit_attempt(website)
+
+    active = [(website, scraper) for website, scraper in scrapers if website not in skipped]
+    if concurrent and len(active) > 1:
+        attempts = _search_concurrently(
+            active,
+            query,
+            timeout_seconds=settings.TRACKER_SOURCE_TIMEOUT_SECONDS,
+        )
+    else:
+        attempts = _search_sequentially(active, query)
+
+    searched = {}
+    for (website, _scraper), attempt in zip(active, attempts):
+        circuit.record(website, attempt)
+        searched[website] = attempt
+    return [(website, skipped.get(website) or searched[website]) for website, _scraper in scrapers]
+
+
+def prerender_products(products):
+    """
+    Render the search pages of every product in one async batch.
+
+    Only sources listed in ``PLAYWRIGHT_PRERENDER_SOURCES`` (the ones that
+    usually need a browser) are rendered. Sources whose circuit is open, or
+    whose learned fetch strategy is plain HTTP, are skipped: their searches
+    would never use the rendered page. The pages are primed into
+    ``fetch_rendered_html``, so the per-product searches that follow pick them
+    up instead of rendering one page at a time.
+    """
+    strategy = get_fetch_strategy()
+    requests = []
+    for scraper_class in SCRAPER_CLASSES:
+        scraper = scraper_class()
+        website = _website_for(scraper)
+        if website not in settings.PLAYWRIGHT_PRERENDER_SOURCES:
+            continue
+        if not circuit.allow(website):
+            print(f"Skipping prerender for {website}: circuit is open.")
+            continue
+        if strategy.learned(website) == HTTP:
+            print(f"Skipping prerender for {website}: plain HTTP is working.")
+            continue
+        for product in products:
+            url = scraper.render_url(product.search_query)
+            if url:
+                requests.append(RenderRequest(url=url, options=scraper.render_options))
+
+    rendered = render_urls(requests)
+    return sum(1 for result in rendered.values() if result is not None)
+
+
+def warm_profile_cache():
+    """
+    Pre-build matcher profiles for the most recently stored listing titles.
+
+    Accepted titles from ``PriceResult`` and ``SourceStatus`` are the ones most
+    likely to come back on the next run, so loading them up front turns most
+    of the first cycle's profile builds into cache hits.
+    """
+    cache = get_profile_cache()
+    if not cache.maxsize:
+        return 0
+
+    titles = PriceResult.objects.exclude(title='').order_by('-scraped_at').values_list('title', flat=True)
+    matched_titles = (
+        SourceStatus.objects.exclude(matched_title='').order_by('-checked_at').values_list('matched_title', flat=True)
+    )
+    return cache.warm(dict.fromkeys([*titles[:cache.maxsize], *matched_titles[:cache.maxsize]]))
+
+
 def _apply_price_sanity(source_records, *, min_safe_price):
     matched_records = [
         record for record in source_records
@@ -111,38 +321,49 @@ def _apply_price_sanity(source_records, *, min_safe_price):
     return source_records
 
 
-def _decision_from_attempt(query, attempt):
-    if attempt.state != 'matched' or not attempt.candidates:
-        return MatchDecision(
+def _match_attempts(query, attempts):
+    """Return a ``MatchDecision`` per attempt, matching every source's candidates in one batch."""
+    batch = evaluate_candidate_batches(query, {
+        website: attempt.candidates
+        for website, attempt in attempts
+        if attempt.state == 'matched' and attempt.candidates
+    })
+    return [
+        batch.get(website) or MatchDecision(
             state=attempt.state,
             diagnostic_message=attempt.diagnostic_message,
             candidate_count=len(attempt.candidates),
         )
-    return evaluate_scrape_candidates(query, attempt.candidates)
+        for website, attempt in attempts
+    ]
 
 
-def track_prices_for_product(product):
+def track_prices_for_product(product, *, concurrent=None, scraper_classes=None):
     """
     Evaluate all configured sources, persist their last-known states,
     save only confident accepted prices, and trigger alerts for accepted matches.
+
+    With ``concurrent`` (defaults to ``TRACKER_CONCURRENT_SOURCES``) all sources
+    are searched in parallel and matching starts once every source has finished
+    or timed out. ``scraper_classes`` replaces ``SCRAPER_CLASSES`` for this call
+    (the benchmark passes simulated sources). Time spent per stage is added to
+    ``stage_stats()``.
     """
     query = product.search_query
     min_safe_price = _minimum_safe_price(query)
     source_records = []
 
-    print(f"\n=== Tracking prices for: {product.name} ===")
+    if concurrent is None:
+        concurrent = settings.TRACKER_CONCURRENT_SOURCES
 
-    for scraper_class in SCRAPER_CLASSES:
-        scraper = scraper_class()
-        website = getattr(scraper, 'website', scraper.__class__.__name__.replace('Scraper', ''))
+    print(f"\n=== Tracking prices for: {product.name} ===")
 
-        try:
-            attempt = scraper.search(query)
-        except Exception as error:
-            print(f"[X] {website} - Error: {error}")
-            attempt = _error_attempt(website, error)
+    started = time.perf_counter()
+    attempts = _collect_attempts(query, concurrent=concurrent, scraper_classes=scraper_classes)
+    timings = {'fetch': time.perf_counter() - started}
 
-        decision = _decision_from_attempt(query, attempt)
+    started = time.perf_counter()
+    for (website, attempt), decision in zip(attempts, _match_attempts(query, attempts)):
         accepted_candidate = decision.accepted_candidate if decision.state == 'matched' else None
         diagnostic_message = decision.diagnostic_message or attempt.diagnostic_message
 
@@ -161,8 +382,13 @@ def track_prices_for_product(product):
             'match_confidence': decision.confidence,
         })
 
+    timings['match'] = time.perf_counter() - started
+
+    started = time.perf_counter()
     source_records = _apply_price_sanity(source_records, min_safe_price=min_safe_price)
+    timings['sanity'] = time.perf_counter() - started
 
+    started = time.perf_counter()
     accepted_results = []
     now = timezone.now()
 
@@ -224,6 +450,9 @@ def track_prices_for_product(product):
             else:
                 PriceResult.objects.filter(product=product, website=website).delete()
 
+    timings['persist'] = time.perf_counter() - started
+    _record_stages(timings)
+
     source_statuses = [
         {
             'website': record['website'],
@@ -0,0 +1,313 @@
+import asyncio
+import sys
+import threading
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from django.test import SimpleTestCase
+
+from core.services.browser import (
+    BrowserFetchResult,
+    BrowserPool,
+    FetchStats,
+    RenderOptions,
+    TYPICAL_RESOURCE_BYTES,
+    _install_request_filter,
+    _wait_until_ready,
+    estimate_saved_bytes,
+    fetch_rendered_html,
+    prime_rendered,
+)
+from core.services.browser_async import AsyncRenderEngine, RenderRequest
+from core.services.scraper.amazon import AmazonScraper
+from core.services.scraper.myntra import MyntraScraper
+
+
+class FakeBrowser:
+    def __init__(self):
+        self.connected = True
+        self.closed = False
+
+    def is_connected(self):
+        return self.connected
+
+    def close(self):
+        self.closed = True
+
+
+class FakePlaywright:
+    def __init__(self):
+        self.browsers = []
+        self.chromium = SimpleNamespace(launch=self._launch)
+
+    def _launch(self, **kwargs):
+        browser = FakeBrowser()
+        self.browsers.append(browser)
+        return browser
+
+    def stop(self):
+        pass
+
+
+def fake_sync_api(playwright):
+    return SimpleNamespace(sync_playwright=lambda: SimpleNamespace(start=lambda: playwright))
+
+
+class BrowserPoolTests(SimpleTestCase):
+    def setUp(self):
+        self.playwright = FakePlaywright()
+        modules = patch.dict(sys.modules, {'playwright.sync_api': fake_sync_api(self.playwright)})
+        modules.start()
+        self.addCleanup(modules.stop)
+
+    def _render_ok(self, browser, url, **kwargs):
+        return BrowserFetchResult(url=url, html='<html></html>', status=200)
+
+    def test_pool_reuses_browser_and_recycles_after_page_budget(self):
+        pool = BrowserPool(size=1, max_pages_per_browser=2)
+        self.addCleanup(pool.shutdown)
+
+        with patch('core.services.browser._render_page', side_effect=self._render_ok):
+            results = [pool.render(f'https://example.com/{index}') for index in range(5)]
+
+        self.assertTrue(all(result and result.status == 200 for result in results))
+        stats = pool.stats()
+        self.assertEqual(stats['pages_rendered'], 5)
+        self.assertEqual(stats['launches'], 3)
+        self.assertEqual(stats['recycles'], 2)
+        self.assertTrue(self.playwright.browsers[0].closed)
+
+    def test_pool_relaunches_after_browser_crash(self):
+        pool = BrowserPool(size=1, max_pages_per_browser=50)
+        self.addCleanup(pool.shutdown)
+
+        def crash_first(browser, url, **kwargs):
+            if browser is self.playwright.browsers[0]:
+                browser.connected = False
+                raise RuntimeError('Target closed')
+            return self._render_ok(browser, url)
+
+        with patch('core.services.browser._render_page', side_effect=crash_first):
+            first = pool.render('https://example.com/a')
+            second = pool.render('https://example.com/b')
+
+        self.assertIsNone(first)
+        self.assertEqual(second.url, 'https://example.com/b')
+        stats = pool.stats()
+        self.assertEqual(stats['crashes'], 1)
+        self.assertEqual(stats['launches'], 2)
+        self.assertEqual(stats['failures'], 1)
+
+
+    @patch('core.services.browser.RENDER_RESULT_MARGIN_MS', 0)
+    def test_render_gives_up_on_a_wedged_browser_and_cancels_queued_jobs(self):
+        pool = BrowserPool(size=1, max_pages_per_browser=50)
+        release = threading.Event()
+
+        def wedged(browser, url, **kwargs):
+            release.wait(5)
+            return self._render_ok(browser, url)
+
+        options = RenderOptions(ready_timeout_ms=0)
+        with patch('core.services.browser._render_page', side_effect=wedged):
+            first = pool.render('https://example.com/a', timeout_ms=200, options=options)
+            queued = pool.render('https://example.com/b', timeout_ms=200, options=options)
+            release.set()
+            pool.shutdown()
+
+        self.assertIsNone(first)
+        self.assertIsNone(queued)
+        stats = pool.stats()
+        self.assertEqual(stats['timeouts'], 2)
+        self.assertEqual(stats['pages_rendered'], 1)
+
+class FakeRoute:
+    def __init__(self, resource_type, url):
+        self.request = SimpleNamespace(resource_type=resource_type, url=url)
+        self.outcome = None
+
+    def abort(self):
+        self.outcome = 'aborted'
+
+    def continue_(self):
+        self.outcome = 'continued'
+
+
+class FakeContext:
+    def route(self, pattern, handler):
+        self.route_handler = handler
+
+
+class FakePage:
+    def __init__(self):
+        self.handlers = {}
+
+    def on(self, event, handler):
+        self.handlers[event] = handler
+
+
+def finished_request(resource_type, body, headers=200):
+    return SimpleNamespace(
+        resource_type=resource_type,
+        sizes=lambda: {'responseBodySize': body, 'responseHeadersSize': headers},
+    )
+
+
+@patch('core.services.browser._resource_sizes', new_callable=dict)
+class LeanRenderingTests(SimpleTestCase):
+    def _filter(self, options):
+        context, page, stats = FakeContext(), FakePage(), FetchStats()
+        _install_request_filter(context, page, options, stats)
+        return context, page, stats
+
+    def test_lean_mode_blocks_heavy_resources_and_site_trackers(self, _sizes):
+        context, page, stats = self._filter(AmazonScraper.render_options)
+        routes = [
+            FakeRoute('document', 'https://www.amazon.in/s?k=iphone'),
+            FakeRoute('image', 'https://m.media-amazon.com/images/I/phone.jpg'),
+            FakeRoute('font', 'https://m.media-amazon.com/fonts/ember.woff2'),
+            FakeRoute('script', 'https://aax-eu.amazon-adsystem.com/e/dtb/bid'),
+            FakeRoute('script', 'https://m.media-amazon.com/js/search.js'),
+        ]
+        for route in routes:
+            context.route_handler(route)
+        # Chunked/compressed responses have no content-length; the transfer size still counts.
+        page.handlers['requestfinished'](finished_request('document', 1848))
+
+        self.assertEqual([route.outcome for route in routes], ['continued', 'aborted', 'aborted', 'aborted', 'continued'])
+        self.assertEqual(stats.requests_blocked, 3)
+        self.assertEqual(stats.requests_allowed, 2)
+        self.assertEqual(stats.blocked_by_type, {'image': 1, 'font': 1, 'script': 1})
+        self.assertEqual(stats.bytes_received, 2048)
+
+    def test_embedded_state_sources_also_block_scripts(self, _sizes):
+        context, _page, stats = self._filter(MyntraScraper.render_options)
+        route = FakeRoute('script', 'https://constant.myntassets.com/web/app.js')
+        context.route_handler(route)
+
+        self.assertEqual(route.outcome, 'aborted')
+        self.assertEqual(stats.requests_blocked, 1)
+
+    def test_saved_bytes_are_estimated_from_downloads_of_the_same_type(self, _sizes):
+        _context, page, _stats = self._filter(RenderOptions(lean=False))
+        blocked = {'image': 2, 'script': 1}
+
+        self.assertEqual(
+            estimate_saved_bytes(blocked),
+            2 * TYPICAL_RESOURCE_BYTES['image'] + TYPICAL_RESOURCE_BYTES['script'],
+        )
+
+        page.handlers['requestfinished'](finished_request('image', 9800))
+        page.handlers['requestfinished'](finished_request('image', 19800))
+        page.handlers['requestfinished'](finished_request('script', -1, headers=-1))
+
+        self.assertEqual(estimate_saved_bytes(blocked), 2 * 15000 + 0)
+
+
+class ReadinessPage:
+    def __init__(self, ready=True):
+        self.ready = ready
+        self.calls = []
+
+    def wait_for_function(self, expression, timeout):
+        self.calls.append(('function', expression, timeout))
+        if not self.ready:
+            raise TimeoutError('Timeout 8000ms exceeded.')
+
+    def wait_for_timeout(self, timeout):
+        self.calls.append(('timeout', timeout))
+
+
+class ReadinessTests(SimpleTestCase):
+    def test_selector_and_script_conditions_are_combined(self):
+        options = RenderOptions(ready_selector='div[data-id]', ready_min_count=3, ready_script='window.__myx')
+
+        self.assertEqual(
+            options.ready_expression(),
+            '() => (document.querySelectorAll("div[data-id]").length >= 3) && (!!(window.__myx))',
+        )
+
+    def test_scraper_condition_replaces_fixed_wait(self):
+        page, stats = ReadinessPage(), FetchStats()
+
+        _wait_until_ready(page, AmazonScraper.render_options, stats)
+
+        self.assertEqual(page.calls[0][0], 'function')
+        self.assertEqual(page.calls[0][2], AmazonScraper.render_options.ready_timeout_ms)
+        self.assertTrue(stats.ready)
+
+    def test_deadline_is_recorded_as_not_ready(self):
+        page, stats = ReadinessPage(ready=False), FetchStats()
+
+        _wait_until_ready(page, MyntraScraper.render_options, stats)
+
+        self.assertIs(stats.ready, False)
+
+    def test_sources_without_condition_keep_legacy_wait(self):
+        page, stats = ReadinessPage(), FetchStats()
+
+        _wait_until_ready(page, RenderOptions(), stats)
+
+        self.assertEqual(page.calls, [('timeout', 1200)])
+        self.assertIsNone(stats.ready)
+
+
+class FakeAsyncBrowser:
+    def is_connected(self):
+        return True
+
+    async def close(self):
+        pass
+
+
+class FakeAsyncPlaywright:
+    def __init__(self):
+        self.launches = 0
+        self.chromium = SimpleNamespace(launch=self._launch)
+
+    async def _launch(self, **kwargs):
+        self.launches += 1
+        return FakeAsyncBrowser()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+
+class AsyncRenderEngineTests(SimpleTestCase):
+    def test_batch_shares_one_browser_and_respects_site_cap(self):
+        playwright = FakeAsyncPlaywright()
+        in_flight = {}
+        peak = {}
+
+        async def fake_render(browser, request):
+            host = request.url.split('/')[2]
+            in_flight[host] = in_flight.get(host, 0) + 1
+            peak[host] = max(peak.get(host, 0), in_flight[host])
+            await asyncio.sleep(0.01)
+            in_flight[host] -= 1
+            return BrowserFetchResult(url=request.url, html='<html></html>', status=200)
+
+        requests = [RenderRequest(url=f'https://www.amazon.in/s?k={index}') for index in range(6)]
+        requests += [RenderRequest(url=f'https://www.flipkart.com/search?q={index}') for index in range(6)]
+        engine = AsyncRenderEngine(max_pages=8, per_site_limit=2)
+
+        with patch.dict(sys.modules, {'playwright.async_api': SimpleNamespace(async_playwright=lambda: playwright)}), \
+                patch('core.services.browser_async._render_page_async', side_effect=fake_render):
+            results = asyncio.run(engine.render_many(requests))
+
+        self.assertEqual([result.url for result in results], [request.url for request in requests])
+        self.assertEqual(playwright.launches, 1)
+        self.assertEqual(peak, {'www.amazon.in': 2, 'www.flipkart.com': 2})
+
+    def test_primed_pages_are_served_once_by_fetch_rendered_html(self):
+        url = 'https://www.amazon.in/s?k=primed'
+        page = BrowserFetchResult(url=url, html='<html></html>', status=200)
+        prime_rendered({url: page})
+
+        self.assertIs(fetch_rendered_html(url), page)
+        with patch('core.services.browser.get_browser_pool') as get_pool:
+            get_pool.return_value.render.return_value = None
+            self.assertIsNone(fetch_rendered_html(url))
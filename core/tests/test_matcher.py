@@ -1,7 +1,24 @@
-from django.test import SimpleTestCase
+import difflib
+from dataclasses import FrozenInstanceError
+from unittest import skipIf
+from unittest.mock import patch
 
-from core.services.matcher import build_query_profile, evaluate_scrape_candidates
+from django.test import SimpleTestCase, override_settings
+
+from core.services import matcher
+from core.services.matcher import (
+    ProfileCache,
+    _normalize_text,
+    build_candidate_profile,
+    build_query_profile,
+    calculate_match_score,
+    evaluate_candidate,
+    evaluate_candidate_batches,
+    evaluate_scrape_candidates,
+)
+from core.services.phrases import PhraseAutomaton
 from core.services.scraper.base import Candidate
+from core.services.similarity import lcs_length, lcs_ratio, ratio, ratio_at_least
 
 
 class MatcherTests(SimpleTestCase):
@@ -16,6 +33,12 @@ class MatcherTests(SimpleTestCase):
         self.assertIn('silver', profile.soft_variant_tokens)
         self.assertNotIn('silver', profile.core_tokens)
 
+    def test_normalization_joins_units_and_generations_like_the_chained_rules(self):
+        self.assertEqual(_normalize_text('Galaxy Tab (Gen 5, 12.4" 256 GB)'), 'galaxy tab gen5 12.4inch 256gb')
+        self.assertEqual(_normalize_text('Pencil  Gen 2 & USB-C'), 'pencil gen2 and usb c')
+        self.assertEqual(_normalize_text('gen 5 gb'), 'gen 5gb')
+        self.assertEqual(_normalize_text('gen 1.5 gb'), 'gen1.5gb')
+
     def test_accessory_candidate_is_rejected(self):
         decision = evaluate_scrape_candidates(
             'iPhone 17',
@@ -286,3 +309,150 @@ class MatcherTests(SimpleTestCase):
             ],
         )
         self.assertEqual(decision.state, 'matched')
+
+    def test_profile_cache_counts_hits_and_evicts_least_recently_used(self):
+        cache = ProfileCache(2)
+
+        first = cache.get('Apple iPhone 17 256GB Black')
+        self.assertIs(cache.get('Apple iPhone 17 256GB Black'), first)
+        cache.get('Apple iPhone 17 Pro 256GB Silver')
+        cache.get('Apple iPhone 17 256GB Black')
+        cache.get('Apple iPhone 17 Pro Max 512GB Blue')
+
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 3)
+        self.assertEqual(cache.stats()['size'], 2)
+        cache.get('Apple iPhone 17 Pro 256GB Silver')
+        self.assertEqual(cache.stats()['misses'], 4)
+
+        self.assertEqual(first.technical_variant_tokens, frozenset({'256gb'}))
+        with self.assertRaises(FrozenInstanceError):
+            first.title = 'changed'
+
+    def test_similarity_ratio_matches_difflib(self):
+        pairs = [
+            ('inspiron', 'inspirion'),
+            ('refrigerator', 'refridgerator'),
+            ('abcabcab', 'bcabacba'),
+            ('pavilion', 'thinkpad'),
+            ('', 'laptop'),
+            ('a b ' * 60, 'b a ' * 55),
+            ('abab', 'xbabax' * 30),
+            ('apple iphone 17 256gb', ('apple iphone 17 (blue, 256 gb) | latest model with fast charging, dual sim ' * 2)[:150]),
+            ('apple iphone 17 256gb', ('apple iphone 17 (blue, 256 gb) | latest model with fast charging, dual sim ' * 4)[:300]),
+            (('apple iphone 17 (blue, 256 gb) | latest model ' * 2)[:90], 'apple iphone 17 256gb'),
+        ]
+        for a, b in pairs:
+            with self.subTest(a=a[:12], b=b[:12]):
+                expected = difflib.SequenceMatcher(None, a, b).ratio()
+                self.assertEqual(ratio(a, b), expected)
+                self.assertEqual(ratio_at_least(a, b, 0.84), expected >= 0.84)
+
+    def test_lcs_kernel_and_score_cutoff(self):
+        self.assertEqual(lcs_length('inspiron', 'inspirion'), 8)
+        self.assertEqual(lcs_length('abcbdab', 'bdcaba'), 4)
+        self.assertGreaterEqual(lcs_ratio('abcabcab', 'bcabacba'), ratio('abcabcab', 'bcabacba'))
+
+        self.assertEqual(ratio('pavilion', 'thinkpad', score_cutoff=0.8), 0.0)
+        self.assertEqual(ratio('inspiron', 'inspirion', score_cutoff=0.8), ratio('inspiron', 'inspirion'))
+        self.assertEqual(lcs_ratio('ab', 'abcdefgh', score_cutoff=0.5), 0.0)
+
+    def test_similarity_kernel_setting_drives_the_tiebreak_score(self):
+        query, title = 'Galaxy Tab S10', 'Galaxy S10 Ultra Samsung'
+        token_part = 2 / 3 * 0.7
+        ratcliff = calculate_match_score(query, title)
+        self.assertAlmostEqual(ratcliff, token_part + 0.3 * ratio('galaxy tab s10', 'galaxy s10 ultra samsung'))
+
+        with override_settings(MATCHER_SIMILARITY_KERNEL='lcs'):
+            lcs = calculate_match_score(query, title)
+        self.assertAlmostEqual(lcs, token_part + 0.3 * lcs_ratio('galaxy tab s10', 'galaxy s10 ultra samsung'))
+        self.assertGreater(lcs, ratcliff)
+
+    def test_phrase_automaton_reports_overlapping_phrases(self):
+        automaton = PhraseAutomaton([
+            (['smart', 'tv'], 'smart tv'),
+            (['tv', 'stand'], 'tv stand'),
+            (['android', 'smart', 'tv', 'box'], 'box'),
+        ])
+
+        self.assertEqual(automaton.search('android smart tv stand'.split()), ['smart tv', 'tv stand'])
+        self.assertEqual(automaton.search('android smart tv box'.split()), ['smart tv', 'box'])
+        self.assertEqual(automaton.search('smarttv stand'.split()), [])
+
+    def test_category_phrases_match_whole_words_and_plurals(self):
+        self.assertEqual(build_candidate_profile('LG 55 inch OLED Smart TVs').categories, {'tv'})
+        self.assertEqual(build_candidate_profile('Samsung 8kg Washing Machines').categories, {'washing_machine'})
+        self.assertEqual(build_candidate_profile('JBL Split Acoustic Speaker').categories, {'speaker'})
+        self.assertTrue(build_candidate_profile('Spigen Back Covers for Galaxy S26').has_accessory_keywords)
+
+    def test_batch_matching_gives_each_source_its_own_decision(self):
+        shared_title = 'Samsung Galaxy S26 Ultra 256GB Titanium'
+        by_source = {
+            'Amazon': [
+                Candidate(title='Samsung Galaxy S26 Ultra Back Cover', price=499, url='https://example.com/a1', rank=1),
+                Candidate(title=shared_title, price=106999, url='https://example.com/a2', rank=2, is_sponsored=True),
+            ],
+            'Flipkart': [
+                Candidate(title=shared_title, price=105999, url='https://example.com/f1', rank=1),
+                Candidate(title='Samsung Galaxy S26 Ultra 512GB Black', price=119999, url='https://example.com/f2', rank=2),
+            ],
+            'Myntra': [],
+            'Ajio': [Candidate(title='Samsung Galaxy S26 Ultra 512GB Black', price=119999, url='https://example.com/j1', rank=1)],
+        }
+
+        decisions = evaluate_candidate_batches('Samsung Galaxy S26 Ultra 256GB', by_source)
+
+        self.assertEqual(list(decisions), list(by_source))
+        for source, candidates in by_source.items():
+            with self.subTest(source=source):
+                self.assertEqual(decisions[source], evaluate_scrape_candidates('Samsung Galaxy S26 Ultra 256GB', candidates))
+        self.assertEqual(decisions['Amazon'].accepted_candidate.url, 'https://example.com/a2')
+        self.assertEqual(decisions['Flipkart'].accepted_candidate.url, 'https://example.com/f1')
+        self.assertEqual(decisions['Myntra'].state, 'not_found')
+        self.assertEqual(decisions['Ajio'].state, 'ambiguous')
+
+    def test_single_candidate_assessment_agrees_with_the_batch_path(self):
+        query = build_query_profile('Samsung Galaxy S26 Ultra 256GB')
+        cover = Candidate(title='Samsung Galaxy S26 Ultra Back Cover', price=499, url='https://example.com/1', rank=1)
+        exact = Candidate(title='Samsung Galaxy S26 Ultra 256GB Titanium', price=106999, url='https://example.com/2', rank=2)
+        sibling = Candidate(title='Samsung Galaxy S26 Ultra 512GB Black', price=119999, url='https://example.com/3', rank=3)
+
+        self.assertIsNone(evaluate_candidate(query, cover))
+        self.assertEqual(evaluate_candidate(query, exact).kind, 'exact')
+        self.assertEqual(evaluate_candidate(query, sibling).kind, 'family')
+        self.assertEqual(
+            evaluate_candidate(query, exact).confidence,
+            evaluate_scrape_candidates('Samsung Galaxy S26 Ultra 256GB', [cover, exact]).confidence,
+        )
+
+    @skipIf(matcher.numpy is None, 'NumPy is not installed')
+    def test_numpy_and_pure_python_batches_give_identical_results(self):
+        titles = [
+            'Samsung Galaxy S26 Ultra 256GB Titanium',
+            'Samsung Galaxy S26 Ultra 5G (Black, 12GB RAM, 256GB Storage)',
+            'Samsung Galaxy S26 Ultra 512GB Black',
+            'Samsung Galaxy S26 Plus 256GB Blue',
+            'Samsung Galaxy S26 Ultra Back Cover',
+            'Samsung Galaxy S26 Ultra 256GB (Renewed)',
+            'Samsung Galaxy Tab S10 Ultra 256GB',
+        ]
+        candidates = [
+            Candidate(title=title, price=1000, url=f'https://example.com/{index}', rank=index + 1, is_sponsored=index % 3 == 0)
+            for index, title in enumerate(titles * 3)
+        ]
+
+        def run():
+            query = build_query_profile('Samsung Galaxy S26 Ultra 256GB')
+            features = matcher._title_features(query, titles)
+            rows = [(candidate, features[candidate.title]) for candidate in candidates if candidate.title in features]
+            return (
+                {title: (item.kind, item.signature, item.fuzzy) for title, item in features.items()},
+                [(assessment.kind, assessment.confidence) for assessment in matcher._assessments(query, rows)],
+            )
+
+        vectorised = run()
+        with patch('core.services.matcher.numpy', None):
+            pure = run()
+
+        self.assertTrue(vectorised[1])
+        self.assertEqual(vectorised, pure)
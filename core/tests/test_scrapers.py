@@ -1,10 +1,21 @@
+import tempfile
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
 from pathlib import Path
 from types import SimpleNamespace
 from unittest.mock import patch
 
-from django.test import SimpleTestCase
+from django.test import SimpleTestCase, override_settings
+
+from core.management.commands.bench_parsers import BENCH_SCRAPERS, synthesise_page
+from core.services.browser import BrowserFetchResult
+from core.services.fetch_strategy import HEDGED, HTTP, RENDER, FetchStrategy, get_fetch_strategy, reset_fetch_strategy
+from core.services.http import get_session, session_stats, stream_stats
+from core.services.parsing import get_parse_executor, shutdown_parse_executor
+from core.services.ratelimit import MemoryBucketStore, RateLimiter, SQLiteBucketStore
 
 from core.services.scraper.ajio import AjioScraper
+from core.services.scraper.embedded import collect_dicts, dig
 from core.services.scraper.amazon import AmazonScraper
 from core.services.scraper.flipkart import FlipkartScraper
 from core.services.scraper.meesho import MeeshoScraper
@@ -42,6 +53,104 @@ class ScraperParserTests(SimpleTestCase):
         self.assertEqual(candidates[0].title, 'Nike Air Zoom Pegasus 41')
         self.assertEqual(candidates[0].url, 'https://www.myntra.com/nike-air-zoom-pegasus-41/12345/buy')
 
+    def test_meesho_parser_reads_next_data_in_walk_order(self):
+        candidates = MeeshoScraper().parse_candidates(load_fixture('meesho_search.html'))
+
+        self.assertEqual([candidate.rank for candidate in candidates], [1, 2, 3])
+        self.assertEqual(candidates[1].url, 'https://www.meesho.com/rayon-kurta-set/p/103')
+        self.assertEqual(candidates[2].title, 'Printed Kurta Set & Dupatta')
+
+    def test_myntra_payload_stops_at_the_end_of_the_object(self):
+        html = (
+            '<script>window.__myx = {"searchData": {"results": {"products": [{"productName": "Tee};"}]}}};\n'
+            'window.__other = {"a": 1};</script>'
+        )
+
+        payload = MyntraScraper()._extract_myntra_payload(html)
+
+        self.assertEqual(dig(payload, 'searchData', 'results', 'products')[0]['productName'], 'Tee};')
+
+    def test_collect_dicts_keeps_depth_first_order_and_respects_caps(self):
+        tree = {'a': {'id': 1, 'kids': [{'id': 2}, {'id': 3, 'kids': [{'id': 4}]}]}, 'b': [{'id': 5}]}
+        has_id = lambda node: 'id' in node
+
+        self.assertEqual([node['id'] for node in collect_dicts(tree, has_id)], [1, 2, 3, 4, 5])
+        self.assertEqual([node['id'] for node in collect_dicts(tree, has_id, limit=2)], [1, 2])
+        self.assertEqual([node['id'] for node in collect_dicts(tree, has_id, max_nodes=4)], [1, 2])
+
+    @override_settings(SCRAPER_RECORD_RAW_TEXT=True)
+    def test_ajio_parser_reads_public_listing_cards(self):
+        candidates = AjioScraper().parse_candidates(load_fixture('ajio_search.html'))
+
+        self.assertEqual(len(candidates), 2)
+        self.assertEqual(candidates[0].title, 'Nike')
+        self.assertEqual(candidates[1].url, 'https://www.ajio.com/nike-revolution-7/p/469612345_white')
+        self.assertEqual(candidates[1].raw_text, 'Revolution 7 Lace-Up Shoes ₹3,695')
+
+    def test_raw_text_is_only_built_when_recording(self):
+        html = load_fixture('amazon_search.html')
+        scraper = AmazonScraper()
+
+        candidate = scraper.parse_candidates(html, backend='lxml')[0]
+        self.assertEqual(candidate.raw_text, '')
+        self.assertFalse(hasattr(candidate, '__dict__'))
+
+        with override_settings(SCRAPER_RECORD_RAW_TEXT=True):
+            recorded = scraper.parse_candidates(html, backend='lxml')[0]
+        self.assertTrue(callable(recorded._raw_text))
+        self.assertIn(recorded.title, recorded.raw_text)
+        self.assertIsInstance(recorded._raw_text, str)
+
+    @override_settings(SCRAPER_RECORD_RAW_TEXT=True)
+    def test_lxml_backend_matches_beautifulsoup_on_fixtures(self):
+        for scraper_class, fixture in [
+            (AmazonScraper, 'amazon_search.html'),
+            (FlipkartScraper, 'flipkart_search.html'),
+            (AjioScraper, 'ajio_search.html'),
+        ]:
+            with self.subTest(scraper=scraper_class.website):
+                html = load_fixture(fixture)
+                scraper = scraper_class()
+                self.assertEqual(
+                    scraper.parse_candidates(html, backend='lxml'),
+                    scraper.parse_candidates(html, backend='soup'),
+                )
+
+    def test_flipkart_backends_agree_on_link_parent_fallback(self):
+        html = load_fixture('flipkart_search.html').replace('data-id=', 'data-ref=')
+        scraper = FlipkartScraper()
+
+        self.assertEqual(
+            scraper.parse_candidates(html, backend='lxml'),
+            scraper.parse_candidates(html, backend='soup'),
+        )
+
+    @override_settings(SCRAPER_RECORD_RAW_TEXT=True)
+    def test_partial_parse_matches_full_parse_past_the_rank_limit(self):
+        header = '<html><head><script>var nav = {"data-id": 1};</script></head><body><nav>' + 'menu ' * 500 + '</nav>'
+        block = load_fixture('amazon_search.html').split('<body>')[1].split('</body>')[0]
+        html = header + block * 20 + '<footer>Sponsored links</footer></body></html>'
+        scraper = AmazonScraper()
+
+        partial = {backend: scraper.parse_candidates(html, backend=backend) for backend in ('soup', 'lxml')}
+        with override_settings(SCRAPER_PARTIAL_PARSE=False):
+            full = scraper.parse_candidates(html, backend='soup')
+
+        self.assertEqual(len(full), 24)
+        self.assertEqual(partial['soup'], full)
+        self.assertEqual(partial['lxml'], full)
+
+    def test_synthetic_benchmark_pages_parse_every_ranked_card(self):
+        for scraper_class, _fixture in BENCH_SCRAPERS:
+            with self.subTest(scraper=scraper_class.website):
+                html = synthesise_page(scraper_class.website, 30, noise_kb=2)
+                scraper = scraper_class()
+                outputs = [scraper.parse_candidates(html, backend=backend) for backend in scraper.parser_backends]
+
+                self.assertEqual(len(outputs[0]), min(30, scraper_class.max_results or 40))
+                self.assertTrue(all(output == outputs[0] for output in outputs))
+                self.assertEqual(html, synthesise_page(scraper_class.website, 30, noise_kb=2))
+
     @patch('core.services.scraper.ajio.fetch_rendered_html', return_value=None)
     def test_ajio_reports_unavailable_when_public_search_is_blocked(self, _mock_render):
         scraper = AjioScraper()
@@ -67,3 +176,278 @@ class ScraperParserTests(SimpleTestCase):
         attempt = scraper.search('iphone 17')
 
         self.assertEqual(attempt.state, 'unavailable')
+
+    def test_flipkart_uses_in_page_extraction_items_when_rendered(self):
+        rendered = BrowserFetchResult(
+            url='https://www.flipkart.com/search?q=iphone+17',
+            html='',
+            status=200,
+            items=[
+                {'title': 'Apple iPhone 17 (Blue, 256 GB)', 'price': '₹89,900', 'href': '/apple-iphone-17/p/itm1?pid=A', 'rank': 1},
+                {'title': 'Apple iPhone 17 (Blue, 256 GB)', 'price': '₹89,900', 'href': '/apple-iphone-17/p/itm1?pid=B', 'rank': 2},
+                {'title': 'Apple iPhone 17 (Black, 256 GB)', 'price': '₹89,900', 'href': '/apple-iphone-17-black/p/itm2', 'sponsored': True, 'rank': 3},
+            ],
+        )
+        scraper = FlipkartScraper()
+        scraper.get_page = lambda *args, **kwargs: SimpleNamespace(
+            status_code=403,
+            text='Access denied',
+            url='https://www.flipkart.com/search?q=iphone+17',
+        )
+
+        with patch('core.services.scraper.flipkart.fetch_rendered_html', return_value=rendered):
+            attempt = scraper.search('iphone 17')
+
+        self.assertEqual(attempt.state, 'matched')
+        self.assertEqual([candidate.rank for candidate in attempt.candidates], [1, 3])
+        self.assertEqual(attempt.candidates[0].url, 'https://www.flipkart.com/apple-iphone-17/p/itm1')
+        self.assertEqual(attempt.candidates[0].price, 89900.0)
+        self.assertTrue(attempt.candidates[1].is_sponsored)
+
+
+    def test_ajio_uses_in_page_extraction_items_when_http_is_blocked(self):
+        rendered = BrowserFetchResult(
+            url='https://www.ajio.com/search/?text=nike+revolution+7',
+            html='',
+            status=None,
+            items=[
+                {'title': 'Nike Revolution 7 Running Shoes', 'price': 'Rs. 3,695', 'href': '/nike-revolution-7/p/469612345_black', 'rank': 1},
+                {'title': 'Nike Revolution 7 Running Shoes', 'price': 'Rs. 3,695', 'href': '/nike-revolution-7/p/469612345_white', 'rank': 2},
+            ],
+        )
+        scraper = AjioScraper()
+        scraper.get_page = lambda *args, **kwargs: SimpleNamespace(
+            status_code=403,
+            text='<html><title>Captcha</title>Please verify you are a human</html>',
+            url='https://www.ajio.com/search/?text=nike+revolution+7',
+        )
+
+        with patch('core.services.scraper.ajio.fetch_rendered_html', return_value=rendered):
+            attempt = scraper.search('nike revolution 7')
+
+        self.assertEqual(attempt.state, 'matched')
+        self.assertIsNone(attempt.http_status)
+        self.assertEqual(
+            [candidate.url for candidate in attempt.candidates],
+            ['https://www.ajio.com/nike-revolution-7/p/469612345_black', 'https://www.ajio.com/nike-revolution-7/p/469612345_white'],
+        )
+
+class KeepAliveHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        body = b'<html>ok</html>'
+        self.send_response(200)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class SharedSessionTests(SimpleTestCase):
+    def setUp(self):
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), KeepAliveHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.base_url = f'http://127.0.0.1:{self.server.server_address[1]}'
+
+    @patch('core.services.ratelimit.time.sleep')
+    def test_scraper_instances_reuse_pooled_connections(self, _sleep):
+        for _ in range(3):
+            response = AmazonScraper().get_page(f'{self.base_url}/s', params={'k': 'iphone'})
+            self.assertEqual(response.status_code, 200)
+
+        self.assertIs(get_session(f'{self.base_url}/a'), get_session(f'{self.base_url}/b'))
+        stats = session_stats()[self.base_url.split('//', 1)[1]]
+        self.assertEqual(stats['connections_opened'], 1)
+        self.assertEqual(stats['connections_reused'], 2)
+
+
+def large_amazon_page(blocks=60):
+    block = load_fixture('amazon_search.html').split('<body>')[1].split('</body>')[0]
+    return '<html><body>' + block * (blocks // 2) + '<footer>' + 'related searches ' * 20000 + '</footer></body></html>'
+
+
+class LargePageHandler(KeepAliveHandler):
+    def do_GET(self):
+        body = large_amazon_page().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        try:
+            self.wfile.write(body)
+        except (BrokenPipeError, ConnectionResetError):
+            pass
+
+
+class QuietServer(ThreadingHTTPServer):
+    def handle_error(self, request, client_address):
+        # Clients that stop reading early reset the connection; that is the point of the test.
+        pass
+
+
+class StreamingFetchTests(SimpleTestCase):
+    def setUp(self):
+        self.server = QuietServer(('127.0.0.1', 0), LargePageHandler)
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.addCleanup(self.server.server_close)
+        self.addCleanup(self.server.shutdown)
+        self.url = f'http://127.0.0.1:{self.server.server_address[1]}/s'
+
+    @patch('core.services.ratelimit.time.sleep')
+    def test_stops_reading_after_the_last_ranked_block(self, _sleep):
+        full_page = large_amazon_page()
+        before = stream_stats().get('Amazon', {}).get('bytes_saved', 0)
+
+        response = AmazonScraper().get_page(self.url)
+        second = AmazonScraper().get_page(self.url)
+
+        self.assertLess(len(response.content), len(full_page.encode('utf-8')))
+        self.assertEqual(second.status_code, 200)
+        self.assertEqual(AmazonScraper().parse_candidates(response.text), AmazonScraper().parse_candidates(full_page))
+        stats = stream_stats()['Amazon']
+        self.assertGreater(stats['bytes_saved'] - before, 2 * 300000)
+        self.assertGreaterEqual(stats['cut_short'], 2)
+
+    @override_settings(SCRAPER_STREAMING_FETCH=False)
+    @patch('core.services.ratelimit.time.sleep')
+    def test_disabled_streaming_reads_the_whole_page(self, _sleep):
+        response = AmazonScraper().get_page(self.url)
+
+        self.assertEqual(response.text, large_amazon_page())
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+        self.slept = []
+
+    def __call__(self):
+        return self.now
+
+    def sleep(self, seconds):
+        self.slept.append(seconds)
+        self.now += seconds
+
+
+class RateLimiterTests(SimpleTestCase):
+    def _limiter(self, store, clock):
+        return RateLimiter(store, rate=0.5, burst=2, jitter=0, clock=clock, sleep=clock.sleep)
+
+    def test_only_delays_when_domain_budget_is_exhausted(self):
+        clock = FakeClock()
+        limiter = self._limiter(MemoryBucketStore(), clock)
+
+        waits = [limiter.acquire('https://www.amazon.in/s?k=a') for _ in range(3)]
+        other = limiter.acquire('https://www.flipkart.com/search?q=a')
+
+        self.assertEqual(waits, [0.0, 0.0, 2.0])
+        self.assertEqual(other, 0.0)
+        self.assertEqual(limiter.stats()['www.amazon.in']['delayed'], 1)
+
+    def test_backoff_pushes_the_whole_domain_back(self):
+        clock = FakeClock()
+        limiter = self._limiter(MemoryBucketStore(), clock)
+
+        limiter.backoff('https://www.amazon.in/s', 3)
+
+        self.assertEqual(limiter.acquire('https://www.amazon.in/s'), 5.0)
+
+    def test_sqlite_backend_shares_budget_between_limiters(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = f'{directory}/buckets.sqlite3'
+            clock = FakeClock()
+            first = self._limiter(SQLiteBucketStore(path), clock)
+            second = self._limiter(SQLiteBucketStore(path), clock)
+
+            waits = [first.acquire('https://www.myntra.com/a'), second.acquire('https://www.myntra.com/b')]
+            waits.append(second.acquire('https://www.myntra.com/c'))
+
+        self.assertEqual(waits, [0.0, 0.0, 2.0])
+
+
+class FetchStrategyTests(SimpleTestCase):
+    def setUp(self):
+        reset_fetch_strategy()
+        self.addCleanup(reset_fetch_strategy)
+
+    def test_strategy_moves_from_http_to_hedged_to_render(self):
+        strategy = FetchStrategy(min_samples=3, probe_every=4)
+
+        self.assertEqual(strategy.choose('Amazon'), HTTP)
+        for _ in range(3):
+            strategy.record('Amazon', HTTP, False)
+        self.assertEqual(strategy.choose('Amazon'), HEDGED)
+
+        for _ in range(3):
+            strategy.record('Amazon', RENDER, True)
+        self.assertEqual(strategy.choose('Amazon'), RENDER)
+        # Every fourth decision re-samples HTTP alongside the render
+        self.assertEqual(strategy.choose('Amazon'), HEDGED)
+        self.assertEqual([entry['strategy'] for entry in strategy.history()], [HTTP, HEDGED, RENDER, HEDGED])
+
+    def test_scraper_skips_http_once_it_is_known_to_fail(self):
+        strategy = get_fetch_strategy()
+        for _ in range(5):
+            strategy.record('Amazon', HTTP, False)
+            strategy.record('Amazon', RENDER, True)
+
+        rendered = BrowserFetchResult(url='https://www.amazon.in/s?k=iphone', html=load_fixture('amazon_search.html'), status=200)
+        scraper = AmazonScraper()
+        scraper.get_page = lambda *args, **kwargs: self.fail('HTTP path should have been skipped')
+
+        with patch('core.services.scraper.amazon.fetch_rendered_html', return_value=rendered):
+            attempt = scraper.search('iphone 17')
+
+        self.assertEqual(attempt.state, 'matched')
+        self.assertEqual(strategy.history()[-1]['strategy'], RENDER)
+
+    def test_hedged_fetch_takes_the_first_usable_page(self):
+        strategy = get_fetch_strategy()
+        for _ in range(3):
+            strategy.record('Flipkart', HTTP, False)
+
+        release = threading.Event()
+        rendered = BrowserFetchResult(url='https://www.flipkart.com/search?q=iphone', html=load_fixture('flipkart_search.html'), status=200)
+        scraper = FlipkartScraper()
+        scraper.get_page = lambda *args, **kwargs: release.wait(5) and None
+
+        try:
+            with patch('core.services.scraper.flipkart.fetch_rendered_html', return_value=rendered):
+                attempt = scraper.search('iphone 17')
+        finally:
+            release.set()
+
+        self.assertEqual(attempt.state, 'matched')
+        self.assertEqual(len(attempt.candidates), 2)
+
+
+@override_settings(PARSE_POOL_WORKERS=1, PARSE_POOL_MIN_BYTES=0)
+class ParsePoolTests(SimpleTestCase):
+    def setUp(self):
+        self.addCleanup(shutdown_parse_executor)
+
+    def test_pool_parses_in_a_worker_and_returns_candidates(self):
+        html = load_fixture('amazon_search.html')
+        scraper = AmazonScraper()
+
+        pooled = scraper.parse_html(html)
+
+        self.assertEqual(pooled, scraper.parse_candidates(html))
+        self.assertEqual(get_parse_executor().stats()['submitted'], 1)
+
+    def test_submit_overlaps_several_sources(self):
+        executor = get_parse_executor()
+        futures = [
+            executor.submit('Flipkart', load_fixture('flipkart_search.html')),
+            executor.submit('Meesho', load_fixture('meesho_search.html')),
+        ]
+
+        flipkart, meesho = [future.result(timeout=60) for future in futures]
+
+        self.assertEqual(flipkart[0].url, 'https://www.flipkart.com/apple-iphone-17-blue-256-gb/p/itm123456')
+        self.assertEqual(len(meesho), 3)
@@ -1,10 +1,29 @@
-from django.test import TestCase
+import io
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.core.management import call_command
+from django.test import TestCase, override_settings
 from django.urls import reverse
+from django.utils import timezone
 from unittest.mock import patch
 
-from core.models import PriceResult, Product, SourceStatus
+from core.models import PriceResult, Product, SourceCircuit, SourceStatus
+from core.services.fetch_strategy import HTTP, get_fetch_strategy, reset_fetch_strategy
+from core.services.matcher import get_profile_cache
 from core.services.scraper.base import Candidate, ScrapeAttempt
-from core.services.tracker import track_prices_for_product
+from core.services.scraper.simulated import SimulatedScraper, SimulatedSource
+from core.services.tracker import (
+    prerender_products,
+    reset_stage_stats,
+    stage_stats,
+    stuck_search_count,
+    track_prices_for_product,
+    warm_profile_cache,
+)
 
 
 class AmazonExactScraper:
@@ -133,6 +152,27 @@ class EmptyNotFoundScraper:
         )
 
 
+class RendezvousNotFoundScraper(EmptyNotFoundScraper):
+    """Only answers once every source sharing ``barrier`` is searching at the same time."""
+
+    def __init__(self, website, barrier):
+        super().__init__(website)
+        self.barrier = barrier
+
+    def search(self, query):
+        self.barrier.wait(timeout=5)
+        return super().search(query)
+
+
+class HangingScraper:
+    website = 'Meesho'
+    release = threading.Event()
+
+    def search(self, query):
+        self.release.wait(5)
+        return ScrapeAttempt(website=self.website, state='not_found', http_status=200)
+
+
 class TrackerIntegrationTests(TestCase):
     @patch(
         'core.services.tracker.SCRAPER_CLASSES',
@@ -204,3 +244,245 @@ class TrackerIntegrationTests(TestCase):
 
         self.assertEqual(response.status_code, 200)
         self.assertEqual(len(response.context['price_results']), 1)
+
+    @override_settings(TRACKER_SOURCE_TIMEOUT_SECONDS=10)
+    def test_concurrent_mode_searches_every_source_at_once(self):
+        product = Product.objects.create(name='iPhone 17', search_query='iPhone 17')
+        websites = ['Amazon', 'Flipkart', 'Myntra', 'Ajio', 'Meesho']
+        # Sequential searches would break the barrier; a private pool keeps workers
+        # left stuck by other tests out of the way.
+        barrier = threading.Barrier(len(websites))
+        executor = ThreadPoolExecutor(max_workers=len(websites))
+        self.addCleanup(executor.shutdown)
+
+        with patch('core.services.tracker._source_executor', executor), patch(
+            'core.services.tracker.SCRAPER_CLASSES',
+            [lambda website=website: RendezvousNotFoundScraper(website, barrier) for website in websites],
+        ):
+            result = track_prices_for_product(product, concurrent=True)
+
+        self.assertEqual([status['website'] for status in result['source_statuses']], websites)
+        self.assertEqual({status['state'] for status in result['source_statuses']}, {SourceStatus.State.NOT_FOUND})
+
+    @override_settings(TRACKER_SOURCE_TIMEOUT_SECONDS=0.3)
+    @patch(
+        'core.services.tracker.SCRAPER_CLASSES',
+        new=[AmazonExactScraper, FlipkartExactScraper, MyntraExactScraper, AjioUnavailableScraper, HangingScraper],
+    )
+    def test_concurrent_mode_marks_slow_source_unavailable_after_timeout(self):
+        product = Product.objects.create(name='Samsung Galaxy S26 Ultra 256GB', search_query='Samsung Galaxy S26 Ultra 256GB')
+
+        try:
+            result = track_prices_for_product(product, concurrent=True)
+        finally:
+            HangingScraper.release.set()
+
+        self.assertEqual(len(result['accepted_results']), 3)
+        meesho = SourceStatus.objects.get(product=product, website='Meesho')
+        self.assertEqual(meesho.state, SourceStatus.State.UNAVAILABLE)
+        self.assertIn('did not respond', meesho.diagnostic_message)
+
+    @override_settings(TRACKER_SOURCE_TIMEOUT_SECONDS=0.3)
+    def test_sources_queued_behind_a_stuck_worker_time_out_instead_of_blocking(self):
+        release = threading.Event()
+
+        class WedgedScraper:
+            website = 'Amazon'
+
+            def search(self, query):
+                release.wait(5)
+                return ScrapeAttempt(website=self.website, state='not_found', http_status=200)
+
+        product = Product.objects.create(name='Samsung Galaxy S26 Ultra 256GB', search_query='Samsung Galaxy S26 Ultra 256GB')
+        executor = ThreadPoolExecutor(max_workers=1)
+        self.addCleanup(executor.shutdown)
+
+        with patch('core.services.tracker._source_executor', executor), \
+                patch('core.services.tracker.SCRAPER_CLASSES', [WedgedScraper, FlipkartExactScraper]):
+            started = time.monotonic()
+            result = track_prices_for_product(product, concurrent=True)
+            elapsed = time.monotonic() - started
+            stuck = stuck_search_count()
+        release.set()
+
+        self.assertLess(elapsed, 1.0)
+        self.assertEqual(stuck, 1)
+        statuses = {status['website']: status for status in result['source_statuses']}
+        self.assertEqual(statuses['Amazon']['state'], SourceStatus.State.UNAVAILABLE)
+        self.assertIn('did not respond', statuses['Amazon']['diagnostic_message'])
+        self.assertEqual(statuses['Flipkart']['state'], SourceStatus.State.UNAVAILABLE)
+        self.assertIn('did not start', statuses['Flipkart']['diagnostic_message'])
+
+
+class CountingBlockedScraper(MeeshoBlockedScraper):
+    calls = 0
+
+    def search(self, query):
+        CountingBlockedScraper.calls += 1
+        return super().search(query)
+
+
+@override_settings(CIRCUIT_FAILURE_THRESHOLD=2, CIRCUIT_COOLDOWN_SECONDS=600)
+@patch(
+    'core.services.tracker.SCRAPER_CLASSES',
+    new=[AmazonExactScraper, CountingBlockedScraper],
+)
+class CircuitBreakerTests(TestCase):
+    def setUp(self):
+        CountingBlockedScraper.calls = 0
+        self.product = Product.objects.create(name='Samsung Galaxy S26 Ultra 256GB', search_query='Samsung Galaxy S26 Ultra 256GB')
+
+    def test_circuit_opens_after_consecutive_failures_and_skips_source(self):
+        for _ in range(3):
+            result = track_prices_for_product(self.product, concurrent=False)
+
+        self.assertEqual(CountingBlockedScraper.calls, 2)
+        circuit = SourceCircuit.objects.get(website='Meesho')
+        self.assertEqual(circuit.state, SourceCircuit.State.OPEN)
+        self.assertEqual(circuit.trip_count, 1)
+        self.assertEqual(SourceCircuit.objects.get(website='Amazon').state, SourceCircuit.State.CLOSED)
+
+        meesho = next(status for status in result['source_statuses'] if status['website'] == 'Meesho')
+        self.assertEqual(meesho['state'], SourceStatus.State.BLOCKED)
+        self.assertIn('circuit open', meesho['diagnostic_message'])
+        self.assertEqual(len(result['accepted_results']), 1)
+
+    def test_half_open_probe_after_cooldown_reopens_or_closes(self):
+        for _ in range(2):
+            track_prices_for_product(self.product, concurrent=False)
+        SourceCircuit.objects.filter(website='Meesho').update(opened_at=timezone.now() - timedelta(seconds=601))
+
+        track_prices_for_product(self.product, concurrent=False)
+
+        self.assertEqual(CountingBlockedScraper.calls, 3)
+        circuit = SourceCircuit.objects.get(website='Meesho')
+        self.assertEqual(circuit.state, SourceCircuit.State.OPEN)
+        self.assertEqual(circuit.trip_count, 2)
+
+        SourceCircuit.objects.filter(website='Meesho').update(opened_at=timezone.now() - timedelta(seconds=601))
+        with patch('core.services.tracker.SCRAPER_CLASSES', new=[lambda: EmptyNotFoundScraper('Meesho')]):
+            track_prices_for_product(self.product, concurrent=False)
+
+        circuit.refresh_from_db()
+        self.assertEqual(circuit.state, SourceCircuit.State.CLOSED)
+        self.assertEqual(circuit.consecutive_failures, 0)
+
+    @override_settings(TRACKER_SOURCE_TIMEOUT_SECONDS=0.3)
+    def test_timed_out_half_open_probe_reopens_the_circuit(self):
+        release = threading.Event()
+        self.addCleanup(release.set)
+
+        class HangingMeeshoScraper:
+            website = 'Meesho'
+
+            def search(self, query):
+                release.wait(5)
+                return ScrapeAttempt(website=self.website, state='not_found', http_status=200)
+
+        for _ in range(2):
+            track_prices_for_product(self.product, concurrent=False)
+        SourceCircuit.objects.filter(website='Meesho').update(opened_at=timezone.now() - timedelta(seconds=601))
+
+        with patch('core.services.tracker.SCRAPER_CLASSES', [AmazonExactScraper, HangingMeeshoScraper]):
+            result = track_prices_for_product(self.product, concurrent=True)
+
+        meesho = next(status for status in result['source_statuses'] if status['website'] == 'Meesho')
+        self.assertIn('did not respond', meesho['diagnostic_message'])
+        circuit = SourceCircuit.objects.get(website='Meesho')
+        self.assertEqual(circuit.state, SourceCircuit.State.OPEN)
+        self.assertEqual(circuit.trip_count, 2)
+        self.assertEqual(circuit.consecutive_failures, 3)
+
+
+def _renderable(website):
+    class RenderableScraper:
+        render_options = None
+
+        def __init__(self):
+            self.website = website
+
+        def render_url(self, query):
+            return f'https://example.com/{website.lower()}?q={query}'
+
+    return RenderableScraper
+
+
+@override_settings(PLAYWRIGHT_PRERENDER_SOURCES=['Amazon', 'Flipkart', 'Meesho'], CIRCUIT_COOLDOWN_SECONDS=600)
+@patch(
+    'core.services.tracker.SCRAPER_CLASSES',
+    new=[_renderable('Amazon'), _renderable('Flipkart'), _renderable('Meesho'), _renderable('Myntra')],
+)
+class PrerenderTests(TestCase):
+    def setUp(self):
+        reset_fetch_strategy()
+        self.addCleanup(reset_fetch_strategy)
+        self.products = [Product.objects.create(name='iPhone 17', search_query='iPhone 17')]
+
+    def test_prerender_skips_open_circuits_and_sources_where_http_works(self):
+        SourceCircuit.objects.create(website='Meesho', state=SourceCircuit.State.OPEN, opened_at=timezone.now())
+        strategy = get_fetch_strategy()
+        for _ in range(3):
+            strategy.record('Amazon', HTTP, True)
+            strategy.record('Flipkart', HTTP, False)
+
+        with patch('core.services.tracker.render_urls', side_effect=lambda requests: {r.url: object() for r in requests}) as render:
+            rendered = prerender_products(self.products)
+
+        self.assertEqual(rendered, 1)
+        self.assertEqual([request.url for request in render.call_args.args[0]], ['https://example.com/flipkart?q=iPhone 17'])
+        # Peeking at the learned strategy is not a search decision.
+        self.assertEqual(strategy.history(), [])
+
+
+@override_settings(MATCHER_PROFILE_CACHE_SIZE=64)
+class ProfileWarmStartTests(TestCase):
+    def test_stored_titles_are_profiled_before_the_first_search(self):
+        product = Product.objects.create(name='Samsung Galaxy S26 Ultra 256GB', search_query='Samsung Galaxy S26 Ultra 256GB')
+        PriceResult.objects.create(
+            product=product,
+            website='Amazon',
+            title='Samsung Galaxy S26 Ultra 256GB Titanium',
+            price=106999,
+            url='https://example.com/amazon-s26',
+        )
+        SourceStatus.objects.create(
+            product=product,
+            website='Flipkart',
+            state=SourceStatus.State.MATCHED,
+            matched_title='Samsung Galaxy S26 Ultra 256GB Black',
+        )
+        cache = get_profile_cache()
+        cache.clear()
+
+        self.assertEqual(warm_profile_cache(), 2)
+        with patch('core.services.tracker.SCRAPER_CLASSES', [AmazonExactScraper, FlipkartExactScraper]):
+            track_prices_for_product(product, concurrent=False)
+
+        self.assertEqual(cache.stats()['hits'], 2)
+        self.assertEqual(cache.stats()['misses'], 0)
+
+
+class TrackerBenchmarkTests(TestCase):
+    def test_simulated_sources_are_reproducible_and_fail_at_the_configured_rate(self):
+        healthy = SimulatedScraper(SimulatedSource('Flipkart'), seed=3)
+
+        self.assertEqual(healthy.search('iPhone 17'), SimulatedScraper(SimulatedSource('Flipkart'), seed=3).search('iPhone 17'))
+        self.assertEqual(SimulatedScraper(SimulatedSource('Amazon', blocked_rate=1.0)).search('iPhone 17').state, 'blocked')
+        with self.assertRaises(ConnectionError):
+            SimulatedScraper(SimulatedSource('Ajio', error_rate=1.0)).search('iPhone 17')
+
+    def test_benchmark_mode_reports_stages_and_leaves_the_database_untouched(self):
+        reset_stage_stats()
+        output = io.StringIO()
+
+        call_command('check_prices', benchmark=4, error_rate=['Ajio=1'], json=True, stdout=output, stderr=io.StringIO())
+
+        report = json.loads(output.getvalue())
+        self.assertEqual(report['products'], 4)
+        self.assertEqual(list(report['stages']), ['fetch', 'match', 'sanity', 'persist'])
+        self.assertGreater(report['db_queries_per_product'], 0)
+        self.assertEqual(sum(report['states']['Ajio'].values()), 4)
+        self.assertNotIn('matched', report['states']['Ajio'])
+        self.assertEqual(stage_stats()['persist']['products'], 4)
+        self.assertFalse(Product.objects.exists())
+        self.assertFalse(SourceStatus.objects.exists())
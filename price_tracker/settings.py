@@ -4,6 +4,7 @@ Django settings for price_tracker project.
 
 from pathlib import Path
 import os
+import tempfile
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
 BASE_DIR = Path(__file__).resolve().parent.parent
@@ -168,3 +169,69 @@ DEFAULT_FROM_EMAIL = os.getenv('DEFAULT_FROM_EMAIL', EMAIL_HOST_USER or 'webmast
 
 # Cache settings (for price results)
 CACHE_EXPIRY_HOURS = 6
+
+# Search-result parser engine: 'lxml' (precompiled XPath) or 'soup' (BeautifulSoup)
+SCRAPER_PARSER_BACKEND = os.getenv('SCRAPER_PARSER_BACKEND', 'lxml')
+# Parse only the result blocks up to each scraper's rank limit
+SCRAPER_PARTIAL_PARSE = env_bool('SCRAPER_PARTIAL_PARSE', True)
+# Worker processes for search-result parsing (0 parses inline in the fetching thread)
+PARSE_POOL_WORKERS = env_int('PARSE_POOL_WORKERS', 0)
+PARSE_POOL_MIN_BYTES = env_int('PARSE_POOL_MIN_BYTES', 50000)
+# Stop reading search pages once every ranked result block has arrived
+SCRAPER_STREAMING_FETCH = env_bool('SCRAPER_STREAMING_FETCH', True)
+SCRAPER_STREAM_MAX_BYTES = env_int('SCRAPER_STREAM_MAX_BYTES', 3000000)
+# Keep each candidate's raw block text (debugging only; matching never reads it)
+SCRAPER_RECORD_RAW_TEXT = env_bool('SCRAPER_RECORD_RAW_TEXT', False)
+
+# Tracker source fan-out
+TRACKER_CONCURRENT_SOURCES = env_bool('TRACKER_CONCURRENT_SOURCES', True)
+TRACKER_MAX_WORKERS = env_int('TRACKER_MAX_WORKERS', 5)
+TRACKER_SOURCE_TIMEOUT_SECONDS = env_int('TRACKER_SOURCE_TIMEOUT_SECONDS', 90)
+
+# Matcher: LRU of candidate title profiles, warmed from stored titles when check_prices starts
+MATCHER_PROFILE_CACHE_SIZE = env_int('MATCHER_PROFILE_CACHE_SIZE', 20000)
+MATCHER_PROFILE_WARM_START = env_bool('MATCHER_PROFILE_WARM_START', True)
+# Tiebreak similarity: 'ratcliff' (same scores as difflib) or 'lcs' (bit-parallel, linear in title length)
+MATCHER_SIMILARITY_KERNEL = os.getenv('MATCHER_SIMILARITY_KERNEL', 'ratcliff')
+
+# Per-source circuit breaker
+CIRCUIT_BREAKER_ENABLED = env_bool('CIRCUIT_BREAKER_ENABLED', True)
+CIRCUIT_FAILURE_THRESHOLD = env_int('CIRCUIT_FAILURE_THRESHOLD', 3)
+CIRCUIT_COOLDOWN_SECONDS = env_int('CIRCUIT_COOLDOWN_SECONDS', 900)
+
+# Learned HTTP vs. rendered fetch strategy
+FETCH_STRATEGY_ENABLED = env_bool('FETCH_STRATEGY_ENABLED', True)
+FETCH_STRATEGY_MIN_SAMPLES = env_int('FETCH_STRATEGY_MIN_SAMPLES', 3)
+FETCH_STRATEGY_PROBE_EVERY = env_int('FETCH_STRATEGY_PROBE_EVERY', 10)
+FETCH_STRATEGY_HEDGE_WORKERS = env_int('FETCH_STRATEGY_HEDGE_WORKERS', 10)
+
+# Shared HTTP connection pools
+HTTP_POOL_CONNECTIONS = env_int('HTTP_POOL_CONNECTIONS', 10)
+HTTP_POOL_MAXSIZE = env_int('HTTP_POOL_MAXSIZE', 10)
+HTTP_CONNECT_RETRIES = env_int('HTTP_CONNECT_RETRIES', 2)
+HTTP_RETRY_BACKOFF = float(os.getenv('HTTP_RETRY_BACKOFF', '0.5'))
+
+# Per-domain request budget (token bucket); use the sqlite backend to share it between processes
+SCRAPER_RATE_LIMIT_BACKEND = os.getenv('SCRAPER_RATE_LIMIT_BACKEND', 'memory')
+SCRAPER_RATE_LIMIT_DB = os.getenv('SCRAPER_RATE_LIMIT_DB', str(Path(tempfile.gettempdir()) / 'price_tracker_ratelimit.sqlite3'))
+SCRAPER_RATE_PER_SECOND = float(os.getenv('SCRAPER_RATE_PER_SECOND', '0.5'))
+SCRAPER_RATE_BURST = env_int('SCRAPER_RATE_BURST', 2)
+SCRAPER_RATE_JITTER = float(os.getenv('SCRAPER_RATE_JITTER', '0.5'))
+SCRAPER_RATE_LIMITS = {
+    # 'www.amazon.in': (0.3, 1),
+}
+
+# Playwright browser pool
+PLAYWRIGHT_POOL_SIZE = env_int('PLAYWRIGHT_POOL_SIZE', 2)
+PLAYWRIGHT_MAX_PAGES_PER_BROWSER = env_int('PLAYWRIGHT_MAX_PAGES_PER_BROWSER', 50)
+PLAYWRIGHT_LEAN_RENDERING = env_bool('PLAYWRIGHT_LEAN_RENDERING', True)
+PLAYWRIGHT_IN_PAGE_EXTRACTION = env_bool('PLAYWRIGHT_IN_PAGE_EXTRACTION', False)
+
+# Async batch rendering (check_prices --render-batch)
+PLAYWRIGHT_BATCH_MAX_PAGES = env_int('PLAYWRIGHT_BATCH_MAX_PAGES', 8)
+PLAYWRIGHT_BATCH_PER_SITE = env_int('PLAYWRIGHT_BATCH_PER_SITE', 3)
+PLAYWRIGHT_PRERENDER_SOURCES = [
+    source.strip()
+    for source in os.getenv('PLAYWRIGHT_PRERENDER_SOURCES', 'Amazon,Flipkart').split(',')
+    if source.strip()
+]